@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Análise AC de pequenos sinais (varredura vetorizada em frequência)
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from circuit_solver import MnaSystem, SimulationError
+
+DENSE_LIMIT = 800
+CHECK_POINTS = 8
+CHUNK_BYTES = 64 * 1024 * 1024
+PROGRESS_EVERY = 16
+
+
+def ac_frequencies(mode, points, f_start, f_stop):
+    mode = str(mode).lower()
+    points = int(points)
+    if points < 1 or f_stop < f_start:
+        raise SimulationError("Varredura AC inválida: verifique pontos e faixa de frequência")
+    if mode == 'lin':
+        return np.linspace(f_start, f_stop, max(points, 2))
+    if mode not in ('dec', 'oct'):
+        raise SimulationError(f"Tipo de varredura AC desconhecido: {mode}")
+    if f_start <= 0:
+        raise SimulationError("Frequência inicial deve ser positiva em varreduras DEC/OCT")
+    base = 10.0 if mode == 'dec' else 2.0
+    n = int(round(np.log(f_stop / f_start) / np.log(base) * points)) + 1
+    return np.geomspace(f_start, f_stop, max(n, 2))
+
+
+def parse_sweep(text, parse_value):
+    parts = str(text).replace('.AC', '').replace('.ac', '').split()
+    if len(parts) != 4:
+        raise SimulationError("Formato esperado: DEC|OCT|LIN <pontos> <f inicial> <f final>")
+    return ac_frequencies(parts[0], parse_value(parts[1]), parse_value(parts[2]), parse_value(parts[3]))
+
+
+def _small_signal(ckt, pattern=None):
+    system = MnaSystem(ckt, pattern)
+    jac = system.jacobian_vals(system.solve(system.rhs.copy()))
+    g = np.concatenate((system.g_vals, np.zeros_like(system.r_vals), jac))
+    c = np.concatenate((np.zeros_like(system.g_vals), system.r_vals, np.zeros_like(jac)))
+    rhs = np.zeros(ckt.size, dtype=complex)
+    rhs[ckt.vsource_branch] = ckt.vsources.ac
+    return system.pattern, g, c, rhs
+
+
+def _solve_modal(gd, cd, rhs, w):
+    lam, vec = np.linalg.eig(np.linalg.solve(gd, cd))
+    y = np.linalg.solve(vec, np.linalg.solve(gd, rhs))
+    return (y[None, :] / (1 + 1j * w[:, None] * lam[None, :])) @ vec.T
+
+
+def _solve_batched(gd, cd, rhs, w, progress=None):
+    n = len(rhs)
+    xs = np.empty((len(w), n), dtype=complex)
+    chunk = max(1, CHUNK_BYTES // (16 * n * n))
+    b = np.broadcast_to(rhs[:, None], (min(chunk, len(w)), n, 1))
+    for i in range(0, len(w), chunk):
+        if progress:
+            progress(i / len(w))
+        wi = w[i:i + chunk]
+        xs[i:i + chunk] = np.linalg.solve(gd + 1j * wi[:, None, None] * cd, b[:len(wi)])[..., 0]
+    return xs
+
+
+def _residual(gd, cd, rhs, w, xs):
+    idx = np.unique(np.linspace(0, len(w) - 1, CHECK_POINTS).astype(int))
+    y = gd[None] + 1j * w[idx, None, None] * cd[None]
+    r = np.einsum('fij,fj->fi', y, xs[idx]) - rhs
+    scale = np.abs(y).max(axis=(1, 2)) * np.abs(xs[idx]).max(axis=1) + np.abs(rhs).max()
+    return (np.abs(r).max(axis=1) / np.where(scale > 0, scale, 1.0)).max()
+
+
+def solve_ac(ckt, freqs, workers=None, progress=None, pattern=None):
+    freqs = np.asarray(freqs, dtype=float)
+    if progress:
+        progress(0.0)
+    pattern, g, c, rhs = _small_signal(ckt, pattern)
+    if progress:
+        progress(0.0)
+    w = 2 * np.pi * freqs
+    n = ckt.size
+    xs = np.empty((len(freqs), n), dtype=complex)
+    if n <= DENSE_LIMIT and len(freqs):
+        gd, cd = pattern.dense(g), pattern.dense(c)
+        try:
+            xs = _solve_modal(gd, cd, rhs, w)
+            if not _residual(gd, cd, rhs, w, xs) < 1e-9:
+                xs = _solve_batched(gd, cd, rhs, w, progress)
+        except np.linalg.LinAlgError:
+            try:
+                xs = _solve_batched(gd, cd, rhs, w, progress)
+            except np.linalg.LinAlgError as e:
+                raise SimulationError(f"Matriz singular na análise AC ({e})")
+    elif len(freqs):
+        xs[0] = pattern.factor(g + 1j * w[0] * c)(rhs)
+        if progress:
+            progress(1 / len(w))
+        with ThreadPoolExecutor(workers or os.cpu_count()) as ex:
+            try:
+                for i, x in enumerate(ex.map(lambda wi: pattern.factor(g + 1j * wi * c)(rhs), w[1:]), 1):
+                    xs[i] = x
+                    if progress and i % PROGRESS_EVERY == 0:
+                        progress(i / len(w))
+            except BaseException:
+                ex.shutdown(cancel_futures=True)
+                raise
+    return xs
+
+
+def simulate_ac(ckt, freqs, workers=None, progress=None):
+    freqs = np.asarray(freqs, dtype=float)
+    return ac_results(ckt, freqs, solve_ac(ckt, freqs, workers, progress))
+
+
+def ac_results(ckt, freqs, xs):
+    results = {'frequency': freqs, 'nodes': {}, 'currents': {}}
+    for i, name in enumerate(ckt.node_names[1:]):
+        results['nodes'][f"V({name})"] = xs[:, i]
+    for name, k in zip(ckt.vsources.names, ckt.vsource_branch):
+        results['currents'][name] = xs[:, k] if name in ckt.meters else -xs[:, k]
+    for name, k in zip(ckt.inductors.names, ckt.inductor_branch):
+        results['currents'][name] = xs[:, k]
+    results['summary'] = {'points': len(freqs), 'f_start': float(freqs[0]) if len(freqs) else 0.0, 'f_stop': float(freqs[-1]) if len(freqs) else 0.0, 'num_nodes': ckt.n_nodes - 1}
+    return results
@@ -1,61 +1,98 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-from PyQt6.QtWidgets import QWidget, QMenu, QInputDialog, QMessageBox
-from PyQt6.QtCore import Qt, QPoint, QPointF, QRectF
-from PyQt6.QtGui import QPainter, QPen, QBrush, QColor, QFont, QPainterPath, QTransform, QCursor
+from PyQt6.QtWidgets import QWidget, QMenu, QInputDialog
+from PyQt6.QtCore import Qt, QPoint, QPointF, QRect, QRectF, QTimer, pyqtSignal
+from PyQt6.QtGui import QPainter, QPen, QBrush, QColor, QFont, QFontMetrics, QPainterPath, QPixmap, QPolygonF
+import itertools
 import math
 import uuid
 
+from circuit_components import COMPONENT_DEFAULTS, Component, Connection, terminal_array, terminal_positions, terminals
+from circuit_history import AddComponents, AddWire, Batch, ClearCircuit, DeleteComponents, History, SetFields
+from circuit_nets import NetIndex
+from circuit_spatial import SpatialIndex
+from circuit_units import parse_value
+
 
 class CircuitCanvas(QWidget):
-    COMPONENT_DEFAULTS = {
-        'resistor': {'value': '1k', 'unit': 'Ω', 'category': 'Passivos'},
-        'capacitor': {'value': '100n', 'unit': 'F', 'category': 'Passivos'},
-        'indutor': {'value': '10m', 'unit': 'H', 'category': 'Passivos'},
-        'potentiometer': {'value': '10k', 'unit': 'Ω', 'category': 'Passivos'},
-        'voltage_source': {'value': '12', 'unit': 'V', 'category': 'Fontes'},
-        'voltage_ac': {'value': '120', 'unit': 'Vac', 'category': 'Fontes'},
-        'current_source': {'value': '1m', 'unit': 'A', 'category': 'Fontes'},
-        'gnd': {'value': '0', 'unit': 'V', 'category': 'Fontes'},
-        'vcc': {'value': '5', 'unit': 'V', 'category': 'Fontes'},
-        'diode': {'value': '1N4148', 'unit': '', 'category': 'Semicondutores'},
-        'zener': {'value': '5.1', 'unit': 'V', 'category': 'Semicondutores'},
-        'led': {'value': 'RED', 'unit': '', 'category': 'Semicondutores'},
-        'schottky': {'value': '1N5819', 'unit': '', 'category': 'Semicondutores'},
-        'transistor_npn': {'value': '2N2222', 'unit': '', 'category': 'Transistores'},
-        'transistor_pnp': {'value': '2N2907', 'unit': '', 'category': 'Transistores'},
-        'mosfet_n': {'value': 'IRF540', 'unit': '', 'category': 'Transistores'},
-        'mosfet_p': {'value': 'IRF9540', 'unit': '', 'category': 'Transistores'},
-        'opamp': {'value': 'LM741', 'unit': '', 'category': 'Integrados'},
-        'comparator': {'value': 'LM393', 'unit': '', 'category': 'Integrados'},
-        'relay': {'value': '12V', 'unit': '', 'category': 'Integrados'},
-        'timer555': {'value': 'NE555', 'unit': '', 'category': 'Integrados'},
-        'voltmeter': {'value': '', 'unit': 'V', 'category': 'Instrumentos'},
-        'ammeter': {'value': '', 'unit': 'A', 'category': 'Instrumentos'},
-        'oscilloscope': {'value': '', 'unit': '', 'category': 'Instrumentos'},
-        'probe': {'value': '', 'unit': '', 'category': 'Instrumentos'},
-        'switch': {'value': 'SPST', 'unit': '', 'category': 'Outros'},
-        'fuse': {'value': '1', 'unit': 'A', 'category': 'Outros'},
-        'transformer': {'value': '1:1', 'unit': '', 'category': 'Outros'},
-        'crystal': {'value': '16M', 'unit': 'Hz', 'category': 'Outros'},
+    components_added = pyqtSignal(list)
+    components_removed = pyqtSignal(list)
+    components_moved = pyqtSignal(list)
+    components_changed = pyqtSignal(list, list)
+    wires_added = pyqtSignal(list)
+    wires_removed = pyqtSignal(list)
+    circuit_reset = pyqtSignal()
+    circuit_changed = pyqtSignal()
+    view_changed = pyqtSignal()
+    live_failed = pyqtSignal(str)
+    COMPONENT_DEFAULTS = COMPONENT_DEFAULTS
+    SYMBOL_PAINTERS = {
+        'resistor': ('draw_resistor',), 'capacitor': ('draw_capacitor',), 'indutor': ('draw_inductor',),
+        'voltage_source': ('draw_voltage_source', False), 'voltage_ac': ('draw_voltage_source', True),
+        'current_source': ('draw_current_source',), 'gnd': ('draw_ground',), 'vcc': ('draw_vcc',),
+        'diode': ('draw_diode',), 'schottky': ('draw_diode',), 'zener': ('draw_zener',), 'led': ('draw_led',),
+        'transistor_npn': ('draw_transistor_npn',), 'transistor_pnp': ('draw_transistor_pnp',),
+        'mosfet_n': ('draw_mosfet', True), 'mosfet_p': ('draw_mosfet', False), 'opamp': ('draw_opamp',),
+        'switch': ('draw_switch',), 'probe': ('draw_probe',), 'relay': ('draw_relay',), 'ammeter': ('draw_ammeter',),
+        'fuse': ('draw_fuse',), 'potentiometer': ('draw_potentiometer',),
     }
+    SYMBOL_EXTENT = 58
+    CULL_MARGIN = 40
+    LABEL_MIN_ZOOM = 0.4
+    GRID_MIN_SPACING = 8
+    HISTORY_BUDGET = 16 * 1024 * 1024
+    GEOMETRY_KEYS = frozenset(('x', 'y', 'rotation'))
+    VALUE_KEYS = frozenset(('value', 'wiper', 'frequency', 'closed', 'visible'))
+    SWITCH_CLOSED = {'switch': True, 'fuse': True, 'relay': False}
+    WIPER_DEFAULT = 0.5
+    SYMBOL_STATE_KEYS = frozenset(('closed', 'wiper'))
+    LIVE_METERS = frozenset(('probe', 'voltmeter'))
+    LIVE_DEBOUNCE_MS = 15
+    WIPER_STEP = 0.05
     
     def __init__(self):
         super().__init__()
         self.setAcceptDrops(True)
         self.setMouseTracking(True)
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
         self.components = []
         self.connections = []
-        self.undo_stack = []
-        self.redo_stack = []
-        self.selected_component = None
+        self.by_id = {}
+        self.nets = NetIndex()
+        self.spatial = SpatialIndex(self.get_terminal_positions)
+        self.history = History(self.HISTORY_BUDGET)
+        self.journal = None
+        self.compiled = None
+        self.topology = 0
+        self.stale = {}
+        self.changes = []
+        self.changed = {}
+        self.changed_keys = set()
+        self.moved = {}
+        self.view_dirty = False
+        self.flush_pending = False
+        self.selection = {}
+        self.clipboard = None
+        self.band_origin = None
+        self.band_rect = None
         self.dragging = False
         self.drag_offset = QPoint(0, 0)
+        self.drag_key = None
         self.wire_mode = False
         self.wire_start = None
         self.wire_start_terminal = None
         self.temp_wire_end = None
+        self.live = False
+        self.live_results = {}
+        self.live_worker = None
+        self.live_pending = False
+        self.systems = {}
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(self.LIVE_DEBOUNCE_MS)
+        self.live_timer.timeout.connect(self.run_live)
+        self.click_toggle = None
         self.zoom_level = 1.0
         self.pan_offset = QPoint(0, 0)
         self.panning = False
@@ -63,9 +100,21 @@ class CircuitCanvas(QWidget):
         self.grid_size = 20
         self.show_grid = True
         self.component_counter = {}
+        self.symbol_cache = {}
+        self.symbol_scale = None
+        self.label_font = QFont("Arial", 9)
+        self.label_metrics = QFontMetrics(self.label_font)
         self.setMinimumSize(400, 300)
         self.setStyleSheet("background-color: #1a1a2e;")
     
+    @property
+    def selected_component(self):
+        return next(reversed(self.selection.values()), None)
+    
+    @selected_component.setter
+    def selected_component(self, comp):
+        self.selection = {comp['id']: comp} if comp else {}
+    
     def snap_to_grid(self, pos):
         x = round(pos.x() / self.grid_size) * self.grid_size
         y = round(pos.y() / self.grid_size) * self.grid_size
@@ -81,6 +130,18 @@ class CircuitCanvas(QWidget):
         y = pos.y() * self.zoom_level + self.pan_offset.y()
         return QPoint(int(x), int(y))
     
+    def screen_rect_to_canvas(self, rect):
+        z = self.zoom_level
+        return QRectF((rect.x() - self.pan_offset.x()) / z, (rect.y() - self.pan_offset.y()) / z, rect.width() / z, rect.height() / z)
+    
+    def canvas_rect_to_screen(self, rect):
+        z = self.zoom_level
+        return QRectF(rect.x() * z + self.pan_offset.x(), rect.y() * z + self.pan_offset.y(), rect.width() * z, rect.height() * z).toAlignedRect().adjusted(-2, -2, 2, 2)
+    
+    def log_edit(self, op, *args):
+        if self.journal is not None:
+            self.journal.record(op, *args)
+    
     def get_component_name(self, comp_type):
         prefix_map = {'resistor': 'R', 'capacitor': 'C', 'indutor': 'L', 'voltage_source': 'V', 'voltage_ac': 'V', 'current_source': 'I', 'gnd': 'GND', 'vcc': 'VCC', 'diode': 'D', 'zener': 'D', 'led': 'D', 'schottky': 'D', 'transistor_npn': 'Q', 'transistor_pnp': 'Q', 'mosfet_n': 'M', 'mosfet_p': 'M', 'opamp': 'U', 'comparator': 'U', 'relay': 'K', 'timer555': 'U', 'voltmeter': 'VM', 'ammeter': 'AM', 'oscilloscope': 'OSC', 'probe': 'P', 'switch': 'SW', 'fuse': 'F', 'transformer': 'T', 'crystal': 'Y', 'potentiometer': 'RV'}
         prefix = prefix_map.get(comp_type, 'X')
@@ -90,50 +151,159 @@ class CircuitCanvas(QWidget):
         return f"{prefix}{self.component_counter[prefix]}"
     
     def add_component(self, comp_type, x, y):
-        defaults = self.COMPONENT_DEFAULTS.get(comp_type, {'value': '', 'unit': '', 'category': 'Outros'})
-        component = {'id': str(uuid.uuid4()), 'type': comp_type, 'name': self.get_component_name(comp_type), 'x': x, 'y': y, 'rotation': 0, 'value': defaults['value'], 'unit': defaults['unit'], 'category': defaults['category'], 'visible': True, 'terminals': self.get_terminals(comp_type)}
-        self.components.append(component)
-        self.undo_stack.append(('add', component.copy()))
-        self.redo_stack.clear()
+        component = Component(str(uuid.uuid4()), comp_type, self.get_component_name(comp_type), x, y)
+        self.history.push(self, AddComponents([component]))
         self.update()
         return component
     
+    def insert_components(self, comps, indices=None):
+        if indices is None:
+            self.components.extend(comps)
+        else:
+            # índices da lista final: cada componente volta à posição que ocupava
+            merged, rest = [], iter(self.components)
+            for index, comp in sorted(zip(indices, comps), key=lambda pair: pair[0]):
+                merged.extend(itertools.islice(rest, index - len(merged)))
+                merged.append(comp)
+            merged.extend(rest)
+            self.components = merged
+        for comp in comps:
+            self.by_id[comp['id']] = comp
+            self.nets.add_component(comp)
+            self.spatial.add(comp)
+            self.log_edit('add', comp.to_dict(), dict(self.component_counter))
+        self.note_structure('components_added', comps)
+    
+    def remove_components(self, comps):
+        ids = {comp['id'] for comp in comps}
+        self.components = [c for c in self.components if c['id'] not in ids]
+        for comp in comps:
+            del self.by_id[comp['id']]
+            self.nets.remove_component(comp)
+            self.spatial.remove(comp)
+            if self.selection.pop(comp['id'], None) is not None:
+                self.dragging = False
+            if self.wire_start is comp:
+                self.wire_start = None
+                self.temp_wire_end = None
+            self.log_edit('remove', comp['id'])
+        self.note_structure('components_removed', comps)
+    
+    def insert_wires(self, conns):
+        for conn in conns:
+            self.connections.append(conn)
+            self.nets.add_connection(conn)
+            self.spatial.add_wire(conn)
+            self.log_edit('add_wire', conn.to_dict())
+        self.note_structure('wires_added', conns)
+    
+    def remove_wires(self, conns):
+        if not conns:
+            return
+        ids = {conn['id'] for conn in conns}
+        self.connections = [c for c in self.connections if c['id'] not in ids]
+        for conn in conns:
+            self.nets.remove_connection(conn)
+            self.spatial.remove_wire(conn)
+            self.log_edit('remove_wire', conn['id'])
+        self.note_structure('wires_removed', conns)
+    
+    def set_fields(self, comp, fields):
+        for key, value in fields.items():
+            comp[key] = value
+        if not self.GEOMETRY_KEYS.isdisjoint(fields):
+            self.spatial.update(comp)
+            self.moved[comp['id']] = comp
+        elif not self.SYMBOL_STATE_KEYS.isdisjoint(fields):
+            self.update(self.component_dirty_rect(comp))
+        if not self.GEOMETRY_KEYS.issuperset(fields):
+            if self.VALUE_KEYS.issuperset(fields.keys() - self.GEOMETRY_KEYS):
+                self.stale[comp['id']] = comp
+            else:
+                self.compiled = None
+            self.changed[comp['id']] = comp
+            self.changed_keys.update(fields.keys() - self.GEOMETRY_KEYS)
+        self.log_edit('set', comp['id'], dict(fields))
+        self.schedule_flush()
+    
+    def replace_circuit(self, components, connections, counter):
+        self.components = components
+        self.connections = connections
+        self.component_counter = counter
+        self.by_id = {c['id']: c for c in self.components}
+        self.nets.rebuild(self.components, self.connections)
+        self.spatial.rebuild(self.components, self.connections)
+        self.selected_component = None
+        self.dragging = False
+        self.wire_start = None
+        self.temp_wire_end = None
+        if self.journal is not None:
+            self.journal.start(self.components, self.connections, self.component_counter)
+        self.compiled = None
+        self.changes = [('circuit_reset', None)]
+        self.changed.clear()
+        self.changed_keys.clear()
+        self.moved.clear()
+        self.schedule_flush()
+    
+    def note_structure(self, kind, items):
+        if not items:
+            return
+        self.compiled = None
+        if self.changes and self.changes[0][0] == 'circuit_reset':
+            return
+        if self.changes and self.changes[-1][0] == kind:
+            self.changes[-1][1].extend(items)
+        else:
+            self.changes.append((kind, list(items)))
+        self.schedule_flush()
+    
+    def note_view(self):
+        self.view_dirty = True
+        self.schedule_flush()
+    
+    def schedule_flush(self):
+        if not self.flush_pending:
+            self.flush_pending = True
+            QTimer.singleShot(0, self.flush_changes)
+    
+    def flush_changes(self):
+        self.flush_pending = False
+        changes, self.changes = self.changes, []
+        changed, self.changed = self.changed, {}
+        keys, self.changed_keys = self.changed_keys, set()
+        moved, self.moved = self.moved, {}
+        view, self.view_dirty = self.view_dirty, False
+        for kind, items in changes:
+            if items is None:
+                getattr(self, kind).emit()
+            else:
+                getattr(self, kind).emit(items)
+        if moved:
+            self.components_moved.emit(list(moved.values()))
+        if changed:
+            self.components_changed.emit(list(changed.values()), sorted(keys))
+        if changes or changed:
+            self.circuit_changed.emit()
+            if self.live:
+                self.live_timer.start()
+        if view:
+            self.view_changed.emit()
+    
     def get_terminals(self, comp_type):
-        terminals = {'resistor': [(-40, 0), (40, 0)], 'capacitor': [(-30, 0), (30, 0)], 'indutor': [(-40, 0), (40, 0)], 'potentiometer': [(-40, 0), (40, 0), (0, -30)], 'voltage_source': [(0, -30), (0, 30)], 'voltage_ac': [(0, -30), (0, 30)], 'current_source': [(0, -30), (0, 30)], 'gnd': [(0, -20)], 'vcc': [(0, 20)], 'diode': [(-30, 0), (30, 0)], 'zener': [(-30, 0), (30, 0)], 'led': [(-30, 0), (30, 0)], 'schottky': [(-30, 0), (30, 0)], 'transistor_npn': [(-30, 0), (30, -20), (30, 20)], 'transistor_pnp': [(-30, 0), (30, -20), (30, 20)], 'mosfet_n': [(-30, 0), (30, -20), (30, 20)], 'mosfet_p': [(-30, 0), (30, -20), (30, 20)], 'opamp': [(-40, -15), (-40, 15), (40, 0)], 'comparator': [(-40, -15), (-40, 15), (40, 0)], 'relay': [(-40, -20), (-40, 20), (40, -20), (40, 20)], 'timer555': [(-40, -30), (-40, 0), (-40, 30), (40, -30), (40, 0), (40, 30)], 'voltmeter': [(-20, 0), (20, 0)], 'ammeter': [(-20, 0), (20, 0)], 'oscilloscope': [(0, 30)], 'probe': [(0, 20)], 'switch': [(-30, 0), (30, 0)], 'fuse': [(-30, 0), (30, 0)], 'transformer': [(-40, -20), (-40, 20), (40, -20), (40, 20)], 'crystal': [(-25, 0), (25, 0)]}
-        return terminals.get(comp_type, [(-30, 0), (30, 0)])
+        return terminals(comp_type)
     
     def get_terminal_positions(self, component):
-        terminals = component.get('terminals', [(-30, 0), (30, 0)])
-        cx, cy = component['x'], component['y']
-        rotation = component.get('rotation', 0)
-        positions = []
-        for tx, ty in terminals:
-            rad = math.radians(rotation)
-            rx = tx * math.cos(rad) - ty * math.sin(rad)
-            ry = tx * math.sin(rad) + ty * math.cos(rad)
-            positions.append((cx + rx, cy + ry))
-        return positions
+        return terminal_positions(component)
+    
+    def get_all_terminal_positions(self):
+        return terminal_array(self.components)
     
     def find_terminal_at(self, pos, exclude_comp=None):
-        threshold = 15
-        for comp in self.components:
-            if comp == exclude_comp or not comp.get('visible', True):
-                continue
-            terminals = self.get_terminal_positions(comp)
-            for i, (tx, ty) in enumerate(terminals):
-                dist = math.sqrt((pos.x() - tx)**2 + (pos.y() - ty)**2)
-                if dist < threshold:
-                    return comp, i, (tx, ty)
-        return None, None, None
+        return self.spatial.terminal_at(pos.x(), pos.y(), 15, exclude_comp)
     
     def find_component_at(self, pos):
-        for comp in reversed(self.components):
-            if not comp.get('visible', True):
-                continue
-            cx, cy = comp['x'], comp['y']
-            if abs(pos.x() - cx) < 50 and abs(pos.y() - cy) < 40:
-                return comp
-        return None
+        return self.spatial.component_at(pos.x(), pos.y())
     
     def mousePressEvent(self, event):
         canvas_pos = self.screen_to_canvas(event.pos())
@@ -145,7 +315,9 @@ class CircuitCanvas(QWidget):
         if event.button() == Qt.MouseButton.RightButton:
             comp = self.find_component_at(canvas_pos)
             if comp:
-                self.selected_component = comp
+                if comp['id'] not in self.selection:
+                    self.selected_component = comp
+                self.update()
                 self.show_context_menu(event.globalPosition().toPoint(), comp)
             return
         if event.button() == Qt.MouseButton.LeftButton:
@@ -168,12 +340,22 @@ class CircuitCanvas(QWidget):
                     self.temp_wire_end = None
             else:
                 comp = self.find_component_at(canvas_pos)
-                if comp:
-                    self.selected_component = comp
+                self.click_toggle = comp if self.live and comp and comp['type'] in self.SWITCH_CLOSED else None
+                additive = bool(event.modifiers() & (Qt.KeyboardModifier.ShiftModifier | Qt.KeyboardModifier.ControlModifier))
+                if comp and additive and comp['id'] in self.selection:
+                    del self.selection[comp['id']]
+                elif comp:
+                    if not additive and comp['id'] not in self.selection:
+                        self.selection = {}
+                    self.selection.pop(comp['id'], None)
+                    self.selection[comp['id']] = comp
                     self.dragging = True
                     self.drag_offset = QPoint(canvas_pos.x() - comp['x'], canvas_pos.y() - comp['y'])
+                    self.drag_key = object()
                 else:
-                    self.selected_component = None
+                    if not additive:
+                        self.selection = {}
+                    self.band_origin = QPointF(canvas_pos)
             self.update()
     
     def mouseMoveEvent(self, event):
@@ -182,23 +364,51 @@ class CircuitCanvas(QWidget):
             delta = event.pos() - self.pan_start
             self.pan_offset += delta
             self.pan_start = event.pos()
-            self.update()
+            self.scroll(delta.x(), delta.y())
+            self.note_view()
+            return
+        if self.band_origin is not None:
+            dirty = self.band_screen_rect()
+            self.band_rect = QRectF(self.band_origin, QPointF(canvas_pos)).normalized()
+            self.update(dirty.united(self.band_screen_rect()))
             return
-        if self.dragging and self.selected_component:
+        if self.dragging and self.selection:
+            comp = self.selected_component
             new_pos = self.snap_to_grid(QPoint(canvas_pos.x() - self.drag_offset.x(), canvas_pos.y() - self.drag_offset.y()))
-            self.selected_component['x'] = new_pos.x()
-            self.selected_component['y'] = new_pos.y()
-            self.update()
+            dx, dy = new_pos.x() - comp['x'], new_pos.y() - comp['y']
+            if dx or dy:
+                self.click_toggle = None
+                comps = list(self.selection.values())
+                dirty = self.component_dirty_rect(comp) if len(comps) == 1 else None
+                self.history.push(self, Batch((SetFields(c, {'x': c['x'] + dx, 'y': c['y'] + dy}, self.drag_key) for c in comps), self.drag_key))
+                if dirty is None:
+                    self.update()
+                else:
+                    self.update(dirty.united(self.component_dirty_rect(comp)))
         if self.wire_mode and self.wire_start:
+            dirty = self.temp_wire_rect()
             self.temp_wire_end = (canvas_pos.x(), canvas_pos.y())
-            self.update()
+            self.update(dirty.united(self.temp_wire_rect()))
     
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.MouseButton.MiddleButton:
             self.panning = False
             self.setCursor(Qt.CursorShape.ArrowCursor)
         if event.button() == Qt.MouseButton.LeftButton:
+            if self.band_rect is not None:
+                r = self.band_rect
+                for comp in self.spatial.components_in(r.left(), r.top(), r.right(), r.bottom()):
+                    if comp.get('visible', True):
+                        self.selection[comp['id']] = comp
+            if self.band_origin is not None:
+                self.band_origin = None
+                self.band_rect = None
+                self.update()
             self.dragging = False
+            self.drag_key = None
+            if self.click_toggle is not None:
+                self.toggle_switch(self.click_toggle)
+                self.click_toggle = None
     
     def mouseDoubleClickEvent(self, event):
         canvas_pos = self.screen_to_canvas(event.pos())
@@ -207,6 +417,11 @@ class CircuitCanvas(QWidget):
             self.edit_component_value(comp)
     
     def wheelEvent(self, event):
+        if self.live:
+            comp = self.find_component_at(self.screen_to_canvas(event.position().toPoint()))
+            if comp and comp['type'] == 'potentiometer':
+                self.adjust_wiper(comp, self.WIPER_STEP if event.angleDelta().y() > 0 else -self.WIPER_STEP)
+                return
         factor = 1.1 if event.angleDelta().y() > 0 else 0.9
         self.zoom(factor, event.position().toPoint())
     
@@ -225,6 +440,12 @@ class CircuitCanvas(QWidget):
             self.redo()
         elif event.key() == Qt.Key.Key_A and event.modifiers() == Qt.KeyboardModifier.ControlModifier:
             self.select_all()
+        elif event.key() == Qt.Key.Key_C and event.modifiers() == Qt.KeyboardModifier.ControlModifier:
+            self.copy_selected()
+        elif event.key() == Qt.Key.Key_X and event.modifiers() == Qt.KeyboardModifier.ControlModifier:
+            self.cut_selected()
+        elif event.key() == Qt.Key.Key_V and event.modifiers() == Qt.KeyboardModifier.ControlModifier:
+            self.paste()
     
     def dragEnterEvent(self, event):
         if event.mimeData().hasText():
@@ -242,10 +463,8 @@ class CircuitCanvas(QWidget):
         event.acceptProposedAction()
     
     def add_connection(self, comp1, term1, comp2, term2):
-        connection = {'id': str(uuid.uuid4()), 'from_component': comp1['id'], 'from_terminal': term1, 'to_component': comp2['id'], 'to_terminal': term2}
-        self.connections.append(connection)
-        self.undo_stack.append(('add_wire', connection.copy()))
-        self.redo_stack.clear()
+        connection = Connection(str(uuid.uuid4()), comp1['id'], term1, comp2['id'], term2)
+        self.history.push(self, AddWire(connection))
         self.update()
     
     def start_wire_mode(self):
@@ -263,25 +482,53 @@ class CircuitCanvas(QWidget):
         self.update()
     
     def delete_selected(self):
-        if self.selected_component:
-            comp_id = self.selected_component['id']
-            self.connections = [c for c in self.connections if c['from_component'] != comp_id and c['to_component'] != comp_id]
-            self.components.remove(self.selected_component)
-            self.undo_stack.append(('delete', self.selected_component.copy()))
-            self.redo_stack.clear()
-            self.selected_component = None
-            self.update()
+        comps = list(self.selection.values())
+        if not comps:
+            return
+        wires = {w['id']: w for comp in comps for w in self.spatial.component_wires(comp)}
+        self.history.push(self, DeleteComponents(comps, wires.values()))
+        self.update()
     
     def rotate_selected(self):
-        if self.selected_component:
-            self.selected_component['rotation'] = (self.selected_component.get('rotation', 0) + 90) % 360
-            self.update()
+        comps = list(self.selection.values())
+        if not comps:
+            return
+        if len(comps) == 1:
+            cx, cy = comps[0]['x'], comps[0]['y']
+        else:
+            center = self.snap_to_grid(QPointF(sum(c['x'] for c in comps) / len(comps), sum(c['y'] for c in comps) / len(comps)))
+            cx, cy = center.x(), center.y()
+        self.history.push(self, Batch(SetFields(c, {'x': cx - (c['y'] - cy), 'y': cy + (c['x'] - cx), 'rotation': (c.get('rotation', 0) + 90) % 360}) for c in comps))
+        self.update()
+    
+    def copy_selected(self):
+        if not self.selection:
+            return
+        ids = set(self.selection)
+        wires = {w['id']: w for comp in self.selection.values() for w in self.spatial.component_wires(comp) if w['from_component'] in ids and w['to_component'] in ids}
+        self.clipboard = ([c.to_dict() for c in self.selection.values()], [w.to_dict() for w in wires.values()])
+    
+    def cut_selected(self):
+        self.copy_selected()
+        self.delete_selected()
+    
+    def paste(self):
+        if not self.clipboard:
+            return
+        offset = 2 * self.grid_size
+        ids, comps = {}, []
+        for data in self.clipboard[0]:
+            comp = Component.from_dict(dict(data, id=str(uuid.uuid4()), name=self.get_component_name(data['type']), x=data['x'] + offset, y=data['y'] + offset))
+            ids[data['id']] = comp.id
+            comps.append(comp)
+        wires = [Connection.from_dict(dict(w, id=str(uuid.uuid4()), from_component=ids[w['from_component']], to_component=ids[w['to_component']])) for w in self.clipboard[1]]
+        self.history.push(self, AddComponents(comps, wires))
+        self.clipboard = ([c.to_dict() for c in comps], [w.to_dict() for w in wires])
+        self.selection = {c.id: c for c in comps}
+        self.update()
     
     def clear(self):
-        self.components = []
-        self.connections = []
-        self.selected_component = None
-        self.component_counter = {}
+        self.history.push(self, ClearCircuit())
         self.update()
     
     def clear_selection(self):
@@ -289,9 +536,8 @@ class CircuitCanvas(QWidget):
         self.update()
     
     def select_all(self):
-        if self.components:
-            self.selected_component = self.components[-1]
-            self.update()
+        self.selection = {c['id']: c for c in self.components if c.get('visible', True)}
+        self.update()
     
     def zoom(self, factor, center=None):
         old_zoom = self.zoom_level
@@ -299,6 +545,7 @@ class CircuitCanvas(QWidget):
         if center and self.zoom_level != old_zoom:
             scale = self.zoom_level / old_zoom
             self.pan_offset = QPoint(int(center.x() - (center.x() - self.pan_offset.x()) * scale), int(center.y() - (center.y() - self.pan_offset.y()) * scale))
+        self.note_view()
         self.update()
     
     def fit_to_window(self):
@@ -314,6 +561,7 @@ class CircuitCanvas(QWidget):
         zoom_y = self.height() / height
         self.zoom_level = min(zoom_x, zoom_y, 2.0)
         self.pan_offset = QPoint(int(self.width() / 2 - (min_x + width / 2) * self.zoom_level), int(self.height() / 2 - (min_y + height / 2) * self.zoom_level))
+        self.note_view()
         self.update()
     
     def toggle_grid(self):
@@ -325,41 +573,23 @@ class CircuitCanvas(QWidget):
             return
         cols = int(math.ceil(math.sqrt(len(self.components))))
         spacing = 120
-        for i, comp in enumerate(self.components):
-            comp['x'] = 100 + (i % cols) * spacing
-            comp['y'] = 100 + (i // cols) * spacing
+        self.history.push(self, Batch(SetFields(comp, {'x': 100 + (i % cols) * spacing, 'y': 100 + (i // cols) * spacing}) for i, comp in enumerate(self.components)))
         self.update()
     
     def undo(self):
-        if not self.undo_stack:
-            return
-        action = self.undo_stack.pop()
-        self.redo_stack.append(action)
-        if action[0] == 'add':
-            self.components = [c for c in self.components if c['id'] != action[1]['id']]
-        elif action[0] == 'delete':
-            self.components.append(action[1])
-        elif action[0] == 'add_wire':
-            self.connections = [c for c in self.connections if c['id'] != action[1]['id']]
-        self.update()
+        if self.history.undo(self):
+            self.update()
     
     def redo(self):
-        if not self.redo_stack:
-            return
-        action = self.redo_stack.pop()
-        self.undo_stack.append(action)
-        if action[0] == 'add':
-            self.components.append(action[1])
-        elif action[0] == 'delete':
-            self.components = [c for c in self.components if c['id'] != action[1]['id']]
-        elif action[0] == 'add_wire':
-            self.connections.append(action[1])
-        self.update()
+        if self.history.redo(self):
+            self.update()
     
     def show_context_menu(self, pos, component):
         menu = QMenu(self)
         menu.addAction("Editar Valor").triggered.connect(lambda: self.edit_component_value(component))
         menu.addAction("Rotacionar").triggered.connect(self.rotate_selected)
+        if component['type'] in self.SWITCH_CLOSED:
+            menu.addAction("Abrir/Fechar").triggered.connect(lambda: self.toggle_switch(component))
         menu.addSeparator()
         menu.addAction("Excluir").triggered.connect(self.delete_selected)
         menu.exec(pos)
@@ -367,154 +597,194 @@ class CircuitCanvas(QWidget):
     def edit_component_value(self, component):
         text, ok = QInputDialog.getText(self, "Editar", f"Valor para {component['name']}:", text=component.get('value', ''))
         if ok:
-            component['value'] = text
+            self.history.push(self, SetFields(component, {'value': text}))
             self.update()
     
+    def toggle_switch(self, component):
+        default = {'closed': self.SWITCH_CLOSED[component['type']]}
+        closed = component.get('closed', default['closed'])
+        self.history.push(self, SetFields(component, {'closed': not closed}, defaults=default))
+    
+    def adjust_wiper(self, component, step):
+        wiper = component.get('wiper', self.WIPER_DEFAULT)
+        new = min(max(round(wiper + step, 2), 0.0), 1.0)
+        if new != wiper:
+            self.history.push(self, SetFields(component, {'wiper': new}, ('wiper', component['id']), {'wiper': self.WIPER_DEFAULT}))
+    
+    def set_visible(self, components, visible):
+        self.history.push(self, Batch(SetFields(comp, {'visible': visible}) for comp in components))
+        self.update()
+    
     def get_circuit_data(self):
-        return {'components': self.components, 'connections': self.connections, 'counter': self.component_counter}
+        from circuit_project import project_data
+        return project_data(self.components, self.connections, self.component_counter)
     
     def load_circuit_data(self, data):
-        self.components = data.get('components', [])
-        self.connections = data.get('connections', [])
-        self.component_counter = data.get('counter', {})
-        self.selected_component = None
+        from circuit_project import project_from_data
+        self.set_circuit(*project_from_data(data))
+    
+    def set_circuit(self, components, connections, counter):
+        self.replace_circuit(components, connections, counter)
+        self.history.clear()
         self.update()
     
     def get_netlist(self):
-        lines = ["* Dan_simulation_circuit - SPICE Netlist", ""]
-        node_counter = 1
-        for comp in self.components:
-            t, n, v = comp['type'], comp['name'], comp.get('value', '')
-            if t == 'gnd':
-                continue
-            if t in ['resistor', 'capacitor', 'indutor']:
-                lines.append(f"{n} n{node_counter} n{node_counter+1} {v}")
-                node_counter += 2
-            elif t == 'voltage_source':
-                lines.append(f"{n} n{node_counter} 0 DC {v}")
-                node_counter += 1
-        lines.append("\n.END")
-        return "\n".join(lines)
+        return "\n".join(self.iter_netlist())
+    
+    def iter_netlist(self):
+        from circuit_netlist import iter_netlist
+        return iter_netlist(self.components, self.nets, self.parse_value)
+    
+    def write_netlist(self, f):
+        from circuit_netlist import write_netlist
+        write_netlist(f, self.components, self.nets, self.parse_value)
+    
+    def netlist_snapshot(self):
+        # cópia para gerar o netlist fora da thread da interface
+        return [c.copy() for c in self.components], self.nets.snapshot()
     
     def parse_value(self, value_str):
-        if not value_str:
-            return 0.0
-        mults = {'p': 1e-12, 'n': 1e-9, 'u': 1e-6, 'm': 1e-3, 'k': 1e3, 'K': 1e3, 'M': 1e6, 'G': 1e9}
-        value_str = str(value_str).replace(' ', '').replace('Ω', '').replace('V', '').replace('A', '').replace('F', '').replace('H', '')
-        for s, m in mults.items():
-            if s in value_str:
-                try:
-                    return float(value_str.replace(s, '')) * m
-                except:
-                    pass
-        try:
-            return float(value_str)
-        except:
-            return 0.0
+        return parse_value(value_str)
     
     def get_component_by_id(self, comp_id):
-        for c in self.components:
-            if c['id'] == comp_id:
-                return c
-        return None
+        return self.by_id.get(comp_id)
     
     def find_connected_components(self, component):
         connected = []
         cid = component['id']
-        for conn in self.connections:
-            if conn['from_component'] == cid:
-                other = self.get_component_by_id(conn['to_component'])
-                if other:
-                    connected.append({'component': other})
-            elif conn['to_component'] == cid:
-                other = self.get_component_by_id(conn['from_component'])
+        for net in set(self.nets.component_nets(component)):
+            for other_id, _ in self.nets.terminals(net):
+                other = self.get_component_by_id(other_id) if other_id != cid else None
                 if other:
                     connected.append({'component': other})
         return connected
     
+    def compile(self):
+        from circuit_solver import compile_circuit, update_circuit
+        stale, self.stale = self.stale, {}
+        if self.compiled is not None and stale:
+            self.compiled = update_circuit(self.compiled, list(stale.values()), self.nets, self.parse_value)
+        if self.compiled is None:
+            self.compiled = compile_circuit(self.components, self.connections, self.parse_value, self.nets)
+            self.topology += 1
+        return self.compiled
+    
+    def mna_system(self, key):
+        # um sistema MNA por consumidor ('live', 'dc'): só é refeito quando a topologia muda,
+        # senão os valores são reestampados e a fatoração anterior serve de base
+        from circuit_solver import MnaSystem
+        topology, system = self.systems.pop(key, (None, None))
+        ckt = self.compile()
+        if topology != self.topology:
+            system = MnaSystem(ckt)
+        else:
+            system.restamp(ckt)
+        self.systems[key] = (self.topology, system)
+        return system
+    
     def simulate(self):
-        results = {'nodes': {}, 'currents': {}, 'power': {}, 'voltages': {}}
-        voltage_sources = [{'name': c['name'], 'voltage': self.parse_value(c.get('value', '0'))} for c in self.components if c['type'] in ['voltage_source', 'vcc']]
-        for vs in voltage_sources:
-            results['voltages'][vs['name']] = vs['voltage']
-        total_voltage = sum(vs['voltage'] for vs in voltage_sources) or 12.0
-        resistors = [{'name': c['name'], 'resistance': self.parse_value(c.get('value', '1k')), 'component': c} for c in self.components if c['type'] == 'resistor']
-        total_resistance = sum(r['resistance'] for r in resistors if r['resistance'] > 0)
-        total_current = total_voltage / total_resistance if total_resistance > 0 else 0.0
-        for vs in voltage_sources:
-            results['nodes'][f"V({vs['name']}+)"] = vs['voltage']
-            results['nodes'][f"V({vs['name']}-)"] = 0.0
-        node_voltage = total_voltage
-        for res in resistors:
-            r, name = res['resistance'], res['name']
-            connected = self.find_connected_components(res['component'])
-            current = next((self.parse_value(c['component'].get('value', '0')) for c in connected if c['component']['type'] == 'current_source'), None) or total_current
-            v_drop = current * r
-            results['currents'][name] = current
-            results['power'][name] = current * current * r
-            results['voltages'][name] = v_drop
-            results['nodes'][f"V({name}+)"] = node_voltage
-            node_voltage -= v_drop
-            results['nodes'][f"V({name}-)"] = node_voltage
-        for c in self.components:
-            if c['type'] in ['diode', 'led', 'schottky']:
-                vd = {'led': 2.0, 'schottky': 0.3}.get(c['type'], 0.7)
-                if total_current > 0:
-                    results['currents'][c['name']] = total_current
-                    results['power'][c['name']] = vd * total_current
-                    results['voltages'][c['name']] = vd
-            elif c['type'] == 'capacitor':
-                results['currents'][c['name']] = 0.0
-                results['power'][c['name']] = 0.0
-                results['voltages'][c['name']] = total_voltage
-            elif c['type'] == 'indutor':
-                results['currents'][c['name']] = total_current
-                results['power'][c['name']] = 0.0
-                results['voltages'][c['name']] = 0.0
-        results['summary'] = {'total_voltage': total_voltage, 'total_resistance': total_resistance, 'total_current': total_current, 'num_components': len(self.components), 'num_connections': len(self.connections)}
-        return results
+        from circuit_solver import analyze_dc
+        return analyze_dc(self.compile())
+    
+    def simulate_ac(self, sweep):
+        from circuit_ac import parse_sweep, simulate_ac
+        return simulate_ac(self.compile(), parse_sweep(sweep, self.parse_value))
+    
+    def simulate_transient(self, t_stop, h_max=None):
+        from circuit_transient import simulate_transient
+        return simulate_transient(self.compile(), t_stop, h_max)
+    
+    def set_live(self, enabled):
+        self.live = enabled
+        if enabled:
+            self.live_timer.start()
+            return
+        self.live_timer.stop()
+        self.live_pending = False
+        if self.live_worker is not None:
+            self.live_worker.requestInterruption()
+            self.live_worker.wait()
+        self.live_results = {}
+        self.systems.pop('live', None)
+        self.update()
+    
+    def run_live(self):
+        if not self.live:
+            return
+        if self.live_worker is not None:
+            self.live_pending = True
+            return
+        from circuit_solver import SimulationError, analyze_dc
+        try:
+            system = self.mna_system('live')
+        except SimulationError as e:
+            self.on_live_failed(str(e))
+            return
+        from circuit_worker import SimulationWorker
+        self.live_worker = SimulationWorker(analyze_dc, system.ckt, system, parent=self)
+        self.live_worker.result.connect(self.on_live_result)
+        self.live_worker.failed.connect(self.on_live_failed)
+        self.live_worker.finished.connect(self.on_live_finished)
+        self.live_worker.start()
+    
+    def on_live_result(self, results):
+        if self.live:
+            self.live_results = results['voltages']
+            self.update()
+    
+    def on_live_failed(self, message):
+        self.live_results = {}
+        self.update()
+        self.live_failed.emit(message)
+    
+    def on_live_finished(self):
+        self.live_worker.deleteLater()
+        self.live_worker = None
+        if self.live_pending:
+            self.live_pending = False
+            self.run_live()
     
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.fillRect(self.rect(), QColor("#1a1a2e"))
+        painter.fillRect(event.rect(), QColor("#1a1a2e"))
+        view = self.screen_rect_to_canvas(event.rect())
         painter.translate(self.pan_offset)
         painter.scale(self.zoom_level, self.zoom_level)
         if self.show_grid:
-            self.draw_grid(painter)
-        self.draw_connections(painter)
+            self.draw_grid(painter, view)
+        self.draw_connections(painter, view)
         if self.wire_mode and self.wire_start and self.temp_wire_end:
             self.draw_temp_wire(painter)
-        for comp in self.components:
-            if comp.get('visible', True):
-                self.draw_component(painter, comp)
-        if self.selected_component:
-            self.draw_selection(painter, self.selected_component)
-    
-    def draw_grid(self, painter):
-        view_rect = QRectF(-self.pan_offset.x() / self.zoom_level, -self.pan_offset.y() / self.zoom_level, self.width() / self.zoom_level, self.height() / self.zoom_level)
-        sx, sy = int(view_rect.left() / self.grid_size) * self.grid_size, int(view_rect.top() / self.grid_size) * self.grid_size
+        m = self.CULL_MARGIN
+        comps = [c for c in self.spatial.components_in(view.left() - m, view.top() - m, view.right() + m, view.bottom() + m) if c.get('visible', True)]
+        self.draw_components(painter, comps)
+        if self.live_results:
+            self.draw_live_values(painter, comps)
+        if self.selection:
+            for comp in comps:
+                if comp['id'] in self.selection:
+                    self.draw_selection(painter, comp)
+        if self.band_rect is not None:
+            pen = QPen(QColor("#00aaff"), 1, Qt.PenStyle.DashLine)
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            painter.setBrush(QColor(0, 170, 255, 40))
+            painter.drawRect(self.band_rect)
+    
+    def draw_grid(self, painter, view):
+        step = self.grid_size * max(1, math.ceil(self.GRID_MIN_SPACING / (self.grid_size * self.zoom_level)))
+        sx, sy = math.floor(view.left() / step) * step, math.floor(view.top() / step) * step
         painter.setPen(QPen(QColor("#3a3a5a"), 2))
-        for x in range(sx, int(view_rect.right()) + self.grid_size, self.grid_size):
-            for y in range(sy, int(view_rect.bottom()) + self.grid_size, self.grid_size):
-                painter.drawPoint(x, y)
+        ys = range(sy, int(view.bottom()) + step, step)
+        painter.drawPoints(QPolygonF([QPointF(x, y) for x in range(sx, int(view.right()) + step, step) for y in ys]))
     
-    def draw_connections(self, painter):
+    def draw_connections(self, painter, view):
         painter.setPen(QPen(QColor("#00ff88"), 2))
-        for conn in self.connections:
-            fc = next((c for c in self.components if c['id'] == conn['from_component']), None)
-            tc = next((c for c in self.components if c['id'] == conn['to_component']), None)
-            if fc and tc:
-                ft, tt = self.get_terminal_positions(fc), self.get_terminal_positions(tc)
-                fi, ti = conn.get('from_terminal', 0), conn.get('to_terminal', 0)
-                if fi < len(ft) and ti < len(tt):
-                    x1, y1, x2, y2 = ft[fi][0], ft[fi][1], tt[ti][0], tt[ti][1]
-                    path = QPainterPath()
-                    path.moveTo(x1, y1)
-                    path.lineTo((x1+x2)/2, y1)
-                    path.lineTo((x1+x2)/2, y2)
-                    path.lineTo(x2, y2)
-                    painter.drawPath(path)
+        for conn in self.spatial.wires_in(view.left(), view.top(), view.right(), view.bottom()):
+            x1, y1, x2, y2 = self.spatial.wire_path(conn)
+            xm = (x1 + x2) / 2
+            painter.drawPolyline(QPolygonF([QPointF(x1, y1), QPointF(xm, y1), QPointF(xm, y2), QPointF(x2, y2)]))
     
     def draw_temp_wire(self, painter):
         painter.setPen(QPen(QColor("#ffff00"), 2, Qt.PenStyle.DashLine))
@@ -522,32 +792,115 @@ class CircuitCanvas(QWidget):
         if self.wire_start_terminal < len(ft):
             painter.drawLine(int(ft[self.wire_start_terminal][0]), int(ft[self.wire_start_terminal][1]), int(self.temp_wire_end[0]), int(self.temp_wire_end[1]))
     
+    def temp_wire_rect(self):
+        if not (self.wire_start and self.temp_wire_end):
+            return QRect()
+        ft = self.get_terminal_positions(self.wire_start)
+        if self.wire_start_terminal >= len(ft):
+            return QRect()
+        (x1, y1), (x2, y2) = ft[self.wire_start_terminal], self.temp_wire_end
+        return self.canvas_rect_to_screen(QRectF(QPointF(min(x1, x2), min(y1, y2)), QPointF(max(x1, x2), max(y1, y2))))
+    
+    def band_screen_rect(self):
+        return self.canvas_rect_to_screen(self.band_rect) if self.band_rect is not None else QRect()
+    
     def draw_selection(self, painter, comp):
         painter.setPen(QPen(QColor("#00aaff"), 2, Qt.PenStyle.DashLine))
         painter.setBrush(Qt.BrushStyle.NoBrush)
         painter.drawRect(int(comp['x'] - 55), int(comp['y'] - 45), 110, 90)
     
-    def draw_component(self, painter, comp):
-        cx, cy, ct, rot = comp['x'], comp['y'], comp['type'], comp.get('rotation', 0)
+    def live_rect(self, comp):
+        return QRectF(comp['x'] + 18, comp['y'] - 46, 78, 18)
+    
+    def draw_live_values(self, painter, comps):
+        painter.setPen(QPen(QColor("#ffcc00"), 1))
+        painter.setBrush(QColor(0, 0, 0, 180))
+        painter.setFont(self.label_font)
+        for comp in comps:
+            if comp['type'] in self.LIVE_METERS and comp['name'] in self.live_results:
+                rect = self.live_rect(comp)
+                painter.drawRect(rect)
+                painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, f"{self.live_results[comp['name']]:.4g} V")
+    
+    def label_rect(self, comp):
+        fm = self.label_metrics
+        width = max(fm.horizontalAdvance(comp.get('name', '')), fm.horizontalAdvance(f"{comp.get('value', '')}{comp.get('unit', '')}"))
+        return QRectF(comp['x'] - 40, comp['y'] + 35 - fm.ascent(), width, 13 + fm.height())
+    
+    def component_dirty_rect(self, comp):
+        e = self.SYMBOL_EXTENT
+        rect = QRectF(comp['x'] - e, comp['y'] - e, 2 * e, 2 * e).united(self.label_rect(comp))
+        if self.live_results and comp['type'] in self.LIVE_METERS:
+            rect = rect.united(self.live_rect(comp))
+        for conn in self.spatial.component_wires(comp):
+            path = self.spatial.wire_path(conn)
+            if path:
+                x1, y1, x2, y2 = path
+                rect = rect.united(QRectF(QPointF(min(x1, x2), min(y1, y2)), QPointF(max(x1, x2), max(y1, y2))))
+        return self.canvas_rect_to_screen(rect)
+    
+    def symbol_state(self, comp):
+        # estado visível no símbolo; entra na chave do cache junto com tipo e rotação
+        ct = comp['type']
+        if ct in self.SWITCH_CLOSED:
+            return bool(comp.get('closed', self.SWITCH_CLOSED[ct]))
+        if ct == 'potentiometer':
+            return round(float(comp.get('wiper', self.WIPER_DEFAULT)), 2)
+        return None
+    
+    def symbol_pixmap(self, ct, rot, state=None):
+        scale = (self.zoom_level, self.devicePixelRatioF())
+        if scale != self.symbol_scale:
+            self.symbol_cache.clear()
+            self.symbol_scale = scale
+        key = (ct, rot, state)
+        pix = self.symbol_cache.get(key)
+        if pix is None:
+            zoom, ratio = scale
+            size = int(math.ceil(2 * self.SYMBOL_EXTENT * zoom * ratio))
+            pix = QPixmap(size, size)
+            pix.setDevicePixelRatio(ratio)
+            pix.fill(Qt.GlobalColor.transparent)
+            p = QPainter(pix)
+            p.setRenderHint(QPainter.RenderHint.Antialiasing)
+            p.scale(zoom, zoom)
+            p.translate(self.SYMBOL_EXTENT, self.SYMBOL_EXTENT)
+            p.rotate(rot)
+            self.draw_symbol(p, ct, state)
+            p.end()
+            self.symbol_cache[key] = pix
+        return pix
+    
+    def draw_components(self, painter, comps):
+        z = self.zoom_level
+        ox = self.pan_offset.x() - self.SYMBOL_EXTENT * z
+        oy = self.pan_offset.y() - self.SYMBOL_EXTENT * z
         painter.save()
-        painter.translate(cx, cy)
-        painter.rotate(rot)
-        painter.setPen(QPen(QColor("#00ff88"), 2))
-        painter.setBrush(QBrush(QColor("#1a1a2e")))
-        {'resistor': self.draw_resistor, 'capacitor': self.draw_capacitor, 'indutor': self.draw_inductor, 'voltage_source': lambda p: self.draw_voltage_source(p, False), 'voltage_ac': lambda p: self.draw_voltage_source(p, True), 'current_source': self.draw_current_source, 'gnd': self.draw_ground, 'vcc': self.draw_vcc, 'diode': self.draw_diode, 'schottky': self.draw_diode, 'zener': self.draw_zener, 'led': self.draw_led, 'transistor_npn': self.draw_transistor_npn, 'transistor_pnp': self.draw_transistor_pnp, 'mosfet_n': lambda p: self.draw_mosfet(p, True), 'mosfet_p': lambda p: self.draw_mosfet(p, False), 'opamp': self.draw_opamp, 'switch': self.draw_switch, 'probe': self.draw_probe, 'relay': self.draw_relay, 'ammeter': self.draw_ammeter}.get(ct, self.draw_generic)(painter)
+        painter.resetTransform()
+        for comp in comps:
+            painter.drawPixmap(QPoint(round(comp['x'] * z + ox), round(comp['y'] * z + oy)), self.symbol_pixmap(comp['type'], comp.get('rotation', 0), self.symbol_state(comp)))
         painter.restore()
-        self.draw_terminals(painter, comp)
+        if z < self.LABEL_MIN_ZOOM:
+            return
         painter.setPen(QPen(QColor("#ffffff"), 1))
-        painter.setFont(QFont("Arial", 9))
-        painter.drawText(int(cx - 40), int(cy + 35), comp.get('name', ''))
-        if comp.get('value'):
-            painter.drawText(int(cx - 40), int(cy + 48), f"{comp['value']}{comp.get('unit', '')}")
+        painter.setFont(self.label_font)
+        for comp in comps:
+            cx, cy = comp['x'], comp['y']
+            painter.drawText(int(cx - 40), int(cy + 35), comp.get('name', ''))
+            if comp.get('value'):
+                painter.drawText(int(cx - 40), int(cy + 48), f"{comp['value']}{comp.get('unit', '')}")
     
-    def draw_terminals(self, painter, comp):
+    def draw_symbol(self, painter, ct, state=None):
+        painter.setPen(QPen(QColor("#00ff88"), 2))
+        painter.setBrush(QBrush(QColor("#1a1a2e")))
+        name, *args = self.SYMBOL_PAINTERS.get(ct, ('draw_generic',))
+        if state is not None:
+            args.append(state)
+        getattr(self, name)(painter, *args)
         painter.setPen(QPen(QColor("#ff6600"), 2))
         painter.setBrush(QBrush(QColor("#ff6600")))
-        for tx, ty in self.get_terminal_positions(comp):
-            painter.drawEllipse(int(tx - 4), int(ty - 4), 8, 8)
+        for tx, ty in self.get_terminals(ct):
+            painter.drawEllipse(QPointF(tx, ty), 4, 4)
     
     def draw_resistor(self, p):
         path = QPainterPath()
@@ -675,12 +1028,15 @@ class CircuitCanvas(QWidget):
         p.drawText(-27, -10, "+")
         p.drawText(-27, 20, "-")
     
-    def draw_switch(self, p):
+    def draw_switch(self, p, closed=False):
         p.drawLine(-30, 0, -10, 0)
         p.drawLine(10, 0, 30, 0)
         p.drawEllipse(-12, -4, 8, 8)
         p.drawEllipse(4, -4, 8, 8)
-        p.drawLine(-8, 0, 15, -15)
+        if closed:
+            p.drawLine(-8, 0, 8, 0)
+        else:
+            p.drawLine(-8, 0, 15, -15)
     
     def draw_probe(self, p):
         p.drawEllipse(-15, -15, 30, 30)
@@ -688,16 +1044,37 @@ class CircuitCanvas(QWidget):
         p.drawLine(-8, 8, 8, -8)
         p.drawLine(0, 15, 0, 20)
     
-    def draw_relay(self, p):
+    def draw_relay(self, p, closed=False):
         p.drawRect(-20, -25, 15, 50)
         p.drawLine(10, -20, 10, -10)
         p.drawLine(10, 10, 10, 20)
-        p.drawLine(10, -10, 25, 5)
+        if closed:
+            p.drawLine(10, -10, 10, 10)
+        else:
+            p.drawLine(10, -10, 25, 5)
         p.drawLine(-40, -20, -20, -20)
         p.drawLine(-40, 20, -20, 20)
         p.drawLine(10, -20, 40, -20)
         p.drawLine(10, 20, 40, 20)
     
+    def draw_fuse(self, p, closed=True):
+        p.drawLine(-30, 0, -20, 0)
+        p.drawLine(20, 0, 30, 0)
+        p.drawRect(-20, -7, 40, 14)
+        if closed:
+            p.drawLine(-20, 0, 20, 0)
+        else:
+            p.drawLine(-20, 0, -5, -4)
+            p.drawLine(5, 4, 20, 0)
+    
+    def draw_potentiometer(self, p, wiper=0.5):
+        self.draw_resistor(p)
+        x = -30 + 60 * wiper
+        p.drawLine(QPointF(0, -30), QPointF(x, -30))
+        p.drawLine(QPointF(x, -30), QPointF(x, -14))
+        p.drawLine(QPointF(x, -14), QPointF(x - 4, -20))
+        p.drawLine(QPointF(x, -14), QPointF(x + 4, -20))
+    
     def draw_ammeter(self, p):
         p.drawEllipse(-20, -20, 40, 40)
         p.drawLine(-20, 0, -30, 0)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Simulação em lote pela linha de comando, sem interface gráfica
+
+    python -m circuit_cli projeto.dsc -a dc
+    python -m circuit_cli testes/*.dsc -a ac --sweep "DEC 20 10 1Meg" -f npz -o resultados -j 8
+    python -m circuit_cli filtro.json -a tran --tstop 10m -f csv -o -
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from circuit_ac import parse_sweep, simulate_ac
+from circuit_nets import NetIndex
+from circuit_netlist import write_netlist
+from circuit_project import read_project
+from circuit_solver import SimulationError, analyze_dc, compile_circuit
+from circuit_transient import simulate_transient
+from circuit_units import parse_quantity, parse_value
+
+ANALYSES = ('dc', 'ac', 'tran', 'netlist')
+FORMATS = ('csv', 'json', 'npz')
+SECTION_PREFIX = {'currents': 'I', 'power': 'P', 'voltages': 'VD'}
+
+
+def load_design(path):
+    components, connections, _ = read_project(path)
+    nets = NetIndex()
+    nets.rebuild(components, connections)
+    return components, connections, nets
+
+
+def run_analysis(path, analysis, sweep=None, t_stop=None, h_max=None):
+    components, connections, nets = load_design(path)
+    ckt = compile_circuit(components, connections, parse_value, nets)
+    if analysis == 'dc':
+        return analyze_dc(ckt)
+    if analysis == 'ac':
+        return simulate_ac(ckt, parse_sweep(sweep, parse_value))
+    return simulate_transient(ckt, t_stop, h_max)
+
+
+def columns(results):
+    axis = 'time' if 'time' in results else 'frequency'
+    cols = {axis: results[axis]}
+    cols.update(results['nodes'])
+    cols.update((f"I({name})", wave) for name, wave in results['currents'].items())
+    return cols
+
+
+def _json_default(obj):
+    if isinstance(obj, np.ndarray):
+        if np.iscomplexobj(obj):
+            return {'real': obj.real.tolist(), 'imag': obj.imag.tolist()}
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Tipo não serializável: {type(obj).__name__}")
+
+
+def write_json(f, results):
+    json.dump(results, f, default=_json_default, ensure_ascii=False, indent=1)
+    f.write('\n')
+
+
+def write_csv(f, results):
+    writer = csv.writer(f, lineterminator='\n')
+    if 'time' not in results and 'frequency' not in results:
+        writer.writerow(('section', 'name', 'value'))
+        for section in ('nodes', 'currents', 'power', 'voltages'):
+            writer.writerows((section, name, value) for name, value in results.get(section, {}).items())
+        return
+    cols = columns(results)
+    header, data = [], []
+    for name, values in cols.items():
+        if np.iscomplexobj(values):
+            header += [f"{name}.re", f"{name}.im"]
+            data += [values.real, values.imag]
+        else:
+            header.append(name)
+            data.append(values)
+    writer.writerow(header)
+    writer.writerows(np.column_stack(data).tolist() if data else ())
+
+
+def npz_arrays(results):
+    if 'time' in results or 'frequency' in results:
+        return {name: np.asarray(values) for name, values in columns(results).items()}
+    arrays = {name: np.float64(value) for name, value in results['nodes'].items()}
+    for section, prefix in SECTION_PREFIX.items():
+        arrays.update((f"{prefix}({name})", np.float64(value)) for name, value in results.get(section, {}).items())
+    return arrays
+
+
+def output_path(out_dir, path, analysis, fmt):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    ext = 'cir' if analysis == 'netlist' else fmt
+    return os.path.join(out_dir, f"{stem}.{analysis}.{ext}")
+
+
+def process(path, args):
+    target = '-' if args.output == '-' else output_path(args.output, path, args.analysis, args.format)
+    if args.analysis == 'netlist':
+        components, _, nets = load_design(path)
+        if target == '-':
+            write_netlist(sys.stdout, components, nets, parse_value)
+        else:
+            with open(target, 'w', encoding='utf-8') as f:
+                write_netlist(f, components, nets, parse_value)
+        return target
+    results = run_analysis(path, args.analysis, args.sweep, args.tstop, args.hmax)
+    if args.format == 'npz':
+        np.savez(target if target != '-' else sys.stdout.buffer, **npz_arrays(results))
+    elif target == '-':
+        (write_json if args.format == 'json' else write_csv)(sys.stdout, results)
+    else:
+        with open(target, 'w', encoding='utf-8', newline='') as f:
+            (write_json if args.format == 'json' else write_csv)(f, results)
+    return target
+
+
+def _job(path, args):
+    try:
+        return path, process(path, args), None
+    except (OSError, ValueError, SimulationError) as e:
+        return path, None, str(e)
+    except Exception as e:
+        # qualquer outra falha conta só contra este projeto; o lote continua
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m circuit_cli', description="Simula projetos .dsc/.json sem abrir a interface gráfica.")
+    parser.add_argument('designs', nargs='+', help="arquivos de projeto (.dsc binário ou .json)")
+    parser.add_argument('-a', '--analysis', choices=ANALYSES, default='dc', help="análise a executar (padrão: dc)")
+    parser.add_argument('-f', '--format', choices=FORMATS, default='json', help="formato de saída (padrão: json)")
+    parser.add_argument('-o', '--output', default='-', help="diretório de saída, ou '-' para a saída padrão (padrão)")
+    parser.add_argument('-j', '--jobs', type=int, default=1, help="projetos simulados em paralelo")
+    parser.add_argument('--sweep', default="DEC 10 1 1Meg", help="varredura AC: DEC|OCT|LIN <pontos> <f inicial> <f final>")
+    parser.add_argument('--tstop', type=parse_quantity, default=None, help="tempo final do transiente (ex.: 10m)")
+    parser.add_argument('--hmax', type=parse_quantity, default=None, help="passo máximo do transiente")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.analysis == 'tran' and not args.tstop:
+        parser.error("--tstop é obrigatório para a análise transiente")
+    if args.output == '-':
+        if len(args.designs) > 1:
+            parser.error("vários projetos exigem um diretório de saída (-o)")
+    else:
+        targets = [output_path(args.output, path, args.analysis, args.format) for path in args.designs]
+        if len(set(targets)) != len(targets):
+            parser.error("projetos com o mesmo nome gerariam o mesmo arquivo de saída")
+        os.makedirs(args.output, exist_ok=True)
+    if args.jobs > 1 and len(args.designs) > 1:
+        with ProcessPoolExecutor(min(args.jobs, len(args.designs))) as ex:
+            outcomes = list(ex.map(_job, args.designs, [args] * len(args.designs)))
+    else:
+        outcomes = [_job(path, args) for path in args.designs]
+    failed = 0
+    for path, target, error in outcomes:
+        if error is not None:
+            failed += 1
+            print(f"{path}: erro: {error}", file=sys.stderr)
+        elif target != '-':
+            print(f"{path} -> {target}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
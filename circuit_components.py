@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Registros compactos de componentes e conexões
+"""
+import math
+import sys
+
+import numpy as np
+
+COMPONENT_DEFAULTS = {
+    'resistor': {'value': '1k', 'unit': 'Ω', 'category': 'Passivos'},
+    'capacitor': {'value': '100n', 'unit': 'F', 'category': 'Passivos'},
+    'indutor': {'value': '10m', 'unit': 'H', 'category': 'Passivos'},
+    'potentiometer': {'value': '10k', 'unit': 'Ω', 'category': 'Passivos'},
+    'voltage_source': {'value': '12', 'unit': 'V', 'category': 'Fontes'},
+    'voltage_ac': {'value': '120', 'unit': 'Vac', 'category': 'Fontes'},
+    'current_source': {'value': '1m', 'unit': 'A', 'category': 'Fontes'},
+    'gnd': {'value': '0', 'unit': 'V', 'category': 'Fontes'},
+    'vcc': {'value': '5', 'unit': 'V', 'category': 'Fontes'},
+    'diode': {'value': '1N4148', 'unit': '', 'category': 'Semicondutores'},
+    'zener': {'value': '5.1', 'unit': 'V', 'category': 'Semicondutores'},
+    'led': {'value': 'RED', 'unit': '', 'category': 'Semicondutores'},
+    'schottky': {'value': '1N5819', 'unit': '', 'category': 'Semicondutores'},
+    'transistor_npn': {'value': '2N2222', 'unit': '', 'category': 'Transistores'},
+    'transistor_pnp': {'value': '2N2907', 'unit': '', 'category': 'Transistores'},
+    'mosfet_n': {'value': 'IRF540', 'unit': '', 'category': 'Transistores'},
+    'mosfet_p': {'value': 'IRF9540', 'unit': '', 'category': 'Transistores'},
+    'opamp': {'value': 'LM741', 'unit': '', 'category': 'Integrados'},
+    'comparator': {'value': 'LM393', 'unit': '', 'category': 'Integrados'},
+    'relay': {'value': '12V', 'unit': '', 'category': 'Integrados'},
+    'timer555': {'value': 'NE555', 'unit': '', 'category': 'Integrados'},
+    'voltmeter': {'value': '', 'unit': 'V', 'category': 'Instrumentos'},
+    'ammeter': {'value': '', 'unit': 'A', 'category': 'Instrumentos'},
+    'oscilloscope': {'value': '', 'unit': '', 'category': 'Instrumentos'},
+    'probe': {'value': '', 'unit': '', 'category': 'Instrumentos'},
+    'switch': {'value': 'SPST', 'unit': '', 'category': 'Outros'},
+    'fuse': {'value': '1', 'unit': 'A', 'category': 'Outros'},
+    'transformer': {'value': '1:1', 'unit': '', 'category': 'Outros'},
+    'crystal': {'value': '16M', 'unit': 'Hz', 'category': 'Outros'},
+}
+GENERIC_DEFAULTS = {'value': '', 'unit': '', 'category': 'Outros'}
+
+TERMINALS = {
+    'resistor': ((-40, 0), (40, 0)), 'capacitor': ((-30, 0), (30, 0)), 'indutor': ((-40, 0), (40, 0)),
+    'potentiometer': ((-40, 0), (40, 0), (0, -30)), 'voltage_source': ((0, -30), (0, 30)),
+    'voltage_ac': ((0, -30), (0, 30)), 'current_source': ((0, -30), (0, 30)), 'gnd': ((0, -20),), 'vcc': ((0, 20),),
+    'diode': ((-30, 0), (30, 0)), 'zener': ((-30, 0), (30, 0)), 'led': ((-30, 0), (30, 0)), 'schottky': ((-30, 0), (30, 0)),
+    'transistor_npn': ((-30, 0), (30, -20), (30, 20)), 'transistor_pnp': ((-30, 0), (30, -20), (30, 20)),
+    'mosfet_n': ((-30, 0), (30, -20), (30, 20)), 'mosfet_p': ((-30, 0), (30, -20), (30, 20)),
+    'opamp': ((-40, -15), (-40, 15), (40, 0)), 'comparator': ((-40, -15), (-40, 15), (40, 0)),
+    'relay': ((-40, -20), (-40, 20), (40, -20), (40, 20)),
+    'timer555': ((-40, -30), (-40, 0), (-40, 30), (40, -30), (40, 0), (40, 30)),
+    'voltmeter': ((-20, 0), (20, 0)), 'ammeter': ((-20, 0), (20, 0)), 'oscilloscope': ((0, 30),), 'probe': ((0, 20),),
+    'switch': ((-30, 0), (30, 0)), 'fuse': ((-30, 0), (30, 0)),
+    'transformer': ((-40, -20), (-40, 20), (40, -20), (40, 20)), 'crystal': ((-25, 0), (25, 0)),
+}
+GENERIC_TERMINALS = ((-30, 0), (30, 0))
+
+
+def defaults(comp_type):
+    return COMPONENT_DEFAULTS.get(comp_type, GENERIC_DEFAULTS)
+
+
+def terminals(comp_type):
+    return TERMINALS.get(comp_type, GENERIC_TERMINALS)
+
+
+def _rotate(offsets, rotation):
+    quarter, rest = divmod(rotation, 90)
+    if rest:
+        rad = math.radians(rotation)
+        c, s = math.cos(rad), math.sin(rad)
+        return tuple((x * c - y * s, x * s + y * c) for x, y in offsets)
+    for _ in range(int(quarter) % 4):
+        offsets = tuple((-y, x) for x, y in offsets)
+    return offsets
+
+
+ROTATED_TERMINALS = {(offs, rot): _rotate(offs, rot) for offs in {*TERMINALS.values(), GENERIC_TERMINALS} for rot in (0, 90, 180, 270)}
+
+
+def rotated_terminals(offsets, rotation=0):
+    key = (offsets, rotation)
+    table = ROTATED_TERMINALS.get(key)
+    if table is None:
+        table = ROTATED_TERMINALS[key] = _rotate(offsets, rotation)
+    return table
+
+
+def terminal_positions(comp):
+    cx, cy = comp['x'], comp['y']
+    return [(cx + dx, cy + dy) for dx, dy in rotated_terminals(comp['terminals'], comp.get('rotation', 0))]
+
+
+def terminal_array(components):
+    offsets = [rotated_terminals(c['terminals'], c.get('rotation', 0)) for c in components]
+    counts = np.fromiter(map(len, offsets), dtype=np.intp, count=len(offsets))
+    owner = np.repeat(np.arange(len(offsets)), counts)
+    flat = np.array([o for offs in offsets for o in offs], dtype=float).reshape(-1, 2)
+    centers = np.array([(c['x'], c['y']) for c in components], dtype=float).reshape(-1, 2)
+    return centers[owner] + flat, owner
+
+
+class Record:
+    __slots__ = ('extra',)
+    FIELDS = frozenset()
+    DERIVED = ()
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        return self._default(key)
+
+    def _default(self, key):
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.__slots__ + self.DERIVED + tuple(k for k in (self.extra or ()) if k not in self.DERIVED)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def items(self):
+        return [(k, self[k]) for k in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def copy(self):
+        clone = object.__new__(type(self))
+        for name in self.FIELDS:
+            setattr(clone, name, getattr(self, name))
+        clone.extra = dict(self.extra) if self.extra else None
+        return clone
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class Component(Record):
+    __slots__ = ('id', 'type', 'name', 'x', 'y', 'rotation', 'value', 'visible')
+    FIELDS = frozenset(__slots__)
+    DERIVED = ('unit', 'category', 'terminals')
+
+    def __init__(self, id, type, name, x, y, rotation=0, value=None, visible=True):
+        self.id = id
+        self.type = sys.intern(type)
+        self.name = name
+        self.x = x
+        self.y = y
+        self.rotation = rotation
+        self.value = defaults(type)['value'] if value is None else value
+        self.visible = visible
+        self.extra = None
+
+    def __setitem__(self, key, value):
+        if key == 'terminals':
+            value = tuple(tuple(t) for t in value)
+        Record.__setitem__(self, key, value)
+
+    def _default(self, key):
+        if key == 'terminals':
+            return terminals(self.type)
+        if key in ('unit', 'category'):
+            return defaults(self.type)[key]
+        raise KeyError(key)
+
+    def to_dict(self):
+        d = dict(self.items())
+        d['terminals'] = [list(t) for t in d['terminals']]
+        return d
+
+    @classmethod
+    def from_dict(cls, data):
+        comp = cls(data['id'], data['type'], data.get('name', ''), data.get('x', 0), data.get('y', 0), data.get('rotation', 0), data.get('value', ''), data.get('visible', True))
+        base = defaults(comp.type)
+        for key, value in data.items():
+            if key in cls.FIELDS:
+                continue
+            if key == 'terminals':
+                if tuple(tuple(t) for t in value) == terminals(comp.type):
+                    continue
+            elif key in base and value == base[key]:
+                continue
+            comp[key] = value
+        return comp
+
+
+class Connection(Record):
+    __slots__ = ('id', 'from_component', 'from_terminal', 'to_component', 'to_terminal')
+    FIELDS = frozenset(__slots__)
+
+    def __init__(self, id, from_component, from_terminal, to_component, to_terminal):
+        self.id = id
+        self.from_component = from_component
+        self.from_terminal = from_terminal
+        self.to_component = to_component
+        self.to_terminal = to_terminal
+        self.extra = None
+
+    @classmethod
+    def from_dict(cls, data, ids=None):
+        ids = ids or {}
+        a, b = data['from_component'], data['to_component']
+        conn = cls(data['id'], ids.get(a, a), data.get('from_terminal', 0), ids.get(b, b), data.get('to_terminal', 0))
+        for key, value in data.items():
+            if key not in cls.FIELDS:
+                conn[key] = value
+        return conn
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Modelos não lineares vetorizados (Shockley, Ebers-Moll, lei quadrática)
+"""
+import numpy as np
+
+VT = 0.025852
+EXP_LIMIT = 80.0
+GMIN_DEVICE = 1e-12
+MOS_VGS_STEP = 1.0
+MOS_VDS_STEP = 2.0
+
+
+def _exp(x):
+    e = np.exp(np.minimum(x, EXP_LIMIT))
+    return np.where(x > EXP_LIMIT, e * (1 + x - EXP_LIMIT), e), e
+
+
+def pnjlim(vnew, vold, vt, vcrit):
+    active = (vnew > vcrit) & (np.abs(vnew - vold) > 2 * vt)
+    arg = 1 + (vnew - vold) / vt
+    up = np.where(arg > 0, vold + vt * np.log(np.maximum(arg, 1e-300)), vcrit)
+    low = vt * np.log(np.maximum(vnew / vt, 1e-300))
+    return np.where(active, np.where(vold > 0, up, low), vnew)
+
+
+def _vcrit(vt, isat):
+    return vt * np.log(vt / (np.sqrt(2) * isat))
+
+
+def eval_diode(d, vc, vc_old):
+    nvt = d.N * VT
+    vd = pnjlim(vc[:, 0], vc_old[:, 0], nvt, _vcrit(nvt, d.IS))
+    zener = np.isfinite(d.BV)
+    if zener.any():
+        vr = np.where(zener, -(vd + np.where(zener, d.BV, 0.0)), 0.0)
+        vr_old = np.where(zener, -(vc_old[:, 0] + np.where(zener, d.BV, 0.0)), 0.0)
+        vr = pnjlim(vr, vr_old, nvt, _vcrit(nvt, np.maximum(d.IBV, 1e-30)))
+        vd = np.where(zener, -vr - np.where(zener, d.BV, 0.0), vd)
+    e, de = _exp(vd / nvt)
+    i = d.IS * (e - 1) + GMIN_DEVICE * vd
+    g = d.IS * de / nvt + GMIN_DEVICE
+    if zener.any():
+        er, der = _exp(np.where(zener, -(vd + np.where(zener, d.BV, 0.0)) / nvt, -np.inf))
+        i = i - d.IBV * er
+        g = g + d.IBV * der / nvt
+    return vd[:, None], np.stack((i, -i), axis=1), np.stack((g, -g), axis=1)[:, :, None]
+
+
+def eval_bjt(q, vc, vc_old):
+    p = q.pol[:, None]
+    vc, vc_old = vc * p, vc_old * p
+    vcrit = _vcrit(VT, q.IS)
+    vbe = pnjlim(vc[:, 0], vc_old[:, 0], VT, vcrit)
+    vbc = pnjlim(vc[:, 1], vc_old[:, 1], VT, vcrit)
+    ef, def_ = _exp(vbe / VT)
+    er, der = _exp(vbc / VT)
+    gf, gr = q.IS * def_ / VT, q.IS * der / VT
+    ic = q.IS * (ef - er) - q.IS / q.BR * (er - 1) - GMIN_DEVICE * vbc
+    ib = q.IS / q.BF * (ef - 1) + q.IS / q.BR * (er - 1) + GMIN_DEVICE * (vbe + vbc)
+    dic = np.stack((gf, -gr - gr / q.BR - GMIN_DEVICE), axis=1)
+    dib = np.stack((gf / q.BF + GMIN_DEVICE, gr / q.BR + GMIN_DEVICE), axis=1)
+    didv = np.stack((dic, dib, -(dic + dib)), axis=1)
+    i = np.stack((ic, ib, -(ic + ib)), axis=1) * p
+    return np.stack((vbe, vbc), axis=1) * p, i, didv
+
+
+def eval_mosfet(m, vc, vc_old):
+    p = m.pol[:, None]
+    vc, vc_old = vc * p, vc_old * p
+    vgs = vc_old[:, 0] + np.clip(vc[:, 0] - vc_old[:, 0], -MOS_VGS_STEP, MOS_VGS_STEP)
+    vds = vc_old[:, 1] + np.clip(vc[:, 1] - vc_old[:, 1], -MOS_VDS_STEP, MOS_VDS_STEP)
+    rev = vds < 0
+    vg = np.where(rev, vgs - vds, vgs)
+    vd = np.abs(vds)
+    vov = vg - m.VTO * m.pol
+    on = vov > 0
+    sat = vd >= vov
+    clm = 1 + m.LAMBDA * vd
+    ids = np.where(sat, 0.5 * m.KP * vov ** 2, m.KP * (vov * vd - 0.5 * vd ** 2)) * clm
+    gm = np.where(sat, m.KP * vov, m.KP * vd) * clm
+    gds = np.where(sat, 0.5 * m.KP * vov ** 2 * m.LAMBDA, m.KP * (vov - vd) * clm + m.KP * (vov * vd - 0.5 * vd ** 2) * m.LAMBDA)
+    ids, gm, gds = np.where(on, ids, 0.0), np.where(on, gm, 0.0), np.where(on, gds, 0.0)
+    idr = np.where(rev, -ids, ids) + GMIN_DEVICE * vds
+    dvgs = np.where(rev, -gm, gm)
+    dvds = np.where(rev, gm + gds, gds) + GMIN_DEVICE
+    did = np.stack((dvgs, dvds), axis=1)
+    didv = np.stack((did, np.zeros_like(did), -did), axis=1)
+    i = np.stack((idr, np.zeros_like(idr), -idr), axis=1) * p
+    return np.stack((vgs, vds), axis=1) * p, i, didv
+
+
+class DeviceType:
+    def __init__(self, attr, terminals, incidence, evaluate):
+        self.attr = attr
+        self.terminals = terminals
+        self.incidence = np.asarray(incidence, dtype=float)
+        self.evaluate = evaluate
+
+    def nodes(self, group):
+        return np.stack([getattr(group, f) for f in self.terminals], axis=1)
+
+    def controls(self, group, v):
+        return v[self.nodes(group)] @ self.incidence.T
+
+    def currents(self, group, v):
+        vc = self.controls(group, v)
+        return vc, self.evaluate(group, vc, vc)[1]
+
+
+DEVICE_TYPES = (
+    DeviceType('diodes', ('a', 'b'), [[1, -1]], eval_diode),
+    DeviceType('bjts', ('c', 'b', 'e'), [[0, 1, -1], [-1, 1, 0]], eval_bjt),
+    DeviceType('mosfets', ('d', 'g', 's'), [[0, 1, -1], [1, 0, -1]], eval_mosfet),
+)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Histórico de desfazer/refazer baseado em comandos
+"""
+from collections import deque
+
+RECORD_BYTES = 400
+WIRE_BYTES = 250
+FIELD_BYTES = 80
+
+
+class Command:
+    merge_key = None
+
+    def do(self, canvas):
+        raise NotImplementedError
+
+    def undo(self, canvas):
+        raise NotImplementedError
+
+    def size(self):
+        return FIELD_BYTES
+
+    def mergeable(self, other):
+        return False
+
+    def merge(self, other):
+        if not self.mergeable(other):
+            return False
+        self.absorb(other)
+        return True
+
+
+class AddComponents(Command):
+    def __init__(self, comps, wires=()):
+        self.comps = list(comps)
+        self.wires = list(wires)
+
+    def do(self, canvas):
+        canvas.insert_components(self.comps)
+        canvas.insert_wires(self.wires)
+
+    def undo(self, canvas):
+        canvas.remove_wires(self.wires)
+        canvas.remove_components(self.comps)
+
+    def size(self):
+        return RECORD_BYTES * len(self.comps) + WIRE_BYTES * len(self.wires)
+
+
+class DeleteComponents(AddComponents):
+    def do(self, canvas):
+        index = {comp: i for i, comp in enumerate(canvas.components)}
+        self.indices = [index[comp] for comp in self.comps]
+        AddComponents.undo(self, canvas)
+
+    def undo(self, canvas):
+        canvas.insert_components(self.comps, self.indices)
+        canvas.insert_wires(self.wires)
+
+
+class AddWire(Command):
+    def __init__(self, conn):
+        self.conn = conn
+
+    def do(self, canvas):
+        canvas.insert_wires([self.conn])
+
+    def undo(self, canvas):
+        canvas.remove_wires([self.conn])
+
+    def size(self):
+        return WIRE_BYTES
+
+
+class SetFields(Command):
+    def __init__(self, comp, fields, merge_key=None, defaults=None):
+        # defaults: valor "antes" de campos que o componente ainda não tem (ex.: 'closed', 'wiper')
+        self.comp = comp
+        self.before = {k: comp.get(k, defaults[k]) if defaults else comp[k] for k in fields}
+        self.after = dict(fields)
+        self.merge_key = merge_key
+
+    def do(self, canvas):
+        canvas.set_fields(self.comp, self.after)
+
+    def undo(self, canvas):
+        canvas.set_fields(self.comp, self.before)
+
+    def size(self):
+        return FIELD_BYTES * (1 + len(self.after))
+
+    def mergeable(self, other):
+        return self.merge_key is not None and other.merge_key == self.merge_key and other.comp is self.comp
+
+    def absorb(self, other):
+        for key, value in other.before.items():
+            self.before.setdefault(key, value)
+        self.after.update(other.after)
+
+
+class Batch(Command):
+    def __init__(self, commands, merge_key=None):
+        self.commands = list(commands)
+        self.merge_key = merge_key
+
+    def do(self, canvas):
+        for cmd in self.commands:
+            cmd.do(canvas)
+
+    def undo(self, canvas):
+        for cmd in reversed(self.commands):
+            cmd.undo(canvas)
+
+    def size(self):
+        return sum(cmd.size() for cmd in self.commands)
+
+    def mergeable(self, other):
+        return (self.merge_key is not None and other.merge_key == self.merge_key and len(other.commands) == len(self.commands)
+                and all(a.mergeable(b) for a, b in zip(self.commands, other.commands)))
+
+    def absorb(self, other):
+        for a, b in zip(self.commands, other.commands):
+            a.absorb(b)
+
+
+class ClearCircuit(Command):
+    def do(self, canvas):
+        self.state = (canvas.components, canvas.connections, canvas.component_counter)
+        canvas.replace_circuit([], [], {})
+
+    def undo(self, canvas):
+        canvas.replace_circuit(*self.state)
+
+    def size(self):
+        components, connections, _ = self.state
+        return RECORD_BYTES * len(components) + WIRE_BYTES * len(connections)
+
+
+class History:
+    def __init__(self, budget):
+        self.budget = budget
+        self.undo_stack = deque()
+        self.redo_stack = []
+        self.used = 0
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.used = 0
+
+    def push(self, canvas, cmd):
+        cmd.do(canvas)
+        for old in self.redo_stack:
+            self.used -= old.size()
+        self.redo_stack.clear()
+        top = self.undo_stack[-1] if self.undo_stack else None
+        if top is not None:
+            before = top.size()
+            if top.merge(cmd):
+                self.used += top.size() - before
+                self.trim()
+                return
+        self.undo_stack.append(cmd)
+        self.used += cmd.size()
+        self.trim()
+
+    def trim(self):
+        while self.used > self.budget and self.undo_stack:
+            self.used -= self.undo_stack.popleft().size()
+
+    def undo(self, canvas):
+        if not self.undo_stack:
+            return False
+        cmd = self.undo_stack.pop()
+        cmd.undo(canvas)
+        self.redo_stack.append(cmd)
+        return True
+
+    def redo(self, canvas):
+        if not self.redo_stack:
+            return False
+        cmd = self.redo_stack.pop()
+        cmd.do(canvas)
+        self.undo_stack.append(cmd)
+        return True
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Modelos Qt incrementais para as abas de hierarquia e visibilidade
+"""
+import bisect
+import itertools
+
+from PyQt6.QtCore import QAbstractItemModel, QAbstractTableModel, QModelIndex, Qt
+
+TEXT_KEYS = frozenset(('name', 'type', 'value'))
+
+
+def _canvas_order(canvas, comps):
+    # None quando os componentes entraram no fim do canvas; senão a posição de cada um no canvas
+    tail = canvas.components[len(canvas.components) - len(comps):]
+    if len(tail) == len(comps) and all(a is b for a, b in zip(tail, comps)):
+        return None
+    return dict(zip(canvas.components, itertools.count()))
+
+
+class _Rows:
+    def __init__(self, items=()):
+        self.items = []
+        self.row_of = {}
+        self.extend(items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def extend(self, items):
+        for item in items:
+            self.row_of[item['id']] = len(self.items)
+            self.items.append(item)
+
+    def insert(self, items, order, begin, end):
+        # order: posição de cada componente no canvas; linhas que já saíram dele herdam a da anterior
+        keys = list(map(order.get, self.items))
+        if None in keys:
+            last = -1
+            for i, key in enumerate(keys):
+                last = keys[i] = last if key is None else key
+        first = len(self.items)
+        for item in sorted(items, key=order.__getitem__):
+            pos = order[item]
+            row = bisect.bisect_left(keys, pos)
+            first = min(first, row)
+            begin(row, row)
+            self.items.insert(row, item)
+            keys.insert(row, pos)
+            end()
+        for row in range(first, len(self.items)):
+            self.row_of[self.items[row]['id']] = row
+
+    def remove(self, items, begin, end):
+        rows = sorted((self.row_of.pop(item['id']) for item in items if item['id'] in self.row_of), reverse=True)
+        if not rows:
+            return None
+        i = 0
+        while i < len(rows):
+            first = last = rows[i]
+            i += 1
+            while i < len(rows) and rows[i] == first - 1:
+                first = rows[i]
+                i += 1
+            begin(first, last)
+            del self.items[first:last + 1]
+            end()
+        for row in range(rows[-1], len(self.items)):
+            self.row_of[self.items[row]['id']] = row
+        return rows[-1]
+
+
+class _Group(_Rows):
+    def __init__(self, name, items=()):
+        super().__init__(items)
+        self.name = name
+
+
+class ComponentTableModel(QAbstractTableModel):
+    HEADERS = ("Visível", "Componente", "Tipo", "Valor")
+    KEYS = ('visible', 'name', 'type', 'value')
+
+    def __init__(self, canvas):
+        super().__init__()
+        self.canvas = canvas
+        self.rows = _Rows(canvas.components)
+        canvas.components_added.connect(self.on_components_added)
+        canvas.components_removed.connect(self.on_components_removed)
+        canvas.components_changed.connect(self.on_components_changed)
+        canvas.circuit_reset.connect(self.reset)
+
+    def reset(self):
+        self.beginResetModel()
+        self.rows = _Rows(self.canvas.components)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        comp = self.rows.items[index.row()]
+        if index.column() == 0:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if comp.get('visible', True) else Qt.CheckState.Unchecked
+        elif role == Qt.ItemDataRole.DisplayRole:
+            return str(comp.get(self.KEYS[index.column()], ''))
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.column() == 0:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if index.column() != 0 or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        self.canvas.set_visible([self.rows.items[index.row()]], Qt.CheckState(value) == Qt.CheckState.Checked)
+        return True
+
+    def component_at(self, row):
+        return self.rows.items[row]
+
+    def on_components_added(self, comps):
+        order = _canvas_order(self.canvas, comps)
+        if order is not None:
+            comps = [c for c in comps if c in order]
+            if comps:
+                self.rows.insert(comps, order, lambda first, last: self.beginInsertRows(QModelIndex(), first, last), self.endInsertRows)
+            return
+        n = len(self.rows)
+        self.beginInsertRows(QModelIndex(), n, n + len(comps) - 1)
+        self.rows.extend(comps)
+        self.endInsertRows()
+
+    def on_components_removed(self, comps):
+        self.rows.remove(comps, lambda first, last: self.beginRemoveRows(QModelIndex(), first, last), self.endRemoveRows)
+
+    def on_components_changed(self, comps, keys):
+        if 'visible' not in keys and TEXT_KEYS.isdisjoint(keys):
+            return
+        rows = [self.rows.row_of[c['id']] for c in comps if c['id'] in self.rows.row_of]
+        if rows:
+            self.dataChanged.emit(self.index(min(rows), 0), self.index(max(rows), len(self.HEADERS) - 1))
+
+
+class HierarchyModel(QAbstractItemModel):
+    """Árvore Design1 → categorias → componentes, mais o grupo de conexões.
+
+    O ponteiro interno de cada índice é o nó pai: None para a raiz, ``self.top``
+    para os grupos e o próprio grupo para componentes e fios.
+    """
+    HEADERS = ("Componente", "Tipo", "Valor")
+
+    def __init__(self, canvas):
+        super().__init__()
+        self.canvas = canvas
+        self.top = _Group("Design1")
+        self.wire_numbers = {}
+        self.build()
+        canvas.components_added.connect(self.on_components_added)
+        canvas.components_removed.connect(self.on_components_removed)
+        canvas.components_changed.connect(self.on_components_changed)
+        canvas.wires_added.connect(self.on_wires_added)
+        canvas.wires_removed.connect(self.on_wires_removed)
+        canvas.circuit_reset.connect(self.reset)
+
+    def build(self):
+        self.groups = []
+        self.group_of = {}
+        for comp in self.canvas.components:
+            self.category_group(comp).extend((comp,))
+        self.wire_numbers = {}
+        self.number_wires(self.canvas.connections)
+        self.wires = _Group("Conexões", self.canvas.connections)
+
+    def number_wires(self, conns):
+        for conn in conns:
+            self.wire_numbers.setdefault(conn['id'], len(self.wire_numbers) + 1)
+
+    def reset(self):
+        self.beginResetModel()
+        self.build()
+        self.endResetModel()
+
+    def category_group(self, comp):
+        cat = comp.get('category', 'Outros')
+        group = self.group_of.get(cat)
+        if group is None:
+            group = self.group_of[cat] = _Group(cat)
+            self.groups.append(group)
+        return group
+
+    def child_group(self, row):
+        return self.groups[row] if row < len(self.groups) else self.wires
+
+    def group_row(self, group):
+        return len(self.groups) if group is self.wires else self.groups.index(group)
+
+    def root_index(self):
+        return self.createIndex(0, 0, None)
+
+    def group_index(self, group, column=0):
+        return self.createIndex(self.group_row(group), column, self.top)
+
+    def index(self, row, column, parent=QModelIndex()):
+        if row < 0 or not 0 <= column < len(self.HEADERS):
+            return QModelIndex()
+        if not parent.isValid():
+            node = None
+        elif parent.column() > 0:
+            return QModelIndex()
+        elif parent.internalPointer() is None:
+            node = self.top
+        elif parent.internalPointer() is self.top:
+            node = self.child_group(parent.row())
+        else:
+            return QModelIndex()
+        return self.createIndex(row, column, node) if row < self.child_count(node) else QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer()
+        if node is None:
+            return QModelIndex()
+        if node is self.top:
+            return self.root_index()
+        return self.group_index(node)
+
+    def child_count(self, node):
+        if node is None:
+            return 1
+        if node is self.top:
+            return len(self.groups) + (1 if self.wires.items else 0)
+        return len(node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return 1
+        node = parent.internalPointer()
+        if parent.column() > 0 or (node is not None and node is not self.top):
+            return 0
+        return self.child_count(self.top if node is None else self.child_group(parent.row()))
+
+    def hasChildren(self, parent=QModelIndex()):
+        return not parent.isValid() or parent.internalPointer() is None or (parent.internalPointer() is self.top and parent.column() == 0)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        node, row = index.internalPointer(), index.row()
+        if node is None:
+            cells = (self.top.name, "", "")
+        elif node is self.top:
+            group = self.child_group(row)
+            cells = (group.name, "", f"{len(group)}" if group is self.wires else "")
+        elif node is self.wires:
+            cells = (f"Wire_{self.wire_numbers[node.items[row]['id']]}", "Fio", "")
+        else:
+            comp = node.items[row]
+            cells = (comp.get('name', 'Unknown'), comp.get('type', ''), comp.get('value', ''))
+        return str(cells[index.column()])
+
+    def component_id(self, index):
+        node = index.internalPointer() if index.isValid() else None
+        if node is None or node is self.top or node is self.wires:
+            return None
+        return node.items[index.row()]['id']
+
+    def remove_group(self, group):
+        row = self.group_row(group)
+        self.beginRemoveRows(self.root_index(), row, row)
+        if group is self.wires:
+            self.wires = _Group(group.name)
+        else:
+            del self.groups[row]
+            del self.group_of[group.name]
+        self.endRemoveRows()
+
+    def append_rows(self, group, items):
+        parent = self.group_index(group)
+        n = len(group)
+        self.beginInsertRows(parent, n, n + len(items) - 1)
+        group.extend(items)
+        self.endInsertRows()
+
+    def insert_rows(self, group, items, order):
+        parent = self.group_index(group)
+        group.insert(items, order, lambda first, last: self.beginInsertRows(parent, first, last), self.endInsertRows)
+
+    def remove_rows(self, group, items):
+        parent = self.group_index(group)
+        return group.remove(items, lambda first, last: self.beginRemoveRows(parent, first, last), self.endRemoveRows)
+
+    def by_category(self, comps):
+        split = {}
+        for comp in comps:
+            split.setdefault(comp.get('category', 'Outros'), []).append(comp)
+        return split
+
+    def on_components_added(self, comps):
+        order = _canvas_order(self.canvas, comps)
+        if order is not None:
+            comps = [c for c in comps if c in order]
+        for cat, items in self.by_category(comps).items():
+            group = self.group_of.get(cat)
+            if group is None:
+                self.beginInsertRows(self.root_index(), len(self.groups), len(self.groups))
+                group = self.category_group(items[0])
+                self.endInsertRows()
+            if order is None:
+                self.append_rows(group, items)
+            else:
+                self.insert_rows(group, items, order)
+
+    def on_components_removed(self, comps):
+        for cat, items in self.by_category(comps).items():
+            group = self.group_of.get(cat)
+            if group is None:
+                continue
+            self.remove_rows(group, items)
+            if not group.items:
+                self.remove_group(group)
+
+    def on_components_changed(self, comps, keys):
+        if TEXT_KEYS.isdisjoint(keys):
+            return
+        for comp in comps:
+            group = self.group_of.get(comp.get('category', 'Outros'))
+            row = group.row_of.get(comp['id']) if group is not None else None
+            if row is not None:
+                self.dataChanged.emit(self.createIndex(row, 0, group), self.createIndex(row, len(self.HEADERS) - 1, group))
+
+    def on_wires_added(self, conns):
+        self.number_wires(conns)
+        if not self.wires.items:
+            row = len(self.groups)
+            self.beginInsertRows(self.root_index(), row, row)
+            self.wires.extend(conns)
+            self.endInsertRows()
+        else:
+            self.append_rows(self.wires, conns)
+            self.dataChanged.emit(self.group_index(self.wires, 2), self.group_index(self.wires, 2))
+
+    def on_wires_removed(self, conns):
+        if not self.wires.items:
+            return
+        if sum(c['id'] in self.wires.row_of for c in conns) == len(self.wires):
+            self.remove_group(self.wires)
+            return
+        if self.remove_rows(self.wires, conns) is not None:
+            self.dataChanged.emit(self.group_index(self.wires, 2), self.group_index(self.wires, 2))
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Diário de edições para autosave incremental e recuperação
+"""
+import json
+import os
+import queue
+import threading
+import time
+
+from circuit_components import Component, Connection
+from circuit_project import load_project, save_project
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class DesignState:
+    def __init__(self, components=(), connections=(), counter=None):
+        self.components = {c['id']: c for c in components}
+        self.connections = {c['id']: c for c in connections}
+        self.counter = dict(counter or {})
+
+    def apply(self, op, *args):
+        getattr(self, f"_{op}")(*args)
+
+    def _add(self, comp, counter):
+        comp = Component.from_dict(comp)
+        self.components.pop(comp.id, None)
+        self.components[comp.id] = comp
+        self.counter = dict(counter)
+
+    def _remove(self, comp_id):
+        self.components.pop(comp_id, None)
+
+    def _add_wire(self, conn):
+        conn = Connection.from_dict(conn)
+        self.connections.pop(conn.id, None)
+        self.connections[conn.id] = conn
+
+    def _remove_wire(self, conn_id):
+        self.connections.pop(conn_id, None)
+
+    def _set(self, comp_id, fields):
+        comp = self.components.get(comp_id)
+        if comp is not None:
+            for key, value in fields.items():
+                comp[key] = value
+
+    def result(self):
+        return list(self.components.values()), list(self.connections.values()), dict(self.counter)
+
+
+def replay(snapshot_path, journal_path):
+    state = DesignState(*load_project(snapshot_path)) if os.path.exists(snapshot_path) else DesignState()
+    if os.path.exists(journal_path):
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    op = json.loads(line)
+                except ValueError:
+                    break
+                state.apply(*op)
+    return state.result()
+
+
+def _lock(path):
+    # lock exclusivo não bloqueante; liberado pelo sistema quando o processo termina
+    f = open(path, 'a+')
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+
+def _remove(*paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class Journal:
+    FLUSH_INTERVAL = 1.0
+    COMPACT_EVERY = 10000
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        # cada instância grava nos próprios arquivos, travados enquanto ela estiver aberta
+        self.base = os.path.join(directory, f"autosave-{os.getpid()}-{time.time_ns()}")
+        self.snapshot_path = self.base + '.dsc'
+        self.journal_path = self.base + '.journal'
+        self.lock = _lock(self.base + '.lock')
+        self.orphan = self._claim_orphan()
+        self.queue = queue.Queue()
+        self.thread = None
+
+    def _claim_orphan(self):
+        # órfã: sessão cujo lock está livre (a instância terminou sem fechar); fica com a mais recente
+        sessions = {}
+        for name in os.listdir(self.directory):
+            stem, ext = os.path.splitext(name)
+            if stem.startswith('autosave') and ext in ('.dsc', '.journal'):
+                try:
+                    mtime = os.path.getmtime(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                sessions[stem] = max(sessions.get(stem, mtime), mtime)
+        for stem in sorted(sessions, key=sessions.get, reverse=True):
+            base = os.path.join(self.directory, stem)
+            lock = _lock(base + '.lock')
+            if lock is not None:
+                return base, lock
+        return None
+
+    def _release_orphan(self):
+        if self.orphan is not None:
+            base, lock = self.orphan
+            self.orphan = None
+            lock.close()
+            _remove(base + '.dsc', base + '.journal', base + '.lock')
+
+    def exists(self):
+        return self.orphan is not None
+
+    def recover(self):
+        base, _ = self.orphan
+        return replay(base + '.dsc', base + '.journal')
+
+    def start(self, components, connections, counter):
+        # recuperada ou recusada, a sessão órfã não é oferecida de novo
+        self._release_orphan()
+        self.queue.put(('start', [c.copy() for c in components], [c.copy() for c in connections], dict(counter)))
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name='autosave', daemon=True)
+            self.thread.start()
+
+    def record(self, op, *args):
+        if self.thread is not None:
+            self.queue.put((op,) + args)
+
+    def close(self, discard=True):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        self._release_orphan()
+        if self.lock is not None:
+            self.lock.close()
+            self.lock = None
+        if discard:
+            _remove(self.snapshot_path, self.journal_path, self.base + '.lock')
+
+    def _compact(self, state, f):
+        tmp = self.snapshot_path + '.tmp'
+        save_project(tmp, *state.result())
+        os.replace(tmp, self.snapshot_path)
+        if f is not None:
+            f.close()
+        return open(self.journal_path, 'w', encoding='utf-8')
+
+    def _run(self):
+        state, f, ops, dirty, last_sync = None, None, 0, False, time.monotonic()
+        while True:
+            try:
+                item = self.queue.get(timeout=self.FLUSH_INTERVAL)
+            except queue.Empty:
+                item = ()
+            if item is None:
+                break
+            if item and item[0] == 'start':
+                state = DesignState(*item[1:])
+                f, ops = self._compact(state, f), 0
+            elif item and state is not None:
+                state.apply(*item)
+                f.write(json.dumps(item, ensure_ascii=False) + '\n')
+                ops += 1
+                dirty = True
+            if f is None or not dirty or not self.queue.empty() and time.monotonic() - last_sync < self.FLUSH_INTERVAL:
+                continue
+            f.flush()
+            os.fsync(f.fileno())
+            dirty, last_sync = False, time.monotonic()
+            if ops >= self.COMPACT_EVERY:
+                f, ops = self._compact(state, f), 0
+        if f is not None:
+            f.close()
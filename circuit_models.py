@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Parâmetros de modelos de dispositivos semicondutores
+"""
+
+DIODE_MODELS = {
+    '1N4148': {'IS': 2.52e-9, 'N': 1.752, 'RS': 0.568},
+    '1N4007': {'IS': 7.02e-9, 'N': 1.8, 'RS': 0.0341},
+    '1N5819': {'IS': 3e-5, 'N': 1.0, 'RS': 0.051},
+}
+LED_MODELS = {
+    'RED': {'IS': 1e-19, 'N': 1.7, 'RS': 2.0},
+    'ORANGE': {'IS': 1e-20, 'N': 1.8, 'RS': 2.0},
+    'YELLOW': {'IS': 1e-21, 'N': 1.8, 'RS': 2.0},
+    'GREEN': {'IS': 1e-22, 'N': 1.9, 'RS': 2.0},
+    'BLUE': {'IS': 1e-26, 'N': 2.0, 'RS': 2.0},
+    'WHITE': {'IS': 1e-26, 'N': 2.0, 'RS': 2.0},
+}
+BJT_MODELS = {
+    '2N2222': {'IS': 1.4e-14, 'BF': 200.0, 'BR': 3.0, 'VAF': 74.0},
+    '2N3904': {'IS': 6.7e-15, 'BF': 416.0, 'BR': 0.7, 'VAF': 74.0},
+    '2N2907': {'IS': 6.5e-13, 'BF': 230.0, 'BR': 3.0, 'VAF': 115.0},
+    '2N3906': {'IS': 1.4e-15, 'BF': 180.0, 'BR': 4.0, 'VAF': 18.7},
+}
+MOSFET_MODELS = {
+    'IRF540': {'VTO': 3.5, 'KP': 20.0, 'LAMBDA': 0.01},
+    'IRF9540': {'VTO': -3.5, 'KP': 8.0, 'LAMBDA': 0.01},
+    '2N7000': {'VTO': 2.0, 'KP': 0.3, 'LAMBDA': 0.02},
+}
+DEFAULT_DIODE = {'IS': 1e-14, 'N': 1.0, 'RS': 0.0}
+DEFAULT_BJT = {'IS': 1e-14, 'BF': 100.0, 'BR': 1.0, 'VAF': 100.0}
+DEFAULT_MOSFET = {'VTO': 2.0, 'KP': 1.0, 'LAMBDA': 0.0}
+
+
+def device_model(comp_type, value, parse_value=float):
+    key = str(value).strip().upper()
+    if comp_type in ('diode', 'schottky'):
+        return key or 'DDEFAULT', 'D', dict(DIODE_MODELS.get(key, DEFAULT_DIODE))
+    if comp_type == 'led':
+        return f"LED_{key or 'RED'}", 'D', dict(LED_MODELS.get(key, LED_MODELS['RED']))
+    if comp_type == 'zener':
+        bv = parse_value(value) or 5.1
+        return f"DZ{bv:g}".replace('.', 'V'), 'D', dict(DEFAULT_DIODE, BV=bv, IBV=1e-3)
+    if comp_type in ('transistor_npn', 'transistor_pnp'):
+        kind = 'NPN' if comp_type == 'transistor_npn' else 'PNP'
+        return key or kind, kind, dict(BJT_MODELS.get(key, DEFAULT_BJT))
+    if comp_type in ('mosfet_n', 'mosfet_p'):
+        kind = 'NMOS' if comp_type == 'mosfet_n' else 'PMOS'
+        params = dict(MOSFET_MODELS.get(key, DEFAULT_MOSFET))
+        if key not in MOSFET_MODELS and kind == 'PMOS':
+            params['VTO'] = -params['VTO']
+        return key or kind, kind, params
+    return None
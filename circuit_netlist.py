@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Gerador de netlist SPICE em fluxo (streaming)
+"""
+import math
+import os
+
+from circuit_models import device_model
+from circuit_solver import R_ON, RELAY_COIL, OPAMP_GAIN, transformer_ratio
+
+TITLE = "Dan_simulation_circuit - SPICE Netlist"
+
+
+def _fmt(x):
+    return f"{x:g}"
+
+
+def _ref(letter, name):
+    return name if name.upper().startswith(letter) else letter + name
+
+
+def _component_lines(comp, nodes, parse_value, models, prints):
+    t, name, value = comp['type'], comp['name'], comp.get('value', '')
+    if t in ('resistor', 'capacitor', 'indutor'):
+        letter = {'resistor': 'R', 'capacitor': 'C', 'indutor': 'L'}[t]
+        return [f"{_ref(letter, name)} {nodes[0]} {nodes[1]} {_fmt(parse_value(value) or R_ON)}"]
+    if t == 'potentiometer':
+        r = parse_value(value) or R_ON
+        wiper = min(max(float(comp.get('wiper', 0.5)), 0.0), 1.0)
+        return [f"{_ref('R', name)}_A {nodes[0]} {nodes[2]} {_fmt(max(r * wiper, R_ON))}", f"{_ref('R', name)}_B {nodes[2]} {nodes[1]} {_fmt(max(r * (1 - wiper), R_ON))}"]
+    if t == 'voltage_source':
+        return [f"{_ref('V', name)} {nodes[0]} {nodes[1]} DC {_fmt(parse_value(value))}"]
+    if t == 'voltage_ac':
+        return [f"{_ref('V', name)} {nodes[0]} {nodes[1]} DC 0 AC {_fmt(parse_value(value))}"]
+    if t == 'vcc':
+        return [f"{_ref('V', name)} {nodes[0]} 0 DC {_fmt(parse_value(value))}"]
+    if t == 'current_source':
+        return [f"{_ref('I', name)} {nodes[1]} {nodes[0]} DC {_fmt(parse_value(value))}"]
+    if t == 'ammeter':
+        return [f"{_ref('V', name)} {nodes[0]} {nodes[1]} DC 0"]
+    if t == 'voltmeter':
+        prints.append(f".PRINT DC V({nodes[0]},{nodes[1]})")
+        return [f"* {name}: V({nodes[0]},{nodes[1]})"]
+    if t in ('probe', 'oscilloscope'):
+        prints.append(f".PRINT {'TRAN' if t == 'oscilloscope' else 'DC'} V({nodes[0]})")
+        return [f"* {name}: V({nodes[0]})"]
+    if t in ('switch', 'fuse'):
+        return [f"{_ref('R', name)} {nodes[0]} {nodes[1]} {_fmt(R_ON)}"] if comp.get('closed', True) else [f"* {name}: aberto"]
+    if t == 'relay':
+        lines = [f"{_ref('R', name)}_COIL {nodes[0]} {nodes[1]} {_fmt(RELAY_COIL)}"]
+        if comp.get('closed', False):
+            lines.append(f"{_ref('R', name)}_NO {nodes[2]} {nodes[3]} {_fmt(R_ON)}")
+        return lines
+    if t == 'transformer':
+        # mesmo modelo ideal do simulador: E no secundário, V de 0 V medindo Is e F refletindo k·Is no primário
+        ratio, mid, sense = _fmt(transformer_ratio(value)), f"{name}_m", f"{_ref('V', name)}_S"
+        return [f"{_ref('E', name)} {nodes[2]} {mid} {nodes[0]} {nodes[1]} {ratio}", f"{sense} {mid} {nodes[3]} DC 0", f"{_ref('F', name)} {nodes[1]} {nodes[0]} {sense} {ratio}"]
+    if t == 'crystal':
+        f0, cm = parse_value(value) or 1e6, 10e-15
+        lm, mid1, mid2 = 1.0 / ((2 * math.pi * f0) ** 2 * cm), f"{name}_1", f"{name}_2"
+        return [f"{_ref('L', name)} {nodes[0]} {mid1} {_fmt(lm)}", f"{_ref('C', name)} {mid1} {mid2} {_fmt(cm)}", f"{_ref('R', name)} {mid2} {nodes[1]} 10", f"{_ref('C', name)}_0 {nodes[0]} {nodes[1]} 5p"]
+    if t in ('opamp', 'comparator'):
+        return [f"{_ref('E', name)} {nodes[2]} 0 {nodes[0]} {nodes[1]} {_fmt(OPAMP_GAIN)}"]
+    if t == 'timer555':
+        return [f"{_ref('X', name)} {' '.join(nodes)} {value or 'NE555'}"]
+    model = device_model(t, value, parse_value)
+    if model:
+        model_name, kind, params = model
+        models[model_name] = (kind, params)
+        letter = {'D': 'D', 'NPN': 'Q', 'PNP': 'Q', 'NMOS': 'M', 'PMOS': 'M'}[kind]
+        if letter == 'D':
+            return [f"{_ref('D', name)} {nodes[0]} {nodes[1]} {model_name}"]
+        if letter == 'Q':
+            return [f"{_ref('Q', name)} {nodes[1]} {nodes[0]} {nodes[2]} {model_name}"]
+        return [f"{_ref('M', name)} {nodes[1]} {nodes[0]} {nodes[2]} {nodes[2]} {model_name}"]
+    return []
+
+
+def iter_netlist(components, nets, parse_value, title=TITLE):
+    models, prints = {}, []
+    yield f"* {title}"
+    yield ""
+    for comp in components:
+        nodes = [nets.name(n) for n in nets.component_nets(comp)]
+        yield from _component_lines(comp, nodes, parse_value, models, prints)
+    if models:
+        yield ""
+    for name, (kind, params) in models.items():
+        yield f".MODEL {name} {kind}({' '.join(f'{k}={_fmt(v)}' for k, v in params.items())})"
+    if prints:
+        yield ""
+    yield from prints
+    yield ""
+    yield ".END"
+
+
+def write_netlist(f, components, nets, parse_value, title=TITLE, chunk=4096, progress=None):
+    buf, written = [], 0
+    for line in iter_netlist(components, nets, parse_value, title):
+        buf.append(line)
+        if len(buf) >= chunk:
+            f.write("\n".join(buf) + "\n")
+            written += len(buf)
+            buf.clear()
+            if progress:
+                progress(min(written / max(len(components), 1), 1.0))
+    if buf:
+        f.write("\n".join(buf) + "\n")
+
+
+def export_netlist(path, components, nets, parse_value, progress=None):
+    # grava num temporário para que uma falha ou interrupção não deixe um .cir pela metade
+    tmp = path + '.tmp'
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            write_netlist(f, components, nets, parse_value, progress=progress)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return path
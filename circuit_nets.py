@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Extração incremental de nós elétricos (nets)
+"""
+
+
+class NetIndex:
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.net_of = {}
+        self.members = {}
+        self.wires = {}
+        self.ground_count = {}
+        self.grounds = set()
+        self.next_id = 1
+
+    def snapshot(self):
+        # cópia só para consulta (net de cada terminal e nomes), sem as estruturas de edição
+        other = NetIndex()
+        other.net_of = dict(self.net_of)
+        other.ground_count = dict(self.ground_count)
+        return other
+
+    def rebuild(self, components, connections):
+        self.clear()
+        for comp in components:
+            self.add_component(comp)
+        for conn in connections:
+            self.add_connection(conn)
+
+    def _new_net(self, terminals, grounds=0):
+        net = self.next_id
+        self.next_id += 1
+        self.members[net] = set(terminals)
+        self.ground_count[net] = grounds
+        for t in terminals:
+            self.net_of[t] = net
+        return net
+
+    def add_component(self, comp):
+        for i in range(len(comp.get('terminals', ()))):
+            key = (comp['id'], i)
+            if key not in self.net_of:
+                self.wires[key] = {}
+                if comp['type'] == 'gnd':
+                    self.grounds.add(key)
+                self._new_net((key,), 1 if key in self.grounds else 0)
+
+    def remove_component(self, comp):
+        for i in range(len(comp.get('terminals', ()))):
+            key = (comp['id'], i)
+            if key not in self.net_of:
+                continue
+            for conn_id, other in list(self.wires[key].items()):
+                self._unlink(conn_id, key, other)
+            net = self.net_of.pop(key)
+            self.grounds.discard(key)
+            del self.wires[key]
+            del self.members[net]
+            del self.ground_count[net]
+
+    def add_connection(self, conn):
+        a = (conn['from_component'], conn.get('from_terminal', 0))
+        b = (conn['to_component'], conn.get('to_terminal', 0))
+        if a not in self.net_of or b not in self.net_of:
+            return
+        self.wires[a][conn['id']] = b
+        self.wires[b][conn['id']] = a
+        na, nb = self.net_of[a], self.net_of[b]
+        if na == nb:
+            return
+        if len(self.members[na]) < len(self.members[nb]):
+            na, nb = nb, na
+        for t in self.members[nb]:
+            self.net_of[t] = na
+        self.members[na] |= self.members.pop(nb)
+        self.ground_count[na] += self.ground_count.pop(nb)
+
+    def remove_connection(self, conn):
+        a = (conn['from_component'], conn.get('from_terminal', 0))
+        b = (conn['to_component'], conn.get('to_terminal', 0))
+        if conn['id'] in self.wires.get(a, {}):
+            self._unlink(conn['id'], a, b)
+
+    def _unlink(self, conn_id, a, b):
+        del self.wires[a][conn_id]
+        del self.wires[b][conn_id]
+        if b in self.wires[a].values():
+            return
+        reached, stack = {a}, [a]
+        while stack:
+            for other in self.wires[stack.pop()].values():
+                if other not in reached:
+                    if other == b:
+                        return
+                    reached.add(other)
+                    stack.append(other)
+        net = self.net_of[a]
+        rest = self.members[net] - reached
+        split = reached if len(reached) <= len(rest) else rest
+        grounds = len(split & self.grounds)
+        self.members[net] -= split
+        self.ground_count[net] -= grounds
+        self._new_net(split, grounds)
+
+    def net(self, comp_id, terminal):
+        return self.net_of.get((comp_id, terminal))
+
+    def nets(self):
+        return self.members.keys()
+
+    def is_ground(self, net):
+        return self.ground_count.get(net, 0) > 0
+
+    def name(self, net):
+        return '0' if self.is_ground(net) else f"N{net}"
+
+    def terminals(self, net):
+        return self.members.get(net, ())
+
+    def component_nets(self, comp):
+        return [self.net_of.get((comp['id'], i)) for i in range(len(comp.get('terminals', ())))]
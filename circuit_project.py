@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Formato binário de projeto (.dsc) mapeável em memória
+
+Layout (little-endian):
+    cabeçalho   HEADER
+    payload     strings (UTF-8 separadas por NUL) | componentes | conexões
+O payload pode ser gravado cru (mapeável com mmap) ou comprimido com zlib/zstd.
+A string 0 guarda o contador de nomes em JSON.
+"""
+import json
+import mmap
+import struct
+import zlib
+
+import numpy as np
+
+from circuit_components import Component, Connection
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b'DSCB'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIIQQQ')
+RAW, ZLIB, ZSTD = 0, 1, 2
+NONE = 0xFFFFFFFF
+
+COMPONENT_DTYPE = np.dtype([('id', '<u4'), ('type', '<u4'), ('name', '<u4'), ('value', '<u4'), ('extra', '<u4'), ('x', '<f8'), ('y', '<f8'), ('rotation', '<f8'), ('visible', 'u1')])
+CONNECTION_DTYPE = np.dtype([('id', '<u4'), ('from_component', '<u4'), ('from_terminal', '<u2'), ('to_component', '<u4'), ('to_terminal', '<u2'), ('extra', '<u4')])
+
+
+class ProjectFormatError(ValueError):
+    pass
+
+
+class _Strings:
+    def __init__(self):
+        self.index = {}
+        self.items = []
+
+    def __call__(self, s):
+        idx = self.index.get(s)
+        if idx is None:
+            if '\0' in s:
+                raise ProjectFormatError(f"Texto com caractere NUL não pode ser gravado: {s!r}")
+            idx = self.index[s] = len(self.items)
+            self.items.append(s)
+        return idx
+
+    def extra(self, record):
+        return self(json.dumps(record.extra, sort_keys=True, ensure_ascii=False)) if record.extra else NONE
+
+    def encode(self):
+        return '\0'.join(self.items).encode('utf-8')
+
+
+def is_binary_project(path):
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def save_project(path, components, connections, counter, compression=RAW):
+    strings = _Strings()
+    strings(json.dumps(counter, sort_keys=True))
+    comps = np.zeros(len(components), COMPONENT_DTYPE)
+    comps['id'] = [strings(c['id']) for c in components]
+    comps['type'] = [strings(c['type']) for c in components]
+    comps['name'] = [strings(c['name']) for c in components]
+    comps['value'] = [strings(str(c['value'])) for c in components]
+    comps['extra'] = [strings.extra(c) for c in components]
+    comps['x'] = [c['x'] for c in components]
+    comps['y'] = [c['y'] for c in components]
+    comps['rotation'] = [c['rotation'] for c in components]
+    comps['visible'] = [bool(c['visible']) for c in components]
+    conns = np.zeros(len(connections), CONNECTION_DTYPE)
+    conns['id'] = [strings(c['id']) for c in connections]
+    conns['from_component'] = [strings(c['from_component']) for c in connections]
+    conns['from_terminal'] = [c['from_terminal'] for c in connections]
+    conns['to_component'] = [strings(c['to_component']) for c in connections]
+    conns['to_terminal'] = [c['to_terminal'] for c in connections]
+    conns['extra'] = [strings.extra(c) for c in connections]
+    blob = strings.encode()
+    payload = b''.join((blob, comps.tobytes(), conns.tobytes()))
+    if compression == ZLIB:
+        payload = zlib.compress(payload, 6)
+    elif compression == ZSTD:
+        if zstandard is None:
+            raise ProjectFormatError("Compressão zstd requer o pacote 'zstandard'")
+        payload = zstandard.ZstdCompressor().compress(payload)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, compression, len(strings.items), len(comps), len(conns), len(blob), comps.nbytes + conns.nbytes + len(blob), len(payload)))
+        f.write(payload)
+
+
+def _coords(values):
+    ints = values.astype(np.int64)
+    return ints.tolist() if np.array_equal(ints, values) else values.tolist()
+
+
+def load_project(path):
+    with open(path, 'rb') as f:
+        head = f.read(HEADER.size)
+        if len(head) < HEADER.size:
+            raise ProjectFormatError("Arquivo .dsc truncado")
+        magic, version, compression, n_strings, n_comps, n_conns, blob_size, raw_size, stored_size = HEADER.unpack(head)
+        if magic != MAGIC:
+            raise ProjectFormatError("Não é um projeto .dsc binário")
+        if version > VERSION:
+            raise ProjectFormatError(f"Versão de arquivo {version} não suportada")
+        if compression == RAW:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stored_size else b''
+            payload = memoryview(data)[HEADER.size:HEADER.size + stored_size] if stored_size else b''
+        elif compression == ZLIB:
+            payload = zlib.decompress(f.read(stored_size))
+        elif compression == ZSTD:
+            if zstandard is None:
+                raise ProjectFormatError("Este arquivo usa zstd; instale o pacote 'zstandard'")
+            payload = zstandard.ZstdDecompressor().decompress(f.read(stored_size), max_output_size=raw_size)
+        else:
+            raise ProjectFormatError(f"Compressão {compression} desconhecida")
+    if len(payload) != raw_size:
+        raise ProjectFormatError("Arquivo .dsc truncado")
+    strings = bytes(payload[:blob_size]).decode('utf-8').split('\0')
+    if len(strings) != n_strings:
+        raise ProjectFormatError("Tabela de strings corrompida")
+    comps = np.frombuffer(payload, COMPONENT_DTYPE, n_comps, blob_size)
+    conns = np.frombuffer(payload, CONNECTION_DTYPE, n_conns, blob_size + comps.nbytes)
+    components = [Component(strings[i], strings[t], strings[n], x, y, r, strings[v], bool(vis))
+                  for i, t, n, v, x, y, r, vis in zip(comps['id'].tolist(), comps['type'].tolist(), comps['name'].tolist(), comps['value'].tolist(), _coords(comps['x']), _coords(comps['y']), _coords(comps['rotation']), comps['visible'].tolist())]
+    for k in np.flatnonzero(comps['extra'] != NONE).tolist():
+        for key, value in json.loads(strings[comps['extra'][k]]).items():
+            components[k][key] = value
+    connections = [Connection(strings[i], strings[a], ta, strings[b], tb)
+                   for i, a, ta, b, tb in zip(conns['id'].tolist(), conns['from_component'].tolist(), conns['from_terminal'].tolist(), conns['to_component'].tolist(), conns['to_terminal'].tolist())]
+    for k in np.flatnonzero(conns['extra'] != NONE).tolist():
+        for key, value in json.loads(strings[conns['extra'][k]]).items():
+            connections[k][key] = value
+    return components, connections, json.loads(strings[0])
+
+
+def project_data(components, connections, counter):
+    return {'components': [c.to_dict() for c in components], 'connections': [c.to_dict() for c in connections], 'counter': counter}
+
+
+def project_from_data(data):
+    components = [Component.from_dict(c) for c in data.get('components', [])]
+    ids = {c.id: c.id for c in components}
+    return components, [Connection.from_dict(c, ids) for c in data.get('connections', [])], data.get('counter', {})
+
+
+def read_project(path):
+    if is_binary_project(path):
+        return load_project(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return project_from_data(json.load(f))
+
+
+def write_project(path, components, connections, counter, compression=RAW):
+    if path.lower().endswith('.json'):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(project_data(components, connections, counter), f, indent=2, ensure_ascii=False)
+    else:
+        save_project(path, components, connections, counter, compression)
@@ -0,0 +1,642 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Motor de Análise Nodal Modificada (MNA)
+"""
+import copy
+import hashlib
+from functools import lru_cache
+
+import numpy as np
+
+from circuit_devices import DEVICE_TYPES
+from circuit_models import device_model
+from circuit_nets import NetIndex
+from circuit_units import parse_values
+
+
+GMIN = 1e-12
+R_ON = 1e-3
+R_OFF = np.inf
+RELAY_COIL = 400.0
+OPAMP_GAIN = 1e5
+AC_FREQUENCY = 60.0
+PATTERN_CACHE_SIZE = 8
+
+
+class SimulationError(Exception):
+    pass
+
+
+class SimulationCancelled(SimulationError):
+    pass
+
+
+class ElementGroup:
+    def __init__(self, nodes, params=('value',)):
+        self.node_fields = nodes
+        self.param_fields = params
+        self.names = []
+        self.rows = []
+
+    def add(self, name, *row):
+        self.names.append(name)
+        self.rows.append(row)
+
+    def __len__(self):
+        return len(self.names)
+
+    def freeze(self):
+        cols = list(zip(*self.rows)) if self.rows else [()] * (len(self.node_fields) + len(self.param_fields))
+        for i, f in enumerate(self.node_fields):
+            setattr(self, f, np.asarray(cols[i], dtype=np.int64))
+        for i, f in enumerate(self.param_fields):
+            setattr(self, f, np.asarray(cols[len(self.node_fields) + i], dtype=float))
+        return self
+
+    def row_index(self):
+        if not hasattr(self, 'index'):
+            self.index = {name: i for i, name in enumerate(self.names)}
+        return self.index
+
+    def patched(self, other):
+        index = self.row_index()
+        rows = np.array([index.get(name, -1) for name in other.names], dtype=np.int64)
+        if np.any(rows < 0) or any(not np.array_equal(getattr(self, f)[rows], getattr(other, f)) for f in self.node_fields):
+            return None
+        group = copy.copy(self)
+        for f in self.param_fields:
+            values = getattr(self, f).copy()
+            values[rows] = getattr(other, f)
+            setattr(group, f, values)
+        return group
+
+
+class Circuit:
+    GROUPS = ('resistors', 'capacitors', 'inductors', 'vsources', 'isources', 'vcvs', 'transformers', 'diodes', 'bjts', 'mosfets', 'voltmeters', 'probes')
+
+    def __init__(self, node_names, num_components=0, num_connections=0):
+        self.node_names = node_names
+        self.n_nodes = len(node_names)
+        self.num_components = num_components
+        self.num_connections = num_connections
+        self.resistors = ElementGroup(('a', 'b'))
+        self.capacitors = ElementGroup(('a', 'b'))
+        self.inductors = ElementGroup(('a', 'b'))
+        self.vsources = ElementGroup(('a', 'b'), ('value', 'ac'))
+        self.isources = ElementGroup(('a', 'b'), ('value', 'ac'))
+        self.vcvs = ElementGroup(('a', 'b', 'c', 'd'))
+        self.transformers = ElementGroup(('a', 'b', 'c', 'd'))
+        self.diodes = ElementGroup(('a', 'b'), ('IS', 'N', 'BV', 'IBV'))
+        self.bjts = ElementGroup(('c', 'b', 'e'), ('IS', 'BF', 'BR', 'pol'))
+        self.mosfets = ElementGroup(('d', 'g', 's'), ('VTO', 'KP', 'LAMBDA', 'pol'))
+        self.voltmeters = ElementGroup(('a', 'b'), ())
+        self.probes = ElementGroup(('a',), ())
+        self.supplies = set()
+        self.meters = set()
+        self.source_freq = {}
+
+    def freeze(self):
+        for g in self.groups():
+            g.freeze()
+        n = self.n_nodes - 1
+        self.vsource_branch = n + np.arange(len(self.vsources))
+        n += len(self.vsources)
+        self.inductor_branch = n + np.arange(len(self.inductors))
+        n += len(self.inductors)
+        self.vcvs_branch = n + np.arange(len(self.vcvs))
+        n += len(self.vcvs)
+        self.transformer_branch = n + np.arange(len(self.transformers))
+        n += len(self.transformers)
+        self.size = n
+        return self
+
+    def groups(self):
+        return tuple(getattr(self, attr) for attr in self.GROUPS)
+
+
+def compile_circuit(components, connections, parse_value, nets=None):
+    if nets is None:
+        nets = NetIndex()
+        nets.rebuild(components, connections)
+    ground = {n for n in nets.nets() if nets.is_ground(n)}
+    if not ground:
+        ref = next((c for c in components if c['type'] in ('voltage_source', 'voltage_ac') and nets.net(c['id'], 1) is not None), None)
+        if ref:
+            ground.add(nets.net(ref['id'], 1))
+    index, names = {n: 0 for n in ground}, ['0']
+    comp_nets = [nets.component_nets(comp) for comp in components]
+    for cn in comp_nets:
+        for n in cn:
+            if n not in index:
+                index[n] = len(names)
+                names.append(nets.name(n))
+    ckt = Circuit(names, len(components), len(connections))
+    numbers = parse_values([comp.get('value', '') for comp in components], parse_value)
+    for comp, cn, number in zip(components, comp_nets, numbers.tolist()):
+        _compile_component(ckt, comp, [index[n] for n in cn], number, parse_value)
+    ckt.node_index = index
+    return ckt.freeze()
+
+
+def update_circuit(ckt, components, nets, parse_value):
+    # recompila só os parâmetros dos componentes dados; None se a topologia mudou
+    patch = Circuit(ckt.node_names)
+    numbers = parse_values([comp.get('value', '') for comp in components], parse_value)
+    for comp, number in zip(components, numbers.tolist()):
+        nodes = [ckt.node_index.get(n) for n in nets.component_nets(comp)]
+        if None in nodes:
+            return None
+        _compile_component(patch, comp, nodes, number, parse_value)
+    patch.freeze()
+    new = copy.copy(ckt)
+    for attr in Circuit.GROUPS:
+        other = getattr(patch, attr)
+        if len(other):
+            group = getattr(ckt, attr).patched(other)
+            if group is None:
+                return None
+            setattr(new, attr, group)
+    new.source_freq = {**ckt.source_freq, **patch.source_freq}
+    return new
+
+
+def transformer_ratio(value):
+    # "Np:Ns" -> Ns/Np (tensão do secundário por volt do primário)
+    primary, _, secondary = str(value).partition(':')
+    try:
+        return float(secondary) / float(primary)
+    except (ValueError, ZeroDivisionError):
+        return 1.0
+
+
+def _compile_component(ckt, comp, nodes, number, parse_value):
+    t, name = comp['type'], comp['name']
+    value = comp.get('value', '')
+    if t == 'resistor':
+        ckt.resistors.add(name, nodes[0], nodes[1], number or R_ON)
+    elif t == 'potentiometer':
+        r = number or R_ON
+        wiper = min(max(float(comp.get('wiper', 0.5)), 0.0), 1.0)
+        ckt.resistors.add(name + '.A', nodes[0], nodes[2], max(r * wiper, R_ON))
+        ckt.resistors.add(name + '.B', nodes[2], nodes[1], max(r * (1 - wiper), R_ON))
+    elif t == 'capacitor':
+        ckt.capacitors.add(name, nodes[0], nodes[1], number)
+    elif t == 'indutor':
+        ckt.inductors.add(name, nodes[0], nodes[1], number)
+    elif t == 'voltage_source':
+        ckt.vsources.add(name, nodes[0], nodes[1], number, 0.0)
+        ckt.supplies.add(name)
+    elif t == 'voltage_ac':
+        ckt.vsources.add(name, nodes[0], nodes[1], 0.0, number)
+        ckt.source_freq[name] = float(comp.get('frequency', AC_FREQUENCY))
+    elif t == 'vcc':
+        ckt.vsources.add(name, nodes[0], 0, number, 0.0)
+        ckt.supplies.add(name)
+    elif t == 'ammeter':
+        ckt.vsources.add(name, nodes[0], nodes[1], 0.0, 0.0)
+        ckt.meters.add(name)
+    elif t == 'current_source':
+        ckt.isources.add(name, nodes[1], nodes[0], number, 0.0)
+    elif t in ('switch', 'fuse'):
+        ckt.resistors.add(name, nodes[0], nodes[1], R_ON if comp.get('closed', True) else R_OFF)
+    elif t == 'transformer':
+        ckt.transformers.add(name, nodes[2], nodes[3], nodes[0], nodes[1], transformer_ratio(value))
+    elif t == 'relay':
+        ckt.resistors.add(name + '.COIL', nodes[0], nodes[1], RELAY_COIL)
+        ckt.resistors.add(name + '.NO', nodes[2], nodes[3], R_ON if comp.get('closed', False) else R_OFF)
+    elif t in ('opamp', 'comparator'):
+        ckt.vcvs.add(name, nodes[2], 0, nodes[0], nodes[1], OPAMP_GAIN)
+    elif t in ('diode', 'schottky', 'zener', 'led'):
+        _, _, p = device_model(t, value, parse_value)
+        ckt.diodes.add(name, nodes[0], nodes[1], p['IS'], p['N'], p.get('BV', np.inf), p.get('IBV', 0.0))
+    elif t in ('transistor_npn', 'transistor_pnp'):
+        _, _, p = device_model(t, value, parse_value)
+        ckt.bjts.add(name, nodes[1], nodes[0], nodes[2], p['IS'], p['BF'], p['BR'], 1.0 if t == 'transistor_npn' else -1.0)
+    elif t in ('mosfet_n', 'mosfet_p'):
+        _, _, p = device_model(t, value, parse_value)
+        ckt.mosfets.add(name, nodes[1], nodes[0], nodes[2], p['VTO'], p['KP'], p['LAMBDA'], 1.0 if t == 'mosfet_n' else -1.0)
+    elif t == 'voltmeter':
+        ckt.voltmeters.add(name, nodes[0], nodes[1])
+    elif t == 'probe':
+        ckt.probes.add(name, nodes[0])
+
+
+class _Stamper:
+    def __init__(self, size):
+        self.size = size
+        self.rows, self.cols, self.vals = [], [], []
+        self.rhs = np.zeros(size)
+
+    def add(self, r, c, v):
+        r, c = np.asarray(r), np.asarray(c)
+        v = np.broadcast_to(v, r.shape)
+        m = (r >= 0) & (c >= 0)
+        self.rows.append(r[m])
+        self.cols.append(c[m])
+        self.vals.append(v[m])
+
+    def conductance(self, a, b, g):
+        ia, ib = a - 1, b - 1
+        self.add(ia, ia, g)
+        self.add(ib, ib, g)
+        self.add(ia, ib, -g)
+        self.add(ib, ia, -g)
+
+    def branch(self, a, b, k):
+        ia, ib = a - 1, b - 1
+        self.add(ia, k, 1.0)
+        self.add(ib, k, -1.0)
+        self.add(k, ia, 1.0)
+        self.add(k, ib, -1.0)
+
+    def inject(self, a, b, i):
+        np.add.at(self.rhs, a[a > 0] - 1, -i[a > 0])
+        np.add.at(self.rhs, b[b > 0] - 1, i[b > 0])
+
+    def matrix(self):
+        rows = np.concatenate(self.rows) if self.rows else np.zeros(0, dtype=np.int64)
+        cols = np.concatenate(self.cols) if self.cols else np.zeros(0, dtype=np.int64)
+        vals = np.concatenate(self.vals) if self.vals else np.zeros(0)
+        return rows, cols, vals
+
+
+@lru_cache(maxsize=None)
+def sparse_lu():
+    # scipy.sparse leva ~0.2 s para importar; só é carregado na primeira fatoração
+    try:
+        from scipy.sparse import csc_matrix
+        from scipy.sparse.linalg import splu
+    except ImportError:
+        return None
+    return csc_matrix, splu
+
+
+def _singular(e):
+    return SimulationError(f"Matriz singular: verifique laços de fontes de tensão ({e})")
+
+
+class SparseSystem:
+    UPDATE_RANK = 8
+    UPDATE_COND = 1e12
+    UPDATE_TOL = 1e-12
+
+    def __init__(self, rows, cols, size):
+        self.size = size
+        key = np.asarray(cols, dtype=np.int64) * size + np.asarray(rows, dtype=np.int64)
+        uniq, self.inverse = np.unique(key, return_inverse=True)
+        self.nnz = len(uniq)
+        self.indices = (uniq % size).astype(np.int32)
+        self.indptr = np.searchsorted(uniq // size, np.arange(size + 1)).astype(np.int32)
+        self.columns = np.repeat(np.arange(size), np.diff(self.indptr))
+        self.perm = None
+        self.base = None
+        self.factorizations = 0
+        self.updates = 0
+
+    def assemble(self, vals):
+        if np.iscomplexobj(vals):
+            return self.assemble(vals.real) + 1j * self.assemble(vals.imag)
+        return np.bincount(self.inverse, weights=vals, minlength=self.nnz)
+
+    def dense(self, vals):
+        return self._dense(self.assemble(vals))
+
+    def _dense(self, data):
+        a = np.zeros((self.size, self.size), dtype=data.dtype)
+        a[self.indices, self.columns] = data
+        return a
+
+    def matvec(self, data, x):
+        return np.bincount(self.indices, weights=data * x[self.columns], minlength=self.size)
+
+    def factor(self, vals):
+        data = self.assemble(vals)
+        if np.iscomplexobj(data):
+            return self.lu(data)
+        base = self.base
+        solve = self.update(base, data) if base is not None else None
+        if solve is None:
+            solve = self.lu(data)
+            self.base = (data, solve)
+        return solve
+
+    def update(self, base, data):
+        # Sherman-Morrison-Woodbury: A' = A + E_r C E_k^T, com A já fatorada e C pequena
+        base_data, base_solve = base
+        changed = np.flatnonzero(data != base_data)
+        if not len(changed):
+            return base_solve
+        rows, ri = np.unique(self.indices[changed], return_inverse=True)
+        cols, ki = np.unique(self.columns[changed], return_inverse=True)
+        if max(len(rows), len(cols)) > self.UPDATE_RANK:
+            return None
+        c = np.zeros((len(rows), len(cols)))
+        c[ri, ki] = data[changed] - base_data[changed]
+        e = np.zeros((self.size, len(rows)))
+        e[rows, np.arange(len(rows))] = 1.0
+        z = base_solve(e)
+        m = np.eye(len(rows)) + c @ z[cols]
+        if not np.all(np.isfinite(m)) or np.linalg.cond(m) > self.UPDATE_COND:
+            return None
+        w = np.linalg.solve(m, c)
+        scale = np.bincount(self.indices, weights=np.abs(data), minlength=self.size).max()
+        self.updates += 1
+        full = []
+
+        def apply(b):
+            y = base_solve(b)
+            return y - z @ (w @ y[cols])
+
+        def solve(b):
+            if full:
+                return full[0](b)
+            if np.ndim(b) != 1:
+                return np.column_stack([solve(col) for col in np.transpose(b)])
+            x = apply(b)
+            for _ in range(2):
+                res = b - self.matvec(data, x)
+                if np.abs(res).max(initial=0.0) <= self.UPDATE_TOL * (np.abs(b).max(initial=0.0) + scale * np.abs(x).max(initial=0.0)):
+                    return x
+                x = x + apply(res)
+            full.append(self.lu(data))
+            self.base = (data, full[0])
+            return full[0](b)
+        return solve
+
+    def lu(self, data):
+        self.factorizations += 1
+        sparse = sparse_lu()
+        if sparse is None:
+            try:
+                inv = np.linalg.inv(self._dense(data))
+            except np.linalg.LinAlgError as e:
+                raise _singular(e)
+            return inv.__matmul__
+        csc_matrix, splu = sparse
+        a = csc_matrix((data, self.indices, self.indptr), shape=(self.size, self.size))
+        try:
+            if self.perm is None:
+                lu = splu(a, permc_spec='COLAMD')
+                self.perm = np.argsort(lu.perm_c)
+                return lu.solve
+            lu = splu(a[:, self.perm], permc_spec='NATURAL')
+        except RuntimeError as e:
+            raise _singular(e)
+        perm = self.perm
+
+        def solve(b):
+            x = np.empty(b.shape, dtype=np.result_type(b, float))
+            x[perm] = lu.solve(b)
+            return x
+        return solve
+
+
+_patterns = {}
+
+
+def sparse_pattern(rows, cols, size):
+    # padrão CSC e ordenação COLAMD compartilhados entre circuitos de mesma topologia
+    rows, cols = np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+    digest = hashlib.blake2b(rows.tobytes(), digest_size=16)
+    digest.update(cols.tobytes())
+    key = (size, len(rows), digest.digest())
+    pattern = _patterns.pop(key, None)
+    if pattern is None:
+        pattern = SparseSystem(rows, cols, size)
+        if len(_patterns) >= PATTERN_CACHE_SIZE:
+            _patterns.pop(next(iter(_patterns)))
+    _patterns[key] = pattern
+    return pattern
+
+
+class MnaSystem:
+    CACHE_SIZE = 32
+    MAX_ITER = 100
+    RELTOL = 1e-3
+    VNTOL = 1e-6
+    ABSTOL = 1e-12
+    VSTEP = 2.0
+
+    def __init__(self, ckt, pattern=None):
+        rows, cols = self.stamp(ckt)
+        self.pattern = pattern or sparse_pattern(np.concatenate(rows), np.concatenate(cols), ckt.size)
+        self.tol = np.concatenate((np.full(ckt.n_nodes - 1, self.VNTOL), np.full(ckt.size - ckt.n_nodes + 1, self.ABSTOL)))
+
+    def stamp(self, ckt):
+        self.ckt = ckt
+        self.cache = {}
+        g = _Stamper(ckt.size)
+        nodes = np.arange(1, ckt.n_nodes)
+        g.add(nodes - 1, nodes - 1, GMIN)
+        g.conductance(ckt.resistors.a, ckt.resistors.b, 1.0 / ckt.resistors.value)
+        g.branch(ckt.vsources.a, ckt.vsources.b, ckt.vsource_branch)
+        g.rhs[ckt.vsource_branch] = ckt.vsources.value
+        g.branch(ckt.inductors.a, ckt.inductors.b, ckt.inductor_branch)
+        g.inject(ckt.isources.a, ckt.isources.b, ckt.isources.value)
+        e = ckt.vcvs
+        g.branch(e.a, e.b, ckt.vcvs_branch)
+        g.add(ckt.vcvs_branch, e.c - 1, -e.value)
+        g.add(ckt.vcvs_branch, e.d - 1, e.value)
+        # transformador ideal: VCVS no secundário (Vs = k·Vp) e a corrente k·Is refletida no primário
+        x = ckt.transformers
+        g.branch(x.a, x.b, ckt.transformer_branch)
+        g.add(ckt.transformer_branch, x.c - 1, -x.value)
+        g.add(ckt.transformer_branch, x.d - 1, x.value)
+        g.add(x.c - 1, ckt.transformer_branch, -x.value)
+        g.add(x.d - 1, ckt.transformer_branch, x.value)
+        r = _Stamper(ckt.size)
+        r.conductance(ckt.capacitors.a, ckt.capacitors.b, ckt.capacitors.value)
+        r.add(ckt.inductor_branch, ckt.inductor_branch, -ckt.inductors.value)
+        gr, gc, self.g_vals = g.matrix()
+        rr, rc, self.r_vals = r.matrix()
+        self.rhs = g.rhs
+        rows, cols = [gr, rr], [gc, rc]
+        self.devices = []
+        for dt in DEVICE_TYPES:
+            group = getattr(ckt, dt.attr)
+            if not len(group):
+                continue
+            term = dt.nodes(group)
+            width = term.shape[1]
+            dr, dc = np.repeat(term, width, axis=1) - 1, np.tile(term, (1, width)) - 1
+            mask = (dr >= 0) & (dc >= 0)
+            rows.append(dr[mask])
+            cols.append(dc[mask])
+            self.devices.append((dt, group, term, mask))
+        return rows, cols
+
+    def restamp(self, ckt):
+        # mesma topologia com novos valores: o padrão e a última fatoração continuam valendo como base
+        self.stamp(ckt)
+
+    def voltages(self, x):
+        return np.concatenate(([0.0], x[:self.ckt.n_nodes - 1]))
+
+    def controls(self, x):
+        v = self.voltages(x)
+        return [dt.controls(group, v) for dt, group, _, _ in self.devices]
+
+    def device_stamps(self, x, controls_old):
+        v = self.voltages(x)
+        vals, rhs, limited, exact = [], np.zeros(self.ckt.size), [], True
+        for (dt, group, term, mask), old in zip(self.devices, controls_old):
+            vc = v[term] @ dt.incidence.T
+            vc_lim, i, didv = dt.evaluate(group, vc, old)
+            exact = exact and np.allclose(vc_lim, vc, rtol=self.RELTOL, atol=self.VNTOL)
+            jac = didv @ dt.incidence
+            const = i - np.einsum('ntk,nk->nt', didv, vc_lim)
+            vals.append(jac.reshape(len(term), -1)[mask])
+            m = term > 0
+            np.add.at(rhs, term[m] - 1, const[m])
+            limited.append(vc_lim)
+        return np.concatenate(vals) if vals else np.zeros(0), rhs, limited, exact
+
+    def jacobian_vals(self, x):
+        return self.device_stamps(x, self.controls(x))[0]
+
+    def factor(self, scale):
+        solve = self.cache.pop(scale, None)
+        if solve is None:
+            solve = self.pattern.factor(np.concatenate((self.g_vals, scale * self.r_vals)))
+            if len(self.cache) >= self.CACHE_SIZE:
+                self.cache.pop(next(iter(self.cache)))
+        self.cache[scale] = solve
+        return solve
+
+    def _newton(self, rhs, scale, x, gshunt=0.0):
+        g = self.g_vals
+        if gshunt:
+            g = g.copy()
+            g[:self.ckt.n_nodes - 1] += gshunt
+        base = np.concatenate((g, scale * self.r_vals))
+        n = self.ckt.n_nodes - 1
+        controls = self.controls(x)
+        prev = limit = None
+        for _ in range(self.MAX_ITER):
+            vals, const, new_controls, exact = self.device_stamps(x, controls)
+            try:
+                x_new = self.pattern.factor(np.concatenate((base, vals)))(rhs - const)
+            except SimulationError:
+                x_new = None
+            if x_new is None or not np.all(np.isfinite(x_new)):
+                if prev is None:
+                    return None
+                x = 0.5 * (x + prev)
+                continue
+            controls = new_controls
+            # o primeiro passo fixa a escala do circuito: nenhum passo de nó pode excedê-la,
+            # e uma linearização singular volta meio passo em vez de abandonar o Newton
+            if limit is None:
+                limit = max(np.abs(x_new[:n]).max(initial=0.0), self.VSTEP)
+            dv = x_new[:n] - x[:n]
+            step = np.clip(dv, -limit, limit)
+            if not np.array_equal(step, dv):
+                x_new[:n] = x[:n] + step
+                exact = False
+            if exact and np.all(np.abs(x_new - x) <= self.RELTOL * np.maximum(np.abs(x_new), np.abs(x)) + self.tol):
+                return x_new
+            prev, x = x, x_new
+        return None
+
+    def solve(self, rhs, scale=0.0, guess=None, homotopy=True, progress=None):
+        # progress também é o ponto de interrupção: chamado antes e depois de cada fatoração longa
+        if progress:
+            progress(0.0)
+        if not self.devices:
+            solve = self.factor(scale)
+            if progress:
+                progress(0.5)
+            return solve(rhs)
+        x = np.zeros(self.ckt.size) if guess is None else guess
+        sol = self._newton(rhs, scale, x)
+        if sol is None and homotopy:
+            y = x
+            for k, gshunt in enumerate(10.0 ** np.arange(-2, -13, -1)):
+                if progress:
+                    progress(k / 22)
+                y = self._newton(rhs, scale, y, gshunt)
+                if y is None:
+                    break
+            if y is not None:
+                sol = self._newton(rhs, scale, y)
+        if sol is None and homotopy:
+            y = np.zeros(self.ckt.size)
+            for lam in np.linspace(0.1, 1.0, 10):
+                if progress:
+                    progress(0.5 + lam / 2)
+                y = self._newton(lam * rhs, scale, y)
+                if y is None:
+                    break
+            sol = y
+        if sol is None:
+            raise SimulationError("A simulação não convergiu (Newton-Raphson)")
+        return sol
+
+
+def solve_dc(ckt, system=None, progress=None):
+    system = system or MnaSystem(ckt)
+    return system.solve(system.rhs.copy(), progress=progress)
+
+
+def dc_results(ckt, x):
+    results = {'nodes': {}, 'currents': {}, 'power': {}, 'voltages': {}}
+    v = np.concatenate(([0.0], x[:ckt.n_nodes - 1]))
+    # grupos grandes vão de uma vez por tolist(): float() elemento a elemento dominava o tempo
+    results['nodes'].update(zip([f"V({name})" for name in ckt.node_names[1:]], v[1:].tolist()))
+    for p, name in zip(ckt.probes.a, ckt.probes.names):
+        results['voltages'][name] = float(v[p])
+    r = ckt.resistors
+    vr = v[r.a] - v[r.b]
+    ir = vr / r.value
+    results['currents'].update(zip(r.names, ir.tolist()))
+    results['power'].update(zip(r.names, (vr * ir).tolist()))
+    results['voltages'].update(zip(r.names, vr.tolist()))
+    src = ckt.vsources
+    isrc = -x[ckt.vsource_branch]
+    for name, vi, ii in zip(src.names, v[src.a] - v[src.b], isrc):
+        results['currents'][name] = float(-ii if name in ckt.meters else ii)
+        results['voltages'][name] = float(vi)
+    t = ckt.transformers
+    for name, vi, ii in zip(t.names, v[t.a] - v[t.b], -x[ckt.transformer_branch]):
+        results['currents'][name] = float(ii)
+        results['voltages'][name] = float(vi)
+    for name, ii in zip(ckt.inductors.names, x[ckt.inductor_branch]):
+        results['currents'][name] = float(ii)
+        results['power'][name] = 0.0
+        results['voltages'][name] = 0.0
+    c = ckt.capacitors
+    for name, vi in zip(c.names, v[c.a] - v[c.b]):
+        results['currents'][name] = 0.0
+        results['power'][name] = 0.0
+        results['voltages'][name] = float(vi)
+    for dt in DEVICE_TYPES:
+        group = getattr(ckt, dt.attr)
+        if not len(group):
+            continue
+        vc, i = dt.currents(group, v)
+        if dt.attr == 'diodes':
+            cur, volt, power = i[:, 0], vc[:, 0], vc[:, 0] * i[:, 0]
+        else:
+            vt = v[dt.nodes(group)]
+            cur, volt = i[:, 0], vt[:, 0] - vt[:, 2]
+            power = np.einsum('nt,nt->n', vt, i)
+        for name, ii, vi, pi in zip(group.names, cur, volt, power):
+            results['currents'][name] = float(ii)
+            results['power'][name] = float(pi)
+            results['voltages'][name] = float(vi)
+    for name, vi in zip(ckt.voltmeters.names, v[ckt.voltmeters.a] - v[ckt.voltmeters.b]):
+        results['voltages'][name] = float(vi)
+    is_supply = np.array([n in ckt.supplies for n in src.names], dtype=bool)
+    total_voltage = float(np.sum(src.value[is_supply]))
+    total_current = float(np.sum(isrc[is_supply]))
+    results['summary'] = {'total_voltage': total_voltage, 'total_resistance': total_voltage / total_current if total_current else 0.0, 'total_current': total_current, 'num_components': ckt.num_components, 'num_connections': ckt.num_connections}
+    return results
+
+
+def analyze_dc(ckt, system=None, progress=None):
+    return dc_results(ckt, solve_dc(ckt, system, progress))
+
+
+def simulate_dc(components, connections, parse_value, nets=None):
+    return analyze_dc(compile_circuit(components, connections, parse_value, nets))
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Índice espacial em grade uniforme para hit-testing e culling
+"""
+import math
+
+HALF_WIDTH = 50
+HALF_HEIGHT = 40
+
+
+class SpatialIndex:
+    def __init__(self, terminal_positions, cell=64):
+        self.terminal_positions = terminal_positions
+        self.cell = cell
+        self.clear()
+
+    def clear(self):
+        self.items = {}
+        self.order = {}
+        self.box_cells = {}
+        self.boxes = {}
+        self.term_cells = {}
+        self.terms = {}
+        self.term_pos = {}
+        self.wires = {}
+        self.wire_cells = {}
+        self.wire_grid = {}
+        self.comp_wires = {}
+        self.next_order = 0
+
+    def rebuild(self, components, connections=()):
+        self.clear()
+        for comp in components:
+            self.add(comp)
+        for conn in connections:
+            self.add_wire(conn)
+
+    def _cell(self, x, y):
+        return int(math.floor(x / self.cell)), int(math.floor(y / self.cell))
+
+    def _box_range(self, x, y):
+        x0, y0 = self._cell(x - HALF_WIDTH, y - HALF_HEIGHT)
+        x1, y1 = self._cell(x + HALF_WIDTH, y + HALF_HEIGHT)
+        return [(i, j) for i in range(x0, x1 + 1) for j in range(y0, y1 + 1)]
+
+    def add(self, comp):
+        cid = comp['id']
+        if cid in self.items:
+            self._unindex(cid)
+        elif cid not in self.order:
+            self.order[cid] = self.next_order
+            self.next_order += 1
+        self.items[cid] = comp
+        cells = self._box_range(comp['x'], comp['y'])
+        for c in cells:
+            self.boxes.setdefault(c, set()).add(cid)
+        points = [(i, tx, ty, self._cell(tx, ty)) for i, (tx, ty) in enumerate(self.terminal_positions(comp))]
+        for i, tx, ty, c in points:
+            self.terms.setdefault(c, {})[(cid, i)] = (tx, ty)
+        self.box_cells[cid] = cells
+        self.term_cells[cid] = [(i, c) for i, _, _, c in points]
+        self.term_pos[cid] = [(tx, ty) for _, tx, ty, _ in points]
+        for wid in self.comp_wires.get(cid, ()):
+            self._index_wire(wid)
+
+    update = add
+
+    def _unindex(self, cid):
+        for c in self.box_cells.pop(cid, ()):
+            bucket = self.boxes[c]
+            bucket.discard(cid)
+            if not bucket:
+                del self.boxes[c]
+        for i, c in self.term_cells.pop(cid, ()):
+            bucket = self.terms[c]
+            bucket.pop((cid, i), None)
+            if not bucket:
+                del self.terms[c]
+        self.term_pos.pop(cid, None)
+        for wid in self.comp_wires.get(cid, ()):
+            self._unindex_wire(wid)
+
+    def remove(self, comp):
+        cid = comp['id']
+        if cid in self.items:
+            # a ordem fica reservada: desfazer a remoção devolve o componente à mesma altura
+            self._unindex(cid)
+            del self.items[cid]
+
+    def add_wire(self, conn):
+        wid = conn['id']
+        self.wires[wid] = conn
+        for cid in (conn['from_component'], conn['to_component']):
+            self.comp_wires.setdefault(cid, set()).add(wid)
+        self._index_wire(wid)
+
+    def remove_wire(self, conn):
+        wid = conn['id']
+        if wid not in self.wires:
+            return
+        self._unindex_wire(wid)
+        del self.wires[wid]
+        for cid in (conn['from_component'], conn['to_component']):
+            bucket = self.comp_wires.get(cid)
+            if bucket is not None:
+                bucket.discard(wid)
+                if not bucket:
+                    del self.comp_wires[cid]
+
+    def wire_path(self, conn):
+        a = self.term_pos.get(conn['from_component'], ())
+        b = self.term_pos.get(conn['to_component'], ())
+        fi, ti = conn.get('from_terminal', 0), conn.get('to_terminal', 0)
+        if fi >= len(a) or ti >= len(b):
+            return None
+        return a[fi] + b[ti]
+
+    def component_wires(self, comp):
+        return [self.wires[wid] for wid in self.comp_wires.get(comp['id'], ())]
+
+    def _segment_cells(self, xa, ya, xb, yb):
+        i0, j0 = self._cell(min(xa, xb), min(ya, yb))
+        i1, j1 = self._cell(max(xa, xb), max(ya, yb))
+        return [(i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)]
+
+    def _index_wire(self, wid):
+        self._unindex_wire(wid)
+        path = self.wire_path(self.wires[wid])
+        if path is None:
+            return
+        x1, y1, x2, y2 = path
+        xm = (x1 + x2) / 2
+        cells = set(self._segment_cells(x1, y1, xm, y1))
+        cells.update(self._segment_cells(xm, y1, xm, y2))
+        cells.update(self._segment_cells(xm, y2, x2, y2))
+        for c in cells:
+            self.wire_grid.setdefault(c, set()).add(wid)
+        self.wire_cells[wid] = cells
+
+    def _unindex_wire(self, wid):
+        for c in self.wire_cells.pop(wid, ()):
+            bucket = self.wire_grid[c]
+            bucket.discard(wid)
+            if not bucket:
+                del self.wire_grid[c]
+
+    def _rect_cells(self, x0, y0, x1, y1):
+        i0, j0 = self._cell(x0, y0)
+        i1, j1 = self._cell(x1, y1)
+        return (i1 - i0 + 1) * (j1 - j0 + 1), ((i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1))
+
+    def components_in(self, x0, y0, x1, y1):
+        count, cells = self._rect_cells(x0, y0, x1, y1)
+        if count >= len(self.items):
+            found = self.items
+        else:
+            found = set()
+            for c in cells:
+                found.update(self.boxes.get(c, ()))
+        hits = []
+        for cid in found:
+            comp = self.items[cid]
+            if x0 < comp['x'] + HALF_WIDTH and comp['x'] - HALF_WIDTH < x1 and y0 < comp['y'] + HALF_HEIGHT and comp['y'] - HALF_HEIGHT < y1:
+                hits.append(comp)
+        hits.sort(key=lambda comp: self.order[comp['id']])
+        return hits
+
+    def wires_in(self, x0, y0, x1, y1):
+        count, cells = self._rect_cells(x0, y0, x1, y1)
+        if count >= len(self.wire_cells):
+            return [self.wires[wid] for wid in self.wire_cells]
+        found = set()
+        for c in cells:
+            found.update(self.wire_grid.get(c, ()))
+        return [self.wires[wid] for wid in found]
+
+    def component_at(self, x, y):
+        best = None
+        for cid in self.boxes.get(self._cell(x, y), ()):
+            comp = self.items[cid]
+            if not comp.get('visible', True) or abs(x - comp['x']) >= HALF_WIDTH or abs(y - comp['y']) >= HALF_HEIGHT:
+                continue
+            if best is None or self.order[cid] > self.order[best]:
+                best = cid
+        return self.items[best] if best is not None else None
+
+    def terminal_at(self, x, y, threshold=15, exclude=None):
+        best, best_key = (None, None, None), None
+        x0, y0 = self._cell(x - threshold, y - threshold)
+        x1, y1 = self._cell(x + threshold, y + threshold)
+        for i in range(x0, x1 + 1):
+            for j in range(y0, y1 + 1):
+                for (cid, k), (tx, ty) in self.terms.get((i, j), {}).items():
+                    d2 = (x - tx) ** 2 + (y - ty) ** 2
+                    if d2 >= threshold * threshold:
+                        continue
+                    comp = self.items[cid]
+                    if comp is exclude or not comp.get('visible', True):
+                        continue
+                    key = (d2, self.order[cid])
+                    if best_key is None or key < best_key:
+                        best, best_key = (comp, k, (tx, ty)), key
+        return best
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Varredura de parâmetros e Monte Carlo (pool de processos)
+"""
+import copy
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from circuit_ac import solve_ac
+from circuit_solver import MnaSystem, SimulationError
+
+SWEEP_GROUPS = ('resistors', 'capacitors', 'inductors', 'vsources', 'isources', 'diodes', 'bjts', 'mosfets')
+CHUNKS_PER_WORKER = 4
+HISTOGRAM_BINS = 20
+
+_state = {}
+
+
+def resolve_parameter(ckt, key):
+    name, field = key, 'value'
+    if not any(name in getattr(ckt, attr).names for attr in SWEEP_GROUPS) and '.' in key:
+        name, field = key.rsplit('.', 1)
+    for attr in SWEEP_GROUPS:
+        group = getattr(ckt, attr)
+        if name in group.names and field in group.param_fields:
+            return attr, field, group.names.index(name)
+    raise SimulationError(f"Parâmetro não encontrado para varredura: {key}")
+
+
+def nominal(ckt, target):
+    attr, field, i = target
+    return float(getattr(getattr(ckt, attr), field)[i])
+
+
+def _output_names(ckt, analysis):
+    names = [f"V({name})" for name in ckt.node_names[1:]]
+    if analysis == 'dc':
+        names += [f"I({name})" for name in ckt.vsources.names]
+    return names
+
+
+def _evaluate(ckt, analysis, freqs, pattern):
+    nv = ckt.n_nodes - 1
+    if analysis == 'ac':
+        return solve_ac(ckt, freqs, workers=1, pattern=pattern)[:, :nv]
+    system = MnaSystem(ckt, pattern)
+    x = system.solve(system.rhs.copy())
+    sign = np.array([1.0 if name in ckt.meters else -1.0 for name in ckt.vsources.names])
+    return np.concatenate((x[:nv], sign * x[ckt.vsource_branch]))
+
+
+def _init_worker(ckt, targets, analysis, freqs):
+    _state.update(ckt=ckt, targets=targets, analysis=analysis, freqs=freqs, pattern=MnaSystem(ckt).pattern)
+
+
+def _run_chunk(start, samples):
+    ckt, targets, analysis, freqs = _state['ckt'], _state['targets'], _state['analysis'], _state['freqs']
+    out = []
+    for row in samples:
+        for (attr, field, i), value in zip(targets, row):
+            getattr(getattr(ckt, attr), field)[i] = value
+        try:
+            out.append(_evaluate(ckt, analysis, freqs, _state['pattern']))
+        except SimulationError:
+            out.append(None)
+    return start, out
+
+
+def run_samples(ckt, keys, samples, analysis='dc', freqs=None, workers=None, progress=None):
+    analysis = analysis.lower()
+    if analysis not in ('dc', 'ac'):
+        raise SimulationError(f"Análise não suportada na varredura: {analysis}")
+    if analysis == 'ac' and freqs is None:
+        raise SimulationError("Varredura AC requer a lista de frequências")
+    targets = [resolve_parameter(ckt, k) for k in keys]
+    samples = np.asarray(samples, dtype=float).reshape(-1, len(keys))
+    runs = len(samples)
+    workers = max(1, min(workers or os.cpu_count() or 1, runs))
+    chunk = max(1, math.ceil(runs / (workers * CHUNKS_PER_WORKER)))
+    freqs = None if freqs is None else np.asarray(freqs, dtype=float)
+    rows = [None] * runs
+    done = 0
+    if workers == 1:
+        _init_worker(copy.deepcopy(ckt), targets, analysis, freqs)
+        for start in range(0, runs, chunk):
+            _, out = _run_chunk(start, samples[start:start + chunk])
+            rows[start:start + len(out)] = out
+            done += len(out)
+            if progress:
+                progress(done / runs)
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(ckt, targets, analysis, freqs)) as ex:
+            futures = [ex.submit(_run_chunk, start, samples[start:start + chunk]) for start in range(0, runs, chunk)]
+            try:
+                for future in as_completed(futures):
+                    start, out = future.result()
+                    rows[start:start + len(out)] = out
+                    done += len(out)
+                    if progress:
+                        progress(done / runs)
+            except BaseException:
+                ex.shutdown(cancel_futures=True)
+                raise
+    return sweep_results(ckt, keys, samples, rows, analysis, freqs, workers)
+
+
+def sweep_results(ckt, keys, samples, rows, analysis, freqs, workers=1):
+    names = _output_names(ckt, analysis)
+    shape = (len(names),) if analysis == 'dc' else (len(freqs), len(names))
+    failed = np.array([r is None for r in rows], dtype=bool)
+    dtype = float if analysis == 'dc' else complex
+    values = np.full((len(rows),) + shape, np.nan, dtype=dtype)
+    if (~failed).any():
+        values[~failed] = np.stack([r for r in rows if r is not None])
+    stat = values if analysis == 'dc' else np.abs(values)
+    ok = stat[~failed]
+    results = {'parameters': list(keys), 'samples': samples, 'outputs': names, 'values': values, 'histograms': {}}
+    if analysis == 'ac':
+        results['frequency'] = freqs
+    if len(ok):
+        results['mean'], results['sigma'] = ok.mean(axis=0), ok.std(axis=0)
+        results['min'], results['max'] = ok.min(axis=0), ok.max(axis=0)
+        scalar = ok if analysis == 'dc' else 20 * np.log10(np.maximum(ok.max(axis=1), 1e-30))
+        for j, name in enumerate(names):
+            results['histograms'][name] = np.histogram(scalar[:, j], bins=HISTOGRAM_BINS)
+    results['summary'] = {'analysis': analysis, 'runs': len(rows), 'failed': int(failed.sum()), 'workers': workers, 'num_nodes': ckt.n_nodes - 1}
+    return results
+
+
+def parameter_sweep(ckt, key, values, analysis='dc', freqs=None, workers=None, progress=None):
+    return run_samples(ckt, [key], np.asarray(values, dtype=float)[:, None], analysis, freqs, workers, progress)
+
+
+def monte_carlo(ckt, tolerances, runs, analysis='dc', freqs=None, seed=None, workers=None, progress=None):
+    rng = np.random.default_rng(seed)
+    keys, cols = [], []
+    for key, spec in tolerances.items():
+        tol, dist = spec if isinstance(spec, tuple) else (spec, 'gauss')
+        value = nominal(ckt, resolve_parameter(ckt, key))
+        if dist == 'gauss':
+            dev = tol / 3 * rng.standard_normal(runs)
+        elif dist == 'uniform':
+            dev = rng.uniform(-tol, tol, runs)
+        else:
+            raise SimulationError(f"Distribuição desconhecida: {dist}")
+        keys.append(key)
+        cols.append(value * (1 + dev))
+    if not keys:
+        raise SimulationError("Nenhum parâmetro com tolerância para Monte Carlo")
+    return run_samples(ckt, keys, np.stack(cols, axis=1), analysis, freqs, workers, progress)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Análise transiente (modelos companheiros, passo adaptativo)
+"""
+import math
+
+import numpy as np
+
+from circuit_solver import AC_FREQUENCY, MnaSystem, SimulationError
+
+
+def source_waveforms(ckt):
+    src = ckt.vsources
+    freq = np.array([ckt.source_freq.get(n, AC_FREQUENCY) for n in src.names]) if len(src) else np.zeros(0)
+    peak = src.ac * math.sqrt(2)
+    return lambda t: src.value + peak * np.sin(2 * math.pi * freq * t)
+
+
+def _third_difference(ts, xs):
+    t0, t1, t2, t3 = ts
+    x0, x1, x2, x3 = xs
+    d1a, d1b, d1c = (x3 - x2) / (t3 - t2), (x2 - x1) / (t2 - t1), (x1 - x0) / (t1 - t0)
+    d2a, d2b = (d1a - d1b) / (t3 - t1), (d1b - d1c) / (t2 - t0)
+    return (d2a - d2b) / (t3 - t0)
+
+
+def simulate_transient(ckt, t_stop, h_max=None, reltol=1e-3, vntol=1e-6, abstol=1e-9, max_steps=1000000, progress=None):
+    if t_stop <= 0:
+        raise SimulationError("Tempo final da análise transiente deve ser positivo")
+    system = MnaSystem(ckt)
+    factored, updated = system.pattern.factorizations, system.pattern.updates
+    src, caps, inds = ckt.vsources, ckt.capacitors, ckt.inductors
+    nv = ckt.n_nodes - 1
+    h_max = min(h_max or t_stop / 50, t_stop)
+    ac = src.ac != 0
+    if np.any(ac):
+        h_max = min(h_max, 1.0 / (20 * max(ckt.source_freq.get(n, AC_FREQUENCY) for n, a in zip(src.names, ac) if a)))
+    waveform = source_waveforms(ckt)
+    x = system.solve(system.rhs.copy())
+    v = np.concatenate(([0.0], x[:nv]))
+    vc, ic = v[caps.a] - v[caps.b], np.zeros(len(caps))
+    il, vl = x[ckt.inductor_branch], np.zeros(len(inds))
+    times, xs = [0.0], [x]
+    k, k_max = 10, 40
+    t, rejected = 0.0, 0
+    while t < t_stop * (1 - 1e-12):
+        if len(times) > max_steps:
+            raise SimulationError(f"Análise transiente excedeu {max_steps} passos")
+        h = h_max / 2 ** k
+        final = t + h >= t_stop
+        if final:
+            h = t_stop - t
+        trap = len(times) > 1
+        alpha = 2.0 if trap else 1.0
+        rhs = system.rhs.copy()
+        rhs[ckt.vsource_branch] = waveform(t + h)
+        geq = alpha * caps.value / h
+        ieq = geq * vc + (ic if trap else 0.0)
+        np.add.at(rhs, caps.a[caps.a > 0] - 1, ieq[caps.a > 0])
+        np.add.at(rhs, caps.b[caps.b > 0] - 1, -ieq[caps.b > 0])
+        rhs[ckt.inductor_branch] = -alpha * inds.value / h * il - (vl if trap else 0.0)
+        try:
+            x_new = system.solve(rhs, alpha / h, x, homotopy=False)
+        except SimulationError:
+            if k >= k_max:
+                raise
+            k += 1
+            rejected += 1
+            continue
+        v = np.concatenate(([0.0], x_new[:nv]))
+        vc_new, il_new = v[caps.a] - v[caps.b], x_new[ckt.inductor_branch]
+        err = 0.0
+        if len(times) >= 3 and (len(caps) or len(inds)):
+            ts = times[-3:] + [t + h]
+            past = xs[-3:]
+            vp = [np.concatenate(([0.0], p[:nv])) for p in past]
+            sc = [p[caps.a] - p[caps.b] for p in vp] + [vc_new]
+            sl = [p[ckt.inductor_branch] for p in past] + [il_new]
+            lte_c = np.abs(h ** 3 / 2 * _third_difference(ts, sc)) / (reltol * np.maximum(np.abs(vc_new), np.abs(vc)) + vntol)
+            lte_l = np.abs(h ** 3 / 2 * _third_difference(ts, sl)) / (reltol * np.maximum(np.abs(il_new), np.abs(il)) + abstol)
+            err = max(lte_c.max(initial=0.0), lte_l.max(initial=0.0))
+        if err > 1.0 and k < k_max:
+            k = min(k_max, k + max(1, math.ceil(math.log2(err) / 3)))
+            rejected += 1
+            continue
+        ic = geq * (vc_new - vc) - (ic if trap else 0.0)
+        vl = v[inds.a] - v[inds.b]
+        vc, il, x = vc_new, il_new, x_new
+        t = t_stop if final else t + h
+        times.append(t)
+        xs.append(x)
+        if progress and len(times) % 100 == 0:
+            progress(t / t_stop, lambda: transient_results(ckt, np.array(times), np.array(xs), rejected, system.pattern.factorizations - factored, system.pattern.updates - updated))
+        if err < 0.1 and k > 0:
+            k -= 1
+    return transient_results(ckt, np.array(times), np.array(xs), rejected, system.pattern.factorizations - factored, system.pattern.updates - updated)
+
+
+def transient_results(ckt, time, xs, rejected=0, factorizations=0, updates=0):
+    nv = ckt.n_nodes - 1
+    results = {'time': time, 'nodes': {}, 'currents': {}}
+    for i, name in enumerate(ckt.node_names[1:]):
+        results['nodes'][f"V({name})"] = xs[:, i]
+    for name, k in zip(ckt.vsources.names, ckt.vsource_branch):
+        results['currents'][name] = xs[:, k] if name in ckt.meters else -xs[:, k]
+    for name, k in zip(ckt.inductors.names, ckt.inductor_branch):
+        results['currents'][name] = xs[:, k]
+    results['summary'] = {'t_stop': float(time[-1]), 'steps': len(time) - 1, 'rejected': rejected, 'factorizations': factorizations, 'updates': updates, 'num_nodes': nv}
+    return results
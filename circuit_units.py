@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Leitura de valores em notação de engenharia (estilo SPICE)
+
+Sufixos: T G MEG/meg k m mil u/µ n p f, sem distinção de caixa, exceto 'M'
+(mega, convenção de esquemático) e 'F' (farad, não femto). Uma unidade
+conhecida pode vir após o sufixo: 10uF, 1kΩ, 16MHz, 2.2mH, 1e-3A.
+"""
+import re
+from decimal import Decimal
+from functools import lru_cache
+
+import numpy as np
+
+EXPONENTS = {'t': 12, 'g': 9, 'meg': 6, 'k': 3, 'm': -3, 'u': -6, 'µ': -6, 'μ': -6, 'n': -9, 'p': -12, 'f': -15}
+MIL = 25.4e-6
+UNITS = frozenset(('', 'ω', 'ohm', 'ohms', 'v', 'vac', 'a', 'f', 'h', 'hz', 's', 'w'))
+VALUE_CACHE_SIZE = 65536
+
+_NUMBER = re.compile(r'([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)(.*)', re.S)
+
+
+def _exponent(suffix):
+    low = suffix.lower()
+    if low[:3] in ('meg', 'mil') and low[3:] in UNITS:
+        return 'mil' if low[:3] == 'mil' else 6
+    head = suffix[:1]
+    if head == 'M' and low[1:] in UNITS:
+        return 6
+    if head and head != 'F' and low[0] in EXPONENTS and low[1:] in UNITS:
+        return EXPONENTS[low[0]]
+    if low in UNITS:
+        return 0
+    return None
+
+
+def parse_quantity(text):
+    if isinstance(text, (int, float)):
+        return float(text)
+    match = _NUMBER.fullmatch(''.join(str(text).split()))
+    exp = _exponent(match.group(2)) if match else None
+    if exp is None:
+        raise ValueError(f"Valor inválido: {text!r}")
+    if exp == 'mil':
+        return float(match.group(1)) * MIL
+    return float(Decimal(match.group(1)).scaleb(exp))
+
+
+@lru_cache(maxsize=VALUE_CACHE_SIZE)
+def parse_value(text):
+    if not text:
+        return 0.0
+    try:
+        return parse_quantity(text)
+    except ValueError:
+        return 0.0
+
+
+def parse_values(values, parse=parse_value):
+    values = values if isinstance(values, (list, tuple)) else list(values)
+    table = {v: parse(v) for v in set(values)}
+    return np.fromiter(map(table.__getitem__, values), dtype=float, count=len(values))
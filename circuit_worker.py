@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Execução de simulações em segundo plano (QThread)
+"""
+import time
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from circuit_solver import SimulationCancelled, SimulationError
+
+
+class SimulationWorker(QThread):
+    progress = pyqtSignal(float)
+    partial = pyqtSignal(object)
+    result = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    PARTIAL_INTERVAL = 0.5
+
+    def __init__(self, analysis, ckt, *args, parent=None):
+        super().__init__(parent)
+        self.analysis = analysis
+        self.ckt = ckt
+        self.args = args
+        self.last_partial = 0.0
+
+    def report(self, fraction, partial=None):
+        if self.isInterruptionRequested():
+            raise SimulationCancelled("Simulação interrompida pelo usuário")
+        self.progress.emit(float(fraction))
+        now = time.monotonic()
+        if partial is not None and now - self.last_partial >= self.PARTIAL_INTERVAL:
+            self.last_partial = now
+            self.partial.emit(partial())
+
+    def run(self):
+        self.last_partial = time.monotonic()
+        try:
+            results = self.analysis(self.ckt, *self.args, progress=self.report)
+        except SimulationCancelled:
+            self.cancelled.emit()
+            return
+        except SimulationError as e:
+            self.failed.emit(str(e))
+            return
+        except Exception as e:
+            self.failed.emit(f"{type(e).__name__}: {e}")
+            return
+        if self.isInterruptionRequested():
+            self.cancelled.emit()
+        else:
+            self.result.emit(results)
@@ -4,20 +4,24 @@
 Dan_simulation_circuit - Simulador Profissional Estilo Multisim
 Versão 2.3
 """
+import time
+
+STARTED = time.perf_counter()
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QMenuBar, QMenu, QToolBar, QDockWidget, QTabWidget, QTreeWidget,
     QTreeWidgetItem, QListWidget, QListWidgetItem, QTextEdit, QLabel,
     QStatusBar, QSplitter, QScrollArea, QFrame, QStyleFactory,
-    QMessageBox, QFileDialog, QInputDialog, QTableWidget, QTableWidgetItem,
-    QHeaderView, QCheckBox, QPushButton, QSizePolicy
+    QMessageBox, QFileDialog, QInputDialog,
+    QHeaderView, QPushButton, QSizePolicy, QProgressBar, QTreeView, QTableView
 )
-from PyQt6.QtCore import Qt, QSize, QMimeData, QTimer, pyqtSignal
+from PyQt6.QtCore import Qt, QEvent, QSize, QMimeData, QTimer, pyqtSignal
 from PyQt6.QtGui import QIcon, QFont, QColor, QAction, QDrag
 import sys
-import json
 import os
+import itertools
+import multiprocessing
 
 from circuit_canvas import CircuitCanvas
 
@@ -61,6 +65,7 @@ class DraggableFrame(QFrame):
 
 class HierarchyTab(QWidget):
     component_selected = pyqtSignal(str)
+    EXPAND_LIMIT = 2000
     
     def __init__(self, canvas):
         super().__init__()
@@ -73,7 +78,7 @@ class HierarchyTab(QWidget):
         layout.setSpacing(5)
         toolbar = QHBoxLayout()
         self.btn_refresh = QPushButton("🔄 Atualizar")
-        self.btn_refresh.clicked.connect(self.refresh)
+        self.btn_refresh.clicked.connect(self.reset)
         self.btn_expand = QPushButton("➕ Expandir Tudo")
         self.btn_expand.clicked.connect(self.expand_all)
         self.btn_collapse = QPushButton("➖ Recolher Tudo")
@@ -83,31 +88,33 @@ class HierarchyTab(QWidget):
         toolbar.addWidget(self.btn_collapse)
         toolbar.addStretch()
         layout.addLayout(toolbar)
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["Componente", "Tipo", "Valor"])
-        self.tree.setColumnCount(3)
-        self.tree.itemClicked.connect(self.on_item_clicked)
+        from circuit_item_models import HierarchyModel
+        self.model = HierarchyModel(self.canvas)
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
+        self.tree.setUniformRowHeights(True)
+        self.tree.clicked.connect(self.on_item_clicked)
         self.tree.header().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
         self.tree.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.model.modelReset.connect(self.expand_groups)
+        self.model.rowsInserted.connect(self.on_rows_inserted)
+        self.expand_groups()
         layout.addWidget(self.tree)
         
-    def refresh(self):
-        self.tree.clear()
-        root = QTreeWidgetItem(self.tree, ["Design1", "", ""])
-        root.setExpanded(True)
-        categories = {}
-        for comp in self.canvas.components:
-            cat = comp.get('category', 'Outros')
-            if cat not in categories:
-                categories[cat] = QTreeWidgetItem(root, [cat, "", ""])
-                categories[cat].setExpanded(True)
-            item = QTreeWidgetItem(categories[cat], [comp.get('name', 'Unknown'), comp.get('type', ''), comp.get('value', '')])
-            item.setData(0, Qt.ItemDataRole.UserRole, comp.get('id'))
-        if self.canvas.connections:
-            conn_root = QTreeWidgetItem(root, ["Conexões", "", f"{len(self.canvas.connections)}"])
-            conn_root.setExpanded(True)
-            for i, conn in enumerate(self.canvas.connections):
-                QTreeWidgetItem(conn_root, [f"Wire_{i+1}", "Fio", ""])
+    def reset(self):
+        self.model.reset()
+    
+    def expand_groups(self):
+        root = self.model.root_index()
+        self.tree.expand(root)
+        self.on_rows_inserted(root, 0, self.model.rowCount(root) - 1)
+    
+    def on_rows_inserted(self, parent, first, last):
+        if parent.isValid() and parent.internalPointer() is None:
+            for row in range(first, last + 1):
+                group = self.model.index(row, 0, parent)
+                if self.model.rowCount(group) <= self.EXPAND_LIMIT:
+                    self.tree.expand(group)
     
     def expand_all(self):
         self.tree.expandAll()
@@ -115,8 +122,8 @@ class HierarchyTab(QWidget):
     def collapse_all(self):
         self.tree.collapseAll()
     
-    def on_item_clicked(self, item, column):
-        comp_id = item.data(0, Qt.ItemDataRole.UserRole)
+    def on_item_clicked(self, index):
+        comp_id = self.model.component_id(index)
         if comp_id:
             self.component_selected.emit(comp_id)
 
@@ -133,7 +140,7 @@ class VisibilityTab(QWidget):
         layout.setSpacing(5)
         toolbar = QHBoxLayout()
         self.btn_refresh = QPushButton("🔄 Atualizar")
-        self.btn_refresh.clicked.connect(self.refresh)
+        self.btn_refresh.clicked.connect(self.reset)
         self.btn_show_all = QPushButton("👁 Mostrar Todos")
         self.btn_show_all.clicked.connect(self.show_all)
         self.btn_hide_all = QPushButton("🚫 Ocultar Todos")
@@ -143,47 +150,24 @@ class VisibilityTab(QWidget):
         toolbar.addWidget(self.btn_hide_all)
         toolbar.addStretch()
         layout.addLayout(toolbar)
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Visível", "Componente", "Tipo", "Valor"])
+        from circuit_item_models import ComponentTableModel
+        self.model = ComponentTableModel(self.canvas)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         layout.addWidget(self.table)
         
-    def refresh(self):
-        self.table.setRowCount(0)
-        for i, comp in enumerate(self.canvas.components):
-            self.table.insertRow(i)
-            checkbox = QCheckBox()
-            checkbox.setChecked(comp.get('visible', True))
-            checkbox.stateChanged.connect(lambda state, idx=i: self.toggle_visibility(idx, state))
-            widget = QWidget()
-            lo = QHBoxLayout(widget)
-            lo.addWidget(checkbox)
-            lo.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            lo.setContentsMargins(0, 0, 0, 0)
-            self.table.setCellWidget(i, 0, widget)
-            self.table.setItem(i, 1, QTableWidgetItem(comp.get('name', 'Unknown')))
-            self.table.setItem(i, 2, QTableWidgetItem(comp.get('type', '')))
-            self.table.setItem(i, 3, QTableWidgetItem(comp.get('value', '')))
-    
-    def toggle_visibility(self, index, state):
-        if index < len(self.canvas.components):
-            self.canvas.components[index]['visible'] = (state == Qt.CheckState.Checked.value)
-            self.canvas.update()
+    def reset(self):
+        self.model.reset()
     
     def show_all(self):
-        for comp in self.canvas.components:
-            comp['visible'] = True
-        self.refresh()
-        self.canvas.update()
+        self.canvas.set_visible(self.canvas.components, True)
     
     def hide_all(self):
-        for comp in self.canvas.components:
-            comp['visible'] = False
-        self.refresh()
-        self.canvas.update()
+        self.canvas.set_visible(self.canvas.components, False)
 
 
 class ProjectViewTab(QWidget):
@@ -227,6 +211,7 @@ class ProjectViewTab(QWidget):
         info.append("─" * 60)
         info.append(f"  • Total de Componentes: {len(self.canvas.components)}")
         info.append(f"  • Total de Conexões: {len(self.canvas.connections)}")
+        info.append(f"  • Total de Nós: {len(self.canvas.nets.nets())}")
         info.append("")
         type_count = {}
         for comp in self.canvas.components:
@@ -254,9 +239,13 @@ class ProjectViewTab(QWidget):
 
 
 class NetlistTab(QWidget):
+    status_message = pyqtSignal(str)
+    PREVIEW_LINES = 5000
+    
     def __init__(self, canvas):
         super().__init__()
         self.canvas = canvas
+        self.worker = None
         self.setup_ui()
         
     def setup_ui(self):
@@ -282,8 +271,10 @@ class NetlistTab(QWidget):
         layout.addWidget(self.netlist_text)
         
     def generate_netlist(self):
-        netlist = self.canvas.get_netlist()
-        self.netlist_text.setText(netlist)
+        lines = list(itertools.islice(self.canvas.iter_netlist(), self.PREVIEW_LINES + 1))
+        if len(lines) > self.PREVIEW_LINES:
+            lines[-1] = f"* ... netlist truncado em {self.PREVIEW_LINES} linhas; use 'Exportar .cir' para o arquivo completo"
+        self.netlist_text.setPlainText("\n".join(lines))
     
     def copy_netlist(self):
         text = self.netlist_text.toPlainText()
@@ -293,16 +284,45 @@ class NetlistTab(QWidget):
     
     def export_netlist(self):
         filename, _ = QFileDialog.getSaveFileName(self, "Exportar Netlist", "circuit.cir", "SPICE Netlist (*.cir);;Text (*.txt)")
-        if filename:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(self.netlist_text.toPlainText())
-            QMessageBox.information(self, "Sucesso", f"Netlist exportado para:\n{filename}")
+        if not filename:
+            return
+        if self.worker is not None:
+            self.status_message.emit("Já existe uma exportação em andamento.")
+            return
+        from circuit_netlist import export_netlist
+        from circuit_worker import SimulationWorker
+        components, nets = self.canvas.netlist_snapshot()
+        self.worker = SimulationWorker(export_netlist, filename, components, nets, self.canvas.parse_value, parent=self)
+        self.worker.result.connect(self.on_exported)
+        self.worker.failed.connect(self.on_export_failed)
+        self.worker.finished.connect(self.on_export_finished)
+        self.btn_export.setEnabled(False)
+        self.status_message.emit("Exportando netlist...")
+        self.worker.start()
+    
+    def on_exported(self, filename):
+        self.status_message.emit(f"Netlist exportado: {filename}")
+        QMessageBox.information(self, "Sucesso", f"Netlist exportado para:\n{filename}")
+    
+    def on_export_failed(self, message):
+        self.status_message.emit("Exportação do netlist falhou.")
+        QMessageBox.critical(self, "Erro", f"Erro ao exportar netlist:\n{message}")
+    
+    def on_export_finished(self):
+        self.worker.deleteLater()
+        self.worker = None
+        self.btn_export.setEnabled(True)
 
 
 class SimulationTab(QWidget):
+    status_message = pyqtSignal(str)
+    
     def __init__(self, canvas):
         super().__init__()
         self.canvas = canvas
+        self.worker = None
+        self.show_results = None
+        self.done_message = None
         self.setup_ui()
         
     def setup_ui(self):
@@ -313,14 +333,24 @@ class SimulationTab(QWidget):
         self.btn_run = QPushButton("▶ Executar Simulação")
         self.btn_run.setStyleSheet("background-color: #2e7d32; color: white; font-weight: bold; padding: 8px 16px;")
         self.btn_run.clicked.connect(self.run_simulation)
+        self.btn_stop = QPushButton("⏹ Parar")
+        self.btn_stop.setEnabled(False)
+        self.btn_stop.clicked.connect(self.stop)
         self.btn_clear = QPushButton("🗑 Limpar")
         self.btn_clear.clicked.connect(self.clear_results)
         self.btn_export = QPushButton("💾 Exportar Resultados")
         self.btn_export.clicked.connect(self.export_results)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.hide()
         toolbar.addWidget(self.btn_run)
+        toolbar.addWidget(self.btn_stop)
         toolbar.addWidget(self.btn_clear)
         toolbar.addWidget(self.btn_export)
         toolbar.addStretch()
+        toolbar.addWidget(self.progress_bar)
         layout.addLayout(toolbar)
         self.results_text = QTextEdit()
         self.results_text.setReadOnly(True)
@@ -330,8 +360,85 @@ class SimulationTab(QWidget):
         self.results_text.setMinimumHeight(100)
         layout.addWidget(self.results_text)
         
+    def is_running(self):
+        return self.worker is not None and self.worker.isRunning()
+    
+    def start(self, analysis, args, show, done):
+        if self.is_running():
+            self.status_message.emit("Já existe uma simulação em andamento.")
+            return False
+        from circuit_solver import SimulationError
+        try:
+            ckt = self.canvas.compile()
+            if callable(args):
+                args = args()
+        except SimulationError as e:
+            QMessageBox.critical(self, "Erro", f"Erro na simulação:\n{str(e)}")
+            return False
+        from circuit_worker import SimulationWorker
+        self.show_results, self.done_message = show, done
+        self.worker = SimulationWorker(analysis, ckt, *args, parent=self)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.partial.connect(self.on_partial)
+        self.worker.result.connect(self.on_result)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.cancelled.connect(self.on_cancelled)
+        self.worker.finished.connect(self.on_finished)
+        self.btn_run.setEnabled(False)
+        self.btn_stop.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.worker.start()
+        self.status_message.emit("Simulação em andamento...")
+        return True
+    
+    def stop(self):
+        if self.is_running():
+            self.worker.requestInterruption()
+            self.status_message.emit("Interrompendo simulação...")
+    
+    def on_progress(self, fraction):
+        self.progress_bar.setValue(int(fraction * 1000))
+    
+    def on_partial(self, results):
+        self.show_results(results)
+    
+    def on_result(self, results):
+        self.show_results(results)
+        self.status_message.emit(self.done_message(results))
+    
+    def on_failed(self, message):
+        QMessageBox.critical(self, "Erro", f"Erro na simulação:\n{message}")
+        self.status_message.emit("Simulação falhou.")
+    
+    def on_cancelled(self):
+        self.status_message.emit("Simulação interrompida.")
+    
+    def on_finished(self):
+        self.worker.deleteLater()
+        self.worker = None
+        self.btn_run.setEnabled(True)
+        self.btn_stop.setEnabled(False)
+        self.progress_bar.hide()
+    
     def run_simulation(self):
-        results = self.canvas.simulate()
+        from circuit_solver import analyze_dc
+        # o sistema MNA fica no canvas entre execuções: repetir a análise não refaz padrão nem fatoração
+        return self.start(analyze_dc, lambda: (self.canvas.mna_system('dc'),), self.show_dc, lambda results: "Simulação DC concluída.")
+    
+    def run_ac(self, freqs):
+        from circuit_ac import simulate_ac
+        return self.start(simulate_ac, (freqs,), self.show_ac, lambda results: f"Análise AC concluída: {results['summary']['points']} pontos.")
+    
+    def run_transient(self, t_stop):
+        from circuit_transient import simulate_transient
+        return self.start(simulate_transient, (t_stop,), self.show_transient, lambda results: f"Análise transiente concluída: {results['summary']['steps']} passos.")
+    
+    def run_monte_carlo(self, tolerances, runs):
+        from circuit_sweep import monte_carlo
+        return self.start(monte_carlo, (tolerances, runs), self.show_monte_carlo, lambda results: f"Monte Carlo concluído: {results['summary']['runs']} execuções.")
+    
+    def show_dc(self, results):
         output = []
         output.append("=" * 70)
         output.append("              RESULTADOS DA SIMULAÇÃO DC")
@@ -416,8 +523,81 @@ class SimulationTab(QWidget):
             output.append("")
         output.append("=" * 70)
         output.append("  ✅ Simulação concluída com sucesso!")
-        output.append(f"  📊 Componentes analisados: {len(self.canvas.components)}")
-        output.append(f"  🔗 Conexões: {len(self.canvas.connections)}")
+        output.append(f"  📊 Componentes analisados: {results['summary']['num_components']}")
+        output.append(f"  🔗 Conexões: {results['summary']['num_connections']}")
+        output.append("=" * 70)
+        self.results_text.setText("\n".join(output))
+    
+    def show_transient(self, results):
+        summary = results['summary']
+        output = []
+        output.append("=" * 70)
+        output.append("              RESULTADOS DA ANÁLISE TRANSIENTE")
+        output.append("              Dan_simulation_circuit v2.3")
+        output.append("=" * 70)
+        output.append("")
+        output.append(f"  Tempo final: {summary['t_stop']:g} s   Passos: {summary['steps']}   Rejeitados: {summary['rejected']}   Fatorações: {summary['factorizations']} (+{summary['updates']} atualizações de posto baixo)")
+        output.append("")
+        for title, key, unit in (("📊 TENSÕES NODAIS (final / mín / máx)", 'nodes', 'V'), ("⚡ CORRENTES (final / mín / máx)", 'currents', 'A')):
+            if not results[key]:
+                continue
+            output.append("┌" + "─" * 68 + "┐")
+            line = f"│  {title}"
+            output.append(line + " " * (69 - len(line)) + "│")
+            output.append("├" + "─" * 68 + "┤")
+            for name, wave in results[key].items():
+                label = name if key == 'nodes' else f"I({name})"
+                line = f"│    {label} = {wave[-1]:10.4g} / {wave.min():10.4g} / {wave.max():10.4g} {unit}"
+                output.append(line + " " * (69 - len(line)) + "│")
+            output.append("└" + "─" * 68 + "┘")
+            output.append("")
+        output.append("=" * 70)
+        self.results_text.setText("\n".join(output))
+    
+    def show_ac(self, results):
+        import numpy as np
+        summary = results['summary']
+        freqs = results['frequency']
+        output = []
+        output.append("=" * 70)
+        output.append("              RESULTADOS DA ANÁLISE AC")
+        output.append("              Dan_simulation_circuit v2.3")
+        output.append("=" * 70)
+        output.append("")
+        output.append(f"  Faixa: {summary['f_start']:g} Hz a {summary['f_stop']:g} Hz   Pontos: {summary['points']}")
+        output.append("")
+        output.append("┌" + "─" * 68 + "┐")
+        output.append("│  📈 GANHO (dB) inicial / final / pico @ frequência                  │")
+        output.append("├" + "─" * 68 + "┤")
+        for name, wave in results['nodes'].items():
+            mag = 20 * np.log10(np.maximum(np.abs(wave), 1e-30))
+            peak = int(np.argmax(mag))
+            line = f"│    {name} = {mag[0]:8.2f} / {mag[-1]:8.2f} / {mag[peak]:8.2f} @ {freqs[peak]:.4g} Hz"
+            output.append(line + " " * (69 - len(line)) + "│")
+        output.append("└" + "─" * 68 + "┘")
+        output.append("")
+        output.append("=" * 70)
+        self.results_text.setText("\n".join(output))
+    
+    def show_monte_carlo(self, results):
+        summary = results['summary']
+        output = []
+        output.append("=" * 70)
+        output.append("              RESULTADOS DA ANÁLISE MONTE CARLO")
+        output.append("              Dan_simulation_circuit v2.3")
+        output.append("=" * 70)
+        output.append("")
+        output.append(f"  Execuções: {summary['runs']}   Falhas: {summary['failed']}   Processos: {summary['workers']}   Parâmetros: {len(results['parameters'])}")
+        output.append("")
+        if 'mean' in results:
+            output.append("┌" + "─" * 68 + "┐")
+            output.append("│  📊 MÉDIA / DESVIO PADRÃO / MÍN / MÁX                               │")
+            output.append("├" + "─" * 68 + "┤")
+            for name, mean, sigma, lo, hi in zip(results['outputs'], results['mean'], results['sigma'], results['min'], results['max']):
+                line = f"│    {name} = {mean:10.4g} ± {sigma:9.3g}  [{lo:10.4g}, {hi:10.4g}]"
+                output.append(line + " " * (69 - len(line)) + "│")
+            output.append("└" + "─" * 68 + "┘")
+            output.append("")
         output.append("=" * 70)
         self.results_text.setText("\n".join(output))
     
@@ -438,22 +618,73 @@ class SimulationTab(QWidget):
 
 class DanSimulationCircuit(QMainWindow):
     VERSION = "2.3"
+    TABS = (
+        ('hierarchy', "📊 Hierarchy", HierarchyTab), ('visibility', "👁 Visibility", VisibilityTab),
+        ('project', "📁 Project View", ProjectViewTab), ('netlist', "📝 Netlist", NetlistTab),
+        ('simulation', "⚡ Simulation", SimulationTab),
+    )
+    TAB_NAMES = tuple(name for name, _, _ in TABS)
     
-    def __init__(self):
+    def __init__(self, benchmark=False):
+        self.created = time.perf_counter()
         super().__init__()
         self.setWindowTitle("Design1 - Dan_simulation_circuit [Design1]")
         self.setGeometry(100, 50, 1600, 950)
+        self.benchmark = benchmark
         self.circuit_canvas = CircuitCanvas()
+        self.circuit_canvas.installEventFilter(self)
         self.create_central_widget()
         self.create_menubar()
         self.create_toolbars()
         self.create_docks()
         self.create_statusbar()
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.auto_refresh_tabs)
-        self.update_timer.start(2000)
+        self.circuit_canvas.circuit_changed.connect(self.on_circuit_changed)
+        self.circuit_canvas.view_changed.connect(self.on_view_changed)
+        self.circuit_canvas.live_failed.connect(self.show_status)
+        self.journal = None
+        self.window_built = time.perf_counter()
         self.show()
     
+    def eventFilter(self, obj, event):
+        if obj is self.circuit_canvas and event.type() == QEvent.Type.Paint:
+            self.circuit_canvas.removeEventFilter(self)
+            QTimer.singleShot(0, self.finish_startup)
+        return False
+    
+    def finish_startup(self):
+        first_paint = time.perf_counter()
+        from circuit_journal import Journal
+        self.journal = Journal(os.path.join(os.path.expanduser('~'), '.dan_simulation_circuit'))
+        self.recover_autosave()
+        self.circuit_canvas.journal = self.journal
+        self.journal.start(self.circuit_canvas.components, self.circuit_canvas.connections, self.circuit_canvas.component_counter)
+        self.populate_docks()
+        self.on_tab_changed(self.bottom_tabs.currentIndex())
+        if self.benchmark:
+            ready = time.perf_counter()
+            print(f"imports e QApplication: {(self.created - STARTED) * 1000:.0f} ms")
+            print(f"janela: {(self.window_built - STARTED) * 1000:.0f} ms")
+            print(f"primeira pintura: {(first_paint - STARTED) * 1000:.0f} ms")
+            print(f"interface completa: {(ready - STARTED) * 1000:.0f} ms")
+            self.close()
+    
+    def tab(self, name):
+        tab = self.tabs.get(name)
+        if tab is None:
+            index = self.TAB_NAMES.index(name)
+            tab = self.tabs[name] = self.TABS[index][2](self.circuit_canvas)
+            if hasattr(tab, 'component_selected'):
+                tab.component_selected.connect(self.select_component_by_id)
+            if hasattr(tab, 'status_message'):
+                tab.status_message.connect(self.show_status)
+            self.bottom_tabs.widget(index).layout().addWidget(tab)
+        return tab
+    
+    def show_tab(self, name):
+        tab = self.tab(name)
+        self.bottom_tabs.setCurrentIndex(self.TAB_NAMES.index(name))
+        return tab
+    
     def create_menubar(self):
         menubar = self.menuBar()
         menubar.setFont(QFont("Arial", 10))
@@ -471,6 +702,10 @@ class DanSimulationCircuit(QMainWindow):
         edit_menu.addAction("Undo", self.circuit_canvas.undo)
         edit_menu.addAction("Redo", self.circuit_canvas.redo)
         edit_menu.addSeparator()
+        edit_menu.addAction("Cut", self.circuit_canvas.cut_selected)
+        edit_menu.addAction("Copy", self.circuit_canvas.copy_selected)
+        edit_menu.addAction("Paste", self.circuit_canvas.paste)
+        edit_menu.addSeparator()
         edit_menu.addAction("Select All", self.circuit_canvas.select_all)
         edit_menu.addAction("Deselect All", self.circuit_canvas.clear_selection)
         edit_menu.addSeparator()
@@ -496,8 +731,13 @@ class DanSimulationCircuit(QMainWindow):
         simulate_menu.addAction("Run DC Analysis", self.run_simulation)
         simulate_menu.addAction("Run AC Analysis", self.run_ac_simulation)
         simulate_menu.addAction("Run Transient", self.run_transient)
+        simulate_menu.addAction("Monte Carlo...", self.run_monte_carlo)
         simulate_menu.addSeparator()
-        simulate_menu.addAction("Stop")
+        self.live_action = simulate_menu.addAction("Interactive Simulation")
+        self.live_action.setCheckable(True)
+        self.live_action.toggled.connect(self.toggle_live)
+        simulate_menu.addSeparator()
+        simulate_menu.addAction("Stop", self.stop_simulation)
         tools_menu = menubar.addMenu("Tools")
         tools_menu.addAction("Clear Canvas", self.circuit_canvas.clear)
         tools_menu.addAction("Auto-arrange", self.circuit_canvas.auto_arrange)
@@ -523,7 +763,8 @@ class DanSimulationCircuit(QMainWindow):
         self.main_toolbar.addAction("🔍- Zoom Out", lambda: self.circuit_canvas.zoom(0.8))
         self.main_toolbar.addSeparator()
         self.main_toolbar.addAction("▶ Simulate", self.run_simulation)
-        self.main_toolbar.addAction("⏹ Stop")
+        self.main_toolbar.addAction("⏹ Stop", self.stop_simulation)
+        self.main_toolbar.addAction(self.live_action)
         self.main_toolbar.addSeparator()
         self.main_toolbar.addAction("🔌 Wire", self.circuit_canvas.start_wire_mode)
         self.main_toolbar.addAction("🗑 Clear", self.circuit_canvas.clear)
@@ -542,18 +783,12 @@ class DanSimulationCircuit(QMainWindow):
         self.bottom_tabs = QTabWidget()
         self.bottom_tabs.setMinimumHeight(150)
         self.bottom_tabs.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.hierarchy_tab = HierarchyTab(self.circuit_canvas)
-        self.visibility_tab = VisibilityTab(self.circuit_canvas)
-        self.project_tab = ProjectViewTab(self.circuit_canvas)
-        self.netlist_tab = NetlistTab(self.circuit_canvas)
-        self.simulation_tab = SimulationTab(self.circuit_canvas)
-        self.bottom_tabs.addTab(self.hierarchy_tab, "📊 Hierarchy")
-        self.bottom_tabs.addTab(self.visibility_tab, "👁 Visibility")
-        self.bottom_tabs.addTab(self.project_tab, "📁 Project View")
-        self.bottom_tabs.addTab(self.netlist_tab, "📝 Netlist")
-        self.bottom_tabs.addTab(self.simulation_tab, "⚡ Simulation")
+        self.tabs = {}
+        for _, title, _ in self.TABS:
+            page = QWidget()
+            QVBoxLayout(page).setContentsMargins(0, 0, 0, 0)
+            self.bottom_tabs.addTab(page, title)
         self.bottom_tabs.currentChanged.connect(self.on_tab_changed)
-        self.hierarchy_tab.component_selected.connect(self.select_component_by_id)
         self.main_splitter.addWidget(self.bottom_tabs)
         self.main_splitter.setStretchFactor(0, 7)
         self.main_splitter.setStretchFactor(1, 3)
@@ -562,10 +797,18 @@ class DanSimulationCircuit(QMainWindow):
         layout.addWidget(self.main_splitter)
     
     def create_docks(self):
-        left_dock = QDockWidget("Design Toolbox")
-        left_dock.setMinimumWidth(180)
-        left_dock.setMaximumWidth(280)
-        left_dock.setFeatures(QDockWidget.DockWidgetFeature.DockWidgetMovable)
+        self.left_dock = QDockWidget("Design Toolbox")
+        self.left_dock.setMinimumWidth(180)
+        self.left_dock.setMaximumWidth(280)
+        self.left_dock.setFeatures(QDockWidget.DockWidgetFeature.DockWidgetMovable)
+        self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.left_dock)
+        self.right_dock = QDockWidget("Quick Components")
+        self.right_dock.setMinimumWidth(70)
+        self.right_dock.setMaximumWidth(90)
+        self.right_dock.setFeatures(QDockWidget.DockWidgetFeature.DockWidgetMovable)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.right_dock)
+    
+    def populate_docks(self):
         left_widget = QWidget()
         left_layout = QVBoxLayout(left_widget)
         left_layout.setContentsMargins(5, 5, 5, 5)
@@ -612,12 +855,7 @@ class DanSimulationCircuit(QMainWindow):
         for i in range(root.childCount()):
             root.child(i).setExpanded(True)
         left_layout.addWidget(self.tree)
-        left_dock.setWidget(left_widget)
-        self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, left_dock)
-        right_dock = QDockWidget("Quick Components")
-        right_dock.setMinimumWidth(70)
-        right_dock.setMaximumWidth(90)
-        right_dock.setFeatures(QDockWidget.DockWidgetFeature.DockWidgetMovable)
+        self.left_dock.setWidget(left_widget)
         right_widget = QWidget()
         right_layout = QVBoxLayout(right_widget)
         right_layout.setContentsMargins(3, 3, 3, 3)
@@ -643,8 +881,7 @@ class DanSimulationCircuit(QMainWindow):
             layout_frame.addWidget(lbl)
             right_layout.addWidget(btn)
         right_layout.addStretch()
-        right_dock.setWidget(right_widget)
-        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, right_dock)
+        self.right_dock.setWidget(right_widget)
     
     def create_statusbar(self):
         self.status = self.statusBar()
@@ -658,21 +895,24 @@ class DanSimulationCircuit(QMainWindow):
         self.status.addPermanentWidget(self.zoom_label)
     
     def on_tab_changed(self, index):
-        tab = self.bottom_tabs.widget(index)
+        tab = self.tab(self.TAB_NAMES[index])
         if hasattr(tab, 'refresh'):
             tab.refresh()
     
-    def auto_refresh_tabs(self):
+    def on_circuit_changed(self):
         self.comp_count_label.setText(f"Componentes: {len(self.circuit_canvas.components)}")
         self.conn_count_label.setText(f"Conexões: {len(self.circuit_canvas.connections)}")
+        if self.TAB_NAMES[self.bottom_tabs.currentIndex()] == 'project':
+            self.tab('project').refresh()
+    
+    def on_view_changed(self):
         self.zoom_label.setText(f"Zoom: {int(self.circuit_canvas.zoom_level * 100)}%")
     
     def select_component_by_id(self, comp_id):
-        for comp in self.circuit_canvas.components:
-            if comp.get('id') == comp_id:
-                self.circuit_canvas.selected_component = comp
-                self.circuit_canvas.update()
-                break
+        comp = self.circuit_canvas.get_component_by_id(comp_id)
+        if comp:
+            self.circuit_canvas.selected_component = comp
+            self.circuit_canvas.update()
     
     def quick_place(self, comp_type):
         self.circuit_canvas.add_component(comp_type, 400, 300)
@@ -685,17 +925,14 @@ class DanSimulationCircuit(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             self.save_project()
         self.circuit_canvas.clear()
-        self.refresh_all_tabs()
         self.status.showMessage("Novo projeto criado.")
     
     def open_project(self):
         filename, _ = QFileDialog.getOpenFileName(self, "Abrir Projeto", "", "Dan Circuit (*.dsc);;JSON (*.json);;Todos (*.*)")
         if filename:
+            from circuit_project import read_project
             try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                self.circuit_canvas.load_circuit_data(data)
-                self.refresh_all_tabs()
+                self.circuit_canvas.set_circuit(*read_project(filename))
                 self.status.showMessage(f"Projeto carregado: {filename}")
             except Exception as e:
                 QMessageBox.critical(self, "Erro", f"Erro ao carregar:\n{str(e)}")
@@ -703,10 +940,10 @@ class DanSimulationCircuit(QMainWindow):
     def save_project(self):
         filename, _ = QFileDialog.getSaveFileName(self, "Salvar Projeto", "circuit.dsc", "Dan Circuit (*.dsc);;JSON (*.json)")
         if filename:
+            from circuit_project import write_project
             try:
-                data = self.circuit_canvas.get_circuit_data()
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
+                canvas = self.circuit_canvas
+                write_project(filename, canvas.components, canvas.connections, canvas.component_counter)
                 self.status.showMessage(f"Projeto salvo: {filename}")
             except Exception as e:
                 QMessageBox.critical(self, "Erro", f"Erro ao salvar:\n{str(e)}")
@@ -715,8 +952,7 @@ class DanSimulationCircuit(QMainWindow):
         self.save_project()
     
     def export_netlist(self):
-        self.netlist_tab.generate_netlist()
-        self.netlist_tab.export_netlist()
+        self.tab('netlist').export_netlist()
     
     def export_image(self):
         filename, _ = QFileDialog.getSaveFileName(self, "Exportar Imagem", "circuit.png", "PNG (*.png);;JPEG (*.jpg);;BMP (*.bmp)")
@@ -726,20 +962,82 @@ class DanSimulationCircuit(QMainWindow):
             self.status.showMessage(f"Imagem exportada: {filename}")
     
     def run_simulation(self):
-        self.bottom_tabs.setCurrentWidget(self.simulation_tab)
-        self.simulation_tab.run_simulation()
-        self.status.showMessage("Simulação DC concluída.")
+        self.show_tab('simulation').run_simulation()
     
     def run_ac_simulation(self):
-        QMessageBox.information(self, "Simulação AC", "Simulação AC será implementada em versão futura.")
+        text, ok = QInputDialog.getText(self, "Simulação AC", "Varredura (DEC|OCT|LIN pontos f_inicial f_final):", text="DEC 20 10 100k")
+        if not ok:
+            return
+        from circuit_ac import parse_sweep
+        from circuit_solver import SimulationError
+        try:
+            freqs = parse_sweep(text, self.circuit_canvas.parse_value)
+        except SimulationError as e:
+            QMessageBox.critical(self, "Erro", f"Erro na simulação:\n{str(e)}")
+            return
+        self.show_tab('simulation').run_ac(freqs)
     
     def run_transient(self):
-        QMessageBox.information(self, "Transiente", "Análise transiente será implementada em versão futura.")
+        text, ok = QInputDialog.getText(self, "Transiente", "Tempo final (s):", text="10m")
+        if not ok:
+            return
+        t_stop = self.circuit_canvas.parse_value(text)
+        if t_stop <= 0:
+            QMessageBox.critical(self, "Erro", "Erro na simulação:\nTempo final da análise transiente deve ser positivo")
+            return
+        self.show_tab('simulation').run_transient(t_stop)
+    
+    def show_status(self, message):
+        self.status.showMessage(message)
+    
+    def run_monte_carlo(self):
+        text, ok = QInputDialog.getText(self, "Monte Carlo", "Execuções e tolerância de R/L/C (ex.: 1000 5%):", text="1000 5%")
+        if not ok:
+            return
+        parts = text.replace('%', '').split()
+        try:
+            runs, tol = int(parts[0]), float(parts[1]) / 100
+        except (IndexError, ValueError):
+            QMessageBox.critical(self, "Erro", "Formato esperado: <execuções> <tolerância %>")
+            return
+        tolerances = {c['name']: tol for c in self.circuit_canvas.components if c['type'] in ('resistor', 'capacitor', 'indutor')}
+        if not tolerances or runs < 1:
+            QMessageBox.warning(self, "Aviso", "Nenhum resistor, capacitor ou indutor para variar.")
+            return
+        self.show_tab('simulation').run_monte_carlo(tolerances, runs)
+    
+    def toggle_live(self, enabled):
+        self.circuit_canvas.set_live(enabled)
+        self.status.showMessage("Simulação interativa ativa: clique em chaves e use a roda sobre potenciômetros." if enabled else "Simulação interativa desativada.")
+    
+    def stop_simulation(self):
+        tab = self.tabs.get('simulation')
+        if tab is not None:
+            tab.stop()
+    
+    def recover_autosave(self):
+        if not self.journal.exists():
+            return
+        reply = QMessageBox.question(self, "Recuperar Projeto", "O programa não foi encerrado corretamente. Deseja recuperar o trabalho não salvo?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        try:
+            self.circuit_canvas.set_circuit(*self.journal.recover())
+            self.status.showMessage("Trabalho não salvo recuperado.")
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Erro ao recuperar:\n{str(e)}")
     
-    def refresh_all_tabs(self):
-        self.hierarchy_tab.refresh()
-        self.visibility_tab.refresh()
-        self.project_tab.refresh()
+    def closeEvent(self, event):
+        for name in ('simulation', 'netlist'):
+            tab = self.tabs.get(name)
+            worker = tab.worker if tab is not None else None
+            if worker is not None:
+                worker.requestInterruption()
+                worker.wait()
+        self.circuit_canvas.set_live(False)
+        if self.journal is not None:
+            self.journal.close()
+        super().closeEvent(event)
     
     def show_about(self):
         QMessageBox.about(self, "Sobre Dan_simulation_circuit", f"<h2>Dan_simulation_circuit</h2><p>Versão {self.VERSION}</p><p>Simulador de circuitos eletrônicos profissional.</p><p>© 2025 Daniel - MJSP</p>")
@@ -785,9 +1083,10 @@ def main():
         QSplitter::handle:hover { background-color: #00aaff; }
         QSplitter::handle:vertical { height: 8px; }
     """)
-    window = DanSimulationCircuit()
+    window = DanSimulationCircuit('--benchmark-startup' in sys.argv)
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
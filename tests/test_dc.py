@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Testes do custo de soluções DC repetidas
+"""
+import pytest
+
+from circuit_components import Component, Connection
+from circuit_nets import NetIndex
+from circuit_solver import MnaSystem, analyze_dc, compile_circuit, update_circuit
+from circuit_units import parse_value
+
+
+def ladder(stages):
+    comps = [Component('v', 'voltage_source', 'V1', 0, 0, value='10'), Component('g', 'gnd', 'GND1', 0, 0)]
+    conns = [Connection('w', 'v', 1, 'g', 0)]
+    prev = ('v', 0)
+    for i in range(stages):
+        comps += [
+            Component(f's{i}', 'resistor', f'RS{i}', 0, 0, value='100'),
+            Component(f'p{i}', 'resistor', f'RP{i}', 0, 0, value='1k'),
+        ]
+        conns += [Connection(f'a{i}', *prev, f's{i}', 0), Connection(f'b{i}', f's{i}', 1, f'p{i}', 0), Connection(f'c{i}', f'p{i}', 1, 'g', 0)]
+        prev = (f's{i}', 1)
+    nets = NetIndex()
+    nets.rebuild(comps, conns)
+    return comps, nets, compile_circuit(comps, conns, parse_value, nets)
+
+
+def test_repeated_solves_reuse_the_factorization():
+    comps, nets, ckt = ladder(5000)
+    system = MnaSystem(ckt)
+    first = analyze_dc(ckt, system)
+    factorizations = system.pattern.factorizations
+    for _ in range(3):
+        assert analyze_dc(ckt, system)['currents'] == first['currents']
+    # um sistema novo da mesma topologia reaproveita padrão, ordenação e fatoração
+    again = MnaSystem(ckt)
+    assert again.pattern is system.pattern
+    analyze_dc(ckt, again)
+    assert system.pattern.factorizations == factorizations
+    assert first['currents']['RS0'] == pytest.approx(first['currents']['V1'])
+
+
+def test_value_edit_is_a_low_rank_update():
+    comps, nets, ckt = ladder(5000)
+    system = MnaSystem(ckt)
+    analyze_dc(ckt, system)
+    factorizations, updates = system.pattern.factorizations, system.pattern.updates
+    comps[2]['value'] = '220'
+    ckt = update_circuit(ckt, [comps[2]], nets, parse_value)
+    system.restamp(ckt)
+    result = analyze_dc(ckt, system)
+    assert system.pattern.factorizations == factorizations
+    assert system.pattern.updates == updates + 1
+    assert result['voltages']['RS0'] == pytest.approx(220 * result['currents']['RS0'])
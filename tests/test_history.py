@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Testes do histórico de desfazer/refazer
+"""
+from circuit_components import Component
+from circuit_history import History, SetFields
+
+
+class FieldCanvas:
+    def set_fields(self, comp, fields):
+        for key, value in fields.items():
+            comp[key] = value
+
+
+def test_first_toggle_is_undoable():
+    canvas, history = FieldCanvas(), History(10_000)
+    relay = Component('k', 'relay', 'K1', 0, 0)
+    history.push(canvas, SetFields(relay, {'closed': True}, defaults={'closed': False}))
+    assert relay['closed'] is True
+    assert history.undo(canvas)
+    assert relay['closed'] is False
+    assert history.redo(canvas)
+    assert relay['closed'] is True
+
+
+def test_merged_wiper_drag_restores_the_default():
+    canvas, history = FieldCanvas(), History(10_000)
+    pot = Component('p', 'potentiometer', 'P1', 0, 0)
+    for wiper in (0.6, 0.7, 0.8):
+        history.push(canvas, SetFields(pot, {'wiper': wiper}, ('wiper', 'p'), {'wiper': 0.5}))
+    assert len(history.undo_stack) == 1
+    history.undo(canvas)
+    assert pot['wiper'] == 0.5
+
+
+def test_merge_growth_is_charged_to_the_budget():
+    canvas, history = FieldCanvas(), History(10_000)
+    comp = Component('r', 'resistor', 'R1', 0, 0)
+    history.push(canvas, SetFields(comp, {'value': '1k'}, 'edit'))
+    history.push(canvas, SetFields(comp, {'x': 10, 'y': 20}, 'edit'))
+    assert len(history.undo_stack) == 1
+    assert history.used == history.undo_stack[-1].size()
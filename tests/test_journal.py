@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Testes do diário de autosave
+"""
+from circuit_components import Component
+from circuit_journal import Journal
+
+
+def started(directory, name):
+    journal = Journal(str(directory))
+    journal.start([Component(name, 'resistor', name, 0, 0, value='1k')], [], {'R': 1})
+    return journal
+
+
+def test_running_instances_do_not_share_files(tmp_path):
+    first = started(tmp_path, 'R1')
+    second = started(tmp_path, 'R2')
+    assert first.snapshot_path != second.snapshot_path
+    probe = Journal(str(tmp_path))
+    assert not probe.exists()
+    probe.close()
+    second.close()
+    first.close()
+    assert not any(tmp_path.iterdir())
+
+
+def test_only_orphaned_sessions_are_recovered(tmp_path):
+    running = started(tmp_path, 'R1')
+    crashed = started(tmp_path, 'R2')
+    crashed.close(discard=False)
+    recovering = Journal(str(tmp_path))
+    assert recovering.exists()
+    components, _, _ = recovering.recover()
+    assert [c['name'] for c in components] == ['R2']
+    # uma terceira instância aberta ao mesmo tempo não recupera a mesma sessão
+    probe = Journal(str(tmp_path))
+    assert not probe.exists()
+    probe.close()
+    recovering.start([], [], {})
+    recovering.close()
+    running.close()
+    assert not any(tmp_path.iterdir())
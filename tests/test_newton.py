@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Testes da limitação de passo do Newton-Raphson
+"""
+import numpy as np
+
+from circuit_components import Component, Connection
+from circuit_nets import NetIndex
+from circuit_solver import MnaSystem, compile_circuit
+from circuit_units import parse_value
+
+
+def build(comps, conns):
+    nets = NetIndex()
+    nets.rebuild(comps, conns)
+    return compile_circuit(comps, conns, parse_value, nets)
+
+
+def bjt_chain(stages):
+    # emissor comum em cascata: cada coletor polariza a base do estágio seguinte
+    comps = [
+        Component('vcc', 'voltage_source', 'VCC', 0, 0, value='12'),
+        Component('vin', 'voltage_source', 'VIN', 0, 0, value='0.7'),
+        Component('g', 'gnd', 'GND1', 0, 0),
+    ]
+    conns = [Connection('a', 'vcc', 1, 'g', 0), Connection('b', 'vin', 1, 'g', 0)]
+    prev = ('vin', 0)
+    for i in range(stages):
+        q, rb, rc = f'q{i}', f'rb{i}', f'rc{i}'
+        comps += [
+            Component(q, 'transistor_npn', f'Q{i}', 0, 0),
+            Component(rb, 'resistor', f'RB{i}', 0, 0, value='1k'),
+            Component(rc, 'resistor', f'RC{i}', 0, 0, value='1k'),
+        ]
+        conns += [
+            Connection(f'x{i}', *prev, rb, 0), Connection(f'y{i}', rb, 1, q, 0), Connection(f'z{i}', rc, 0, 'vcc', 0),
+            Connection(f'u{i}', rc, 1, q, 1), Connection(f'e{i}', q, 2, 'g', 0),
+        ]
+        prev = (rc, 1)
+    return build(comps, conns)
+
+
+def diode_string(count, volts):
+    comps = [
+        Component('v', 'voltage_source', 'V1', 0, 0, value=str(volts)),
+        Component('g', 'gnd', 'GND1', 0, 0),
+        Component('r', 'resistor', 'R1', 0, 0, value='1k'),
+    ]
+    conns = [Connection('a', 'v', 1, 'g', 0), Connection('b', 'v', 0, 'r', 0)]
+    prev = ('r', 1)
+    for i in range(count):
+        comps.append(Component(f'd{i}', 'diode', f'D{i}', 0, 0))
+        conns.append(Connection(f'c{i}', *prev, f'd{i}', 0))
+        prev = (f'd{i}', 1)
+    conns.append(Connection('z', *prev, 'g', 0))
+    return build(comps, conns)
+
+
+def first_pass(ckt):
+    system = MnaSystem(ckt)
+    return system._newton(system.rhs.copy(), 0.0, np.zeros(ckt.size))
+
+
+def test_long_bjt_chain_converges_without_homotopy():
+    assert first_pass(bjt_chain(110)) is not None
+
+
+def test_step_limit_follows_the_circuit_scale():
+    # o limite vem da primeira solução: uma fonte de 300 V não é subida aos poucos
+    ckt = diode_string(200, 300)
+    x = first_pass(ckt)
+    assert x is not None
+    assert np.abs(x[:ckt.n_nodes - 1]).max() <= 300.0 + 1e-6
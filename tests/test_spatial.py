@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Testes do índice espacial
+"""
+from circuit_components import Component, terminal_positions
+from circuit_spatial import SpatialIndex
+
+
+def test_readded_component_keeps_its_stacking_order():
+    comps = [Component(cid, 'resistor', cid.upper(), 0, 0) for cid in ('a', 'b', 'c')]
+    index = SpatialIndex(terminal_positions)
+    index.rebuild(comps)
+    index.remove(comps[2])
+    index.add(comps[2])
+    index.remove(comps[1])
+    index.add(comps[1])
+    assert [comp['id'] for comp in index.components_in(-10, -10, 10, 10)] == ['a', 'b', 'c']
+    assert index.component_at(0, 0) is comps[2]
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dan_simulation_circuit - Testes do transformador ideal (DC, AC e netlist)
+"""
+import numpy as np
+import pytest
+
+from circuit_ac import simulate_ac
+from circuit_components import Component, Connection
+from circuit_netlist import iter_netlist
+from circuit_nets import NetIndex
+from circuit_solver import analyze_dc, compile_circuit
+from circuit_units import parse_value
+
+
+def transformer_circuit(ratio, source='voltage_source', load='100'):
+    comps = [
+        Component('v', source, 'V1', 0, 0, value='10'),
+        Component('g', 'gnd', 'GND1', 0, 0),
+        Component('t', 'transformer', 'T1', 0, 0, value=ratio),
+        Component('r', 'resistor', 'RL', 0, 0, value=load),
+    ]
+    conns = [
+        Connection('w1', 'v', 0, 't', 0), Connection('w2', 'v', 1, 'g', 0), Connection('w3', 't', 1, 'g', 0),
+        Connection('w4', 't', 2, 'r', 0), Connection('w5', 'r', 1, 'g', 0), Connection('w6', 't', 3, 'g', 0),
+    ]
+    nets = NetIndex()
+    nets.rebuild(comps, conns)
+    return comps, nets, compile_circuit(comps, conns, parse_value, nets)
+
+
+@pytest.mark.parametrize('ratio, k', [('1:1', 1.0), ('2:1', 0.5), ('1:3', 3.0)])
+def test_dc_voltage_and_current_ratio(ratio, k):
+    _, _, ckt = transformer_circuit(ratio)
+    res = analyze_dc(ckt)
+    assert res['voltages']['RL'] == pytest.approx(10 * k, rel=1e-6)
+    i_load = 10 * k / 100
+    assert res['currents']['T1'] == pytest.approx(i_load, rel=1e-6)
+    # potência conservada: a fonte entrega k·I_carga
+    assert res['currents']['V1'] == pytest.approx(k * i_load, rel=1e-6)
+
+
+def test_ac_voltage_ratio():
+    comps, nets, ckt = transformer_circuit('4:1', source='voltage_ac')
+    res = simulate_ac(ckt, np.array([50.0, 1e3, 1e5]))
+    secondary = nets.name(nets.net('t', 2))
+    primary = nets.name(nets.net('t', 0))
+    np.testing.assert_allclose(np.abs(res['nodes'][f"V({secondary})"] / res['nodes'][f"V({primary})"]), 0.25, rtol=1e-9)
+
+
+def test_netlist_uses_the_same_ideal_model():
+    comps, nets, _ = transformer_circuit('2:1')
+    lines = [line for line in iter_netlist(comps, nets, parse_value) if 'T1' in line]
+    assert [line.split()[0] for line in lines] == ['ET1', 'VT1_S', 'FT1']
+    assert all(line.split()[-1] == '0.5' for line in lines if line[0] in 'EF')
+    assert not any(line.startswith(('L', 'K')) for line in lines)